@@ -1,4 +1,10 @@
 #!/bin/bash
 
 python manage.py migrate
-python manage.py runserver 0.0.0.0:8000
\ No newline at end of file
+python manage.py generate_openapi
+
+if [ "${SERVER_MODE:-dev}" = "dev" ]; then
+    python manage.py runserver 0.0.0.0:8000
+else
+    exec gunicorn -c gunicorn.conf.py
+fi
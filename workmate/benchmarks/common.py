@@ -0,0 +1,172 @@
+"""
+Общие функции бенчмарков: настройка Django, временная тестовая база,
+быстрое заполнение данными и статистика задержек.
+"""
+
+import itertools
+import os
+import random
+import statistics
+from contextlib import contextmanager
+
+
+def setup_django():
+    """Настраивает Django для запуска бенчмарка как обычного скрипта."""
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'workmate.settings')
+    import django
+
+    django.setup()
+
+
+@contextmanager
+def benchmark_database(keepdb=False):
+    """
+    Создает отдельную тестовую базу (test_<имя базы>) на время замера,
+    чтобы не трогать рабочие данные, и удаляет ее после.
+    """
+
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=keepdb)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=keepdb)
+        teardown_test_environment()
+
+
+BENCHMARK_PASSWORD = 'benchmark'
+
+
+def seed(users, kittens, ratings, breeds=10, batch_size=10000, bulk=True, random_seed=0):
+    """
+    Заполняет базу объектами фабрик из kittens/tests/factories.py.
+
+    bulk=True - быстрый путь: объекты строятся фабриками без сохранения
+    (Factory.build) и вставляются пачками через bulk_create, а всем
+    пользователям присваивается один заранее вычисленный хэш пароля.
+    bulk=False - обычное создание фабриками, по запросу на объект.
+
+    Оценок создается не более users * kittens: каждая пара
+    пользователь-котенок встречается один раз. Пароль всех
+    пользователей - BENCHMARK_PASSWORD. Возвращает списки id
+    пользователей, пород и котят.
+    """
+
+    from django.contrib.auth.hashers import make_password
+    from django.core.management import call_command
+    from django.test.utils import override_settings
+
+    from kittens.models import Breed, CustomUser, Kitten, Rating
+    from kittens.tests.factories import (
+        BreedFactory,
+        CustomUserFactory,
+        KittenFactory,
+        RatingFactory,
+    )
+
+    random.seed(random_seed)
+    ratings = min(ratings, users * kittens)
+
+    def user_fields(i):
+        return {
+            'email': f'user{i}@example.com',
+            'username': f'user{i}',
+            'role': 'participant' if i % 2 else 'visitor',
+        }
+
+    def kitten_fields(i):
+        return {
+            'description': f'Benchmark kitten {i}',
+            'breed': breed_objects[i % len(breed_objects)],
+            'owner': user_objects[i % len(user_objects)],
+        }
+
+    def rating_fields():
+        # Пары (пользователь, котенок) перебираются по диагоналям,
+        # поэтому повторов нет, а оценки распределены по всем котятам.
+        for n in range(ratings):
+            kitten_index = n % len(kitten_objects)
+            user_index = (n // len(kitten_objects) + kitten_index) % len(user_objects)
+            yield {
+                'kitten': kitten_objects[kitten_index],
+                'user': user_objects[user_index],
+                'comment': '',
+            }
+
+    if bulk:
+        breed_objects = Breed.objects.bulk_create(BreedFactory.build_batch(breeds))
+
+        # Хэширование пароля для каждого пользователя заняло бы минуты,
+        # поэтому фабрика строит объекты с быстрым хэшером, а затем им
+        # присваивается один настоящий хэш.
+        password = make_password(BENCHMARK_PASSWORD)
+        with override_settings(
+            PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher']
+        ):
+            user_objects = [
+                CustomUserFactory.build(**user_fields(i)) for i in range(users)
+            ]
+        for user in user_objects:
+            user.password = password
+        user_objects = CustomUser.objects.bulk_create(user_objects, batch_size=batch_size)
+
+        kitten_objects = Kitten.objects.bulk_create(
+            [KittenFactory.build(**kitten_fields(i)) for i in range(kittens)],
+            batch_size=batch_size,
+        )
+
+        # Оценки строятся и вставляются пачками, чтобы не держать
+        # в памяти миллион объектов.
+        pending = rating_fields()
+        while True:
+            batch = [
+                RatingFactory.build(**fields)
+                for fields in itertools.islice(pending, batch_size)
+            ]
+            if not batch:
+                break
+            Rating.objects.bulk_create(batch)
+    else:
+        breed_objects = BreedFactory.create_batch(breeds)
+        user_objects = []
+        for i in range(users):
+            user = CustomUserFactory(**user_fields(i), password=BENCHMARK_PASSWORD)
+            # Фабрика не сохраняет объект после set_password.
+            user.save(update_fields=['password'])
+            user_objects.append(user)
+        kitten_objects = [KittenFactory(**kitten_fields(i)) for i in range(kittens)]
+        for fields in rating_fields():
+            RatingFactory(**fields)
+
+    call_command('rebuild_kitten_stats', stdout=open(os.devnull, 'w'))
+    return (
+        [user.id for user in user_objects],
+        [breed.id for breed in breed_objects],
+        [kitten.id for kitten in kitten_objects],
+    )
+
+
+def summarize(latencies):
+    """Возвращает p50/p95/p99, среднее и максимум задержек в миллисекундах."""
+
+    if not latencies:
+        return {}
+    ordered = sorted(latencies)
+
+    def percentile(p):
+        index = min(len(ordered) - 1, round(p / 100 * (len(ordered) - 1)))
+        return ordered[index] * 1000
+
+    return {
+        'count': len(ordered),
+        'p50_ms': round(percentile(50), 3),
+        'p95_ms': round(percentile(95), 3),
+        'p99_ms': round(percentile(99), 3),
+        'mean_ms': round(statistics.fmean(ordered) * 1000, 3),
+        'max_ms': round(ordered[-1] * 1000, 3),
+    }
@@ -0,0 +1,37 @@
+"""
+Сравнивает два файла результатов benchmarks.run.
+
+    python -m benchmarks.compare results/old.json results/new.json
+"""
+
+import argparse
+import json
+
+METRICS = ('p50_ms', 'p95_ms', 'p99_ms', 'throughput_rps', 'queries_per_request')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('old')
+    parser.add_argument('new')
+    args = parser.parse_args()
+
+    with open(args.old) as file:
+        old = json.load(file)
+    with open(args.new) as file:
+        new = json.load(file)
+
+    print(f'{old.get("commit")} -> {new.get("commit")}')
+    for scenario in sorted(old['scenarios'].keys() & new['scenarios'].keys()):
+        print(scenario)
+        for metric in METRICS:
+            before = old['scenarios'][scenario].get(metric)
+            after = new['scenarios'][scenario].get(metric)
+            if before is None or after is None:
+                continue
+            change = f'{(after - before) / before * 100:+.1f}%' if before else 'n/a'
+            print(f'  {metric:<22}{before:>12}{after:>12}  {change}')
+
+
+if __name__ == '__main__':
+    main()
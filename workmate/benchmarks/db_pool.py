@@ -0,0 +1,101 @@
+"""
+Бенчмарк соединений с PostgreSQL: задержка GET /api/ratings/kitten-stats/<id>/
+с новым соединением на каждый запрос, с постоянными соединениями
+(CONN_MAX_AGE) и с пулом psycopg 3 (OPTIONS['pool']).
+
+Запуск из каталога workmate (нужен PostgreSQL из настроек):
+
+    python -m benchmarks.db_pool --requests 2000
+
+Как и сервер приложения, скрипт вызывает close_old_connections() до
+и после каждого запроса, поэтому соединение закрывается, остается
+открытым или возвращается в пул так же, как между запросами к серверу.
+"""
+
+import argparse
+import json
+import random
+import time
+
+from benchmarks.common import benchmark_database, seed, setup_django, summarize
+
+MODES = ('new_connection', 'persistent', 'pool')
+
+
+def configure(connection, mode, pool_options):
+    """Закрывает текущее соединение и пул и переключает режим соединений."""
+
+    connection.close()
+    connection.close_pool()
+    options = connection.settings_dict['OPTIONS']
+    options.pop('pool', None)
+    connection.settings_dict['CONN_MAX_AGE'] = 0
+    if mode == 'persistent':
+        connection.settings_dict['CONN_MAX_AGE'] = 600
+    elif mode == 'pool':
+        options['pool'] = pool_options
+
+
+def measure(client, urls):
+    from django.db import close_old_connections
+
+    latencies = []
+    for url in urls:
+        started = time.perf_counter()
+        close_old_connections()
+        response = client.get(url)
+        close_old_connections()
+        latencies.append(time.perf_counter() - started)
+        assert response.status_code == 200, response.content
+    return summarize(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--kittens', type=int, default=1000)
+    parser.add_argument('--ratings', type=int, default=100_000)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--output', help='Save results as JSON to this file.')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.db import connection
+    from rest_framework.test import APIClient
+
+    from kittens.models import CustomUser
+
+    if connection.vendor != 'postgresql':
+        parser.error('This benchmark needs the PostgreSQL database.')
+
+    settings.RESPONSE_CACHE_ENABLED = False
+    pool_options = connection.settings_dict['OPTIONS'].get('pool') or {
+        'min_size': 2,
+        'max_size': 4,
+    }
+    rng = random.Random(1)
+    results = {}
+
+    with benchmark_database():
+        _, _, kitten_ids = seed(args.users, args.kittens, args.ratings)
+        client = APIClient()
+        client.force_authenticate(user=CustomUser.objects.first())
+        urls = [
+            f'/api/ratings/kitten-stats/{rng.choice(kitten_ids)}/'
+            for _ in range(args.requests)
+        ]
+        for mode in MODES:
+            configure(connection, mode, pool_options)
+            measure(client, urls[:50])  # прогрев
+            results[mode] = measure(client, urls)
+        configure(connection, 'new_connection', pool_options)
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(results, output, indent=2)
+
+
+if __name__ == '__main__':
+    main()
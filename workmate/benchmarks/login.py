@@ -0,0 +1,84 @@
+"""
+Бенчмарк входа при массовом логине: пропускная способность
+POST /api/token/ и задержка GET /api/kittens/ в то же время для каждого
+режима пула хэширования паролей (PASSWORD_HASHING_EXECUTOR).
+
+Запросы выполняются внутри процесса через django.test.Client
+(см. benchmarks.run) во временной тестовой базе; клиенты входа
+и чтения списка работают одновременно.
+
+    python -m benchmarks.login --concurrency 16 --logins 400
+"""
+
+import argparse
+import json
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import benchmark_database, seed, setup_django
+from benchmarks.run import InProcessClient, Worker, run_scenario
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--concurrency', type=int, default=16,
+                        help='Clients logging in at the same time.')
+    parser.add_argument('--logins', type=int, default=400)
+    parser.add_argument('--readers', type=int, default=4,
+                        help='Clients reading the kitten list during the logins.')
+    parser.add_argument('--reads', type=int, default=1000)
+    parser.add_argument('--kittens', type=int, default=1000)
+    parser.add_argument('--executors', nargs='+', default=['inline', 'thread', 'process'])
+    parser.add_argument('--output', help='Save results as JSON to this file.')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+
+    from kittens import hashing
+
+    settings.THROTTLE_ENABLED = False
+    settings.RESPONSE_CACHE_ENABLED = False
+    results = {}
+
+    with benchmark_database():
+        _, breeds, kittens = seed(args.concurrency + args.readers, args.kittens, ratings=0)
+        data = {'breeds': breeds, 'kittens': kittens}
+        emails = [f'user{i}@example.com' for i in range(args.concurrency + args.readers)]
+
+        for kind in args.executors:
+            settings.PASSWORD_HASHING_EXECUTOR = kind
+            logins = [
+                Worker(InProcessClient(), email, random.Random(index))
+                for index, email in enumerate(emails[:args.concurrency])
+            ]
+            readers = [
+                Worker(InProcessClient(), email, random.Random(index))
+                for index, email in enumerate(emails[args.concurrency:])
+            ]
+            # Вход читателей заодно запускает процессы пула.
+            for worker in readers:
+                worker.login()
+            run_scenario('token_obtain', logins, args.concurrency, data)
+
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                login_run = executor.submit(
+                    run_scenario, 'token_obtain', logins, args.logins, data
+                )
+                read_run = executor.submit(
+                    run_scenario, 'kitten_list', readers, args.reads, data
+                )
+                results[kind] = {
+                    'token_obtain': login_run.result(),
+                    'kitten_list': read_run.result(),
+                }
+            hashing.shutdown_executors()
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(results, output, indent=2)
+
+
+if __name__ == '__main__':
+    main()
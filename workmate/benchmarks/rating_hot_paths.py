@@ -0,0 +1,106 @@
+"""
+Бенчмарк горячих путей оценок: создание оценки (POST /api/ratings/)
+и статистика котенка (GET /api/ratings/kitten-stats/<id>/).
+
+Запуск из каталога workmate:
+
+    python -m benchmarks.rating_hot_paths --ratings 1000000
+
+Данные создаются во временной тестовой базе. Чтобы увидеть эффект
+изменения, запустите скрипт на двух коммитах и сравните результаты.
+"""
+
+import argparse
+import json
+import random
+import time
+
+from benchmarks.common import benchmark_database, seed, setup_django, summarize
+
+
+def measure(client, method, urls, payloads=None):
+    """Выполняет запросы и возвращает задержки и количество SQL-запросов."""
+
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    latencies = []
+    queries = []
+    for index, url in enumerate(urls):
+        kwargs = {'format': 'json'}
+        if payloads is not None:
+            kwargs['data'] = payloads[index]
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = getattr(client, method)(url, **kwargs)
+            latencies.append(time.perf_counter() - started)
+        assert response.status_code < 400, response.content
+        queries.append(len(captured))
+    result = summarize(latencies)
+    result['queries_per_request'] = round(sum(queries) / len(queries), 2)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--ratings', type=int, default=1_000_000)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--kittens', type=int, default=1000)
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--output', help='Save results as JSON to this file.')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from rest_framework.test import APIClient
+
+    from kittens.models import CustomUser
+
+    settings.RESPONSE_CACHE_ENABLED = False
+    rng = random.Random(1)
+
+    with benchmark_database():
+        started = time.perf_counter()
+        _, _, kitten_ids = seed(args.users, args.kittens, args.ratings)
+        seed_seconds = time.perf_counter() - started
+
+        client = APIClient()
+        # Новый пользователь, чтобы каждая оценка создавалась без конфликтов.
+        judge = CustomUser.objects.create_user(
+            email='judge@example.com',
+            username='judge',
+            password='benchmark',
+            role='visitor',
+        )
+        client.force_authenticate(user=judge)
+
+        targets = rng.sample(kitten_ids, min(args.requests, len(kitten_ids)))
+        create = measure(
+            client,
+            'post',
+            ['/api/ratings/'] * len(targets),
+            [{'kitten': kitten_id, 'score': rng.randint(1, 5)} for kitten_id in targets],
+        )
+        stats = measure(
+            client,
+            'get',
+            [
+                f'/api/ratings/kitten-stats/{rng.choice(kitten_ids)}/'
+                for _ in range(args.requests)
+            ],
+        )
+
+    results = {
+        'ratings': args.ratings,
+        'seed_seconds': round(seed_seconds, 2),
+        'rating_create': create,
+        'kitten_stats': stats,
+    }
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(results, output, indent=2)
+
+
+if __name__ == '__main__':
+    main()
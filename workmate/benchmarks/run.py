@@ -0,0 +1,321 @@
+"""
+Нагрузочный бенчмарк API выставки.
+
+Заполняет базу (см. benchmarks.common.seed) и нагружает эндпоинты
+параллельными клиентами:
+
+    kitten_list    GET  /api/kittens/?breed=<id>
+    rating_create  POST /api/ratings/
+    kitten_stats   GET  /api/ratings/kitten-stats/<id>/
+    token_obtain   POST /api/token/
+
+Для каждого сценария сохраняются p50/p95/p99, пропускная способность
+и количество SQL-запросов на запрос. Результаты пишутся в JSON
+(по умолчанию benchmarks/results/<время>-<коммит>.json) и сравниваются
+командой python -m benchmarks.compare old.json new.json.
+
+По умолчанию запросы выполняются внутри процесса через django.test.Client
+во временной тестовой базе. С --base-url запросы идут по HTTP к
+запущенному серверу; с --seed данные создаются в базе из настроек,
+которая должна совпадать с базой сервера.
+
+    python -m benchmarks.run --kittens 5000 --ratings 200000 --concurrency 8
+    python -m benchmarks.run --base-url http://localhost:8000 --seed
+"""
+
+import argparse
+import datetime
+import http.client
+import json
+import os
+import random
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from benchmarks.common import (
+    BENCHMARK_PASSWORD,
+    benchmark_database,
+    seed,
+    setup_django,
+    summarize,
+)
+
+SCENARIOS = ('kitten_list', 'rating_create', 'kitten_stats', 'token_obtain')
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+
+
+class InProcessClient:
+    """Выполняет запросы через django.test.Client и считает SQL-запросы."""
+
+    def __init__(self):
+        from django.test import Client
+
+        self.client = Client(raise_request_exception=False)
+
+    def request(self, method, path, body=None, token=None):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {token}'} if token else {}
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = getattr(self.client, method.lower())(
+                path,
+                data=json.dumps(body) if body is not None else None,
+                content_type='application/json',
+                **headers,
+            )
+            elapsed = time.perf_counter() - started
+        return response.status_code, response.content, elapsed, len(captured)
+
+
+class HttpClient:
+    """Выполняет запросы по HTTP с постоянным соединением."""
+
+    def __init__(self, base_url):
+        parts = urlsplit(base_url)
+        connection_class = (
+            http.client.HTTPSConnection if parts.scheme == 'https'
+            else http.client.HTTPConnection
+        )
+        self.connection = connection_class(parts.netloc, timeout=60)
+
+    def request(self, method, path, body=None, token=None):
+        headers = {'Content-Type': 'application/json'}
+        if token:
+            headers['Authorization'] = f'Bearer {token}'
+        payload = json.dumps(body) if body is not None else None
+        started = time.perf_counter()
+        try:
+            self.connection.request(method, path, body=payload, headers=headers)
+            response = self.connection.getresponse()
+            content = response.read()
+        except (http.client.HTTPException, OSError):
+            self.connection.close()
+            raise
+        elapsed = time.perf_counter() - started
+        return response.status, content, elapsed, None
+
+
+class Worker:
+    """Виртуальный клиент: свой пользователь, токен и соединение."""
+
+    def __init__(self, client, email, rng):
+        self.client = client
+        self.email = email
+        self.rng = rng
+        self.token = None
+
+    def login(self):
+        status, content, _, _ = self.client.request(
+            'POST', '/api/token/', {'email': self.email, 'password': BENCHMARK_PASSWORD}
+        )
+        assert status == 200, content
+        self.token = json.loads(content)['access']
+
+
+def build_request(scenario, worker, data):
+    """Возвращает (метод, путь, тело, токен) очередного запроса сценария."""
+
+    rng = worker.rng
+    if scenario == 'kitten_list':
+        return 'GET', f'/api/kittens/?breed={rng.choice(data["breeds"])}', None, worker.token
+    if scenario == 'kitten_stats':
+        kitten_id = rng.choice(data['kittens'])
+        return 'GET', f'/api/ratings/kitten-stats/{kitten_id}/', None, worker.token
+    if scenario == 'rating_create':
+        # Каждый клиент оценивает котят, которых он еще не оценивал.
+        kitten_id = worker.unrated.pop()
+        body = {'kitten': kitten_id, 'score': rng.randint(1, 5), 'comment': ''}
+        return 'POST', '/api/ratings/', body, worker.token
+    if scenario == 'token_obtain':
+        body = {'email': worker.email, 'password': BENCHMARK_PASSWORD}
+        return 'POST', '/api/token/', body, None
+    raise ValueError(scenario)
+
+
+def run_scenario(scenario, workers, requests, data):
+    """Выполняет requests запросов сценария, распределив их по клиентам."""
+
+    latencies = []
+    queries = []
+    errors = 0
+    lock = threading.Lock()
+    per_worker = [requests // len(workers)] * len(workers)
+    for index in range(requests % len(workers)):
+        per_worker[index] += 1
+
+    def work(worker, count):
+        nonlocal errors
+        local_latencies, local_queries, local_errors = [], [], 0
+        for _ in range(count):
+            method, path, body, token = build_request(scenario, worker, data)
+            status, _, elapsed, query_count = worker.client.request(method, path, body, token)
+            if status >= 400:
+                local_errors += 1
+                continue
+            local_latencies.append(elapsed)
+            if query_count is not None:
+                local_queries.append(query_count)
+        with lock:
+            latencies.extend(local_latencies)
+            queries.extend(local_queries)
+            errors += local_errors
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(workers)) as executor:
+        for future in [
+            executor.submit(work, worker, count)
+            for worker, count in zip(workers, per_worker)
+        ]:
+            future.result()
+    wall = time.perf_counter() - started
+
+    result = summarize(latencies)
+    result['errors'] = errors
+    result['throughput_rps'] = round(len(latencies) / wall, 2) if wall else None
+    result['queries_per_request'] = (
+        round(sum(queries) / len(queries), 2) if queries else None
+    )
+    return result
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def run(args):
+    from django.db import close_old_connections
+
+    from kittens.models import Breed, CustomUser, Kitten
+
+    started = time.perf_counter()
+    if args.seed_data:
+        seed(
+            args.users,
+            args.kittens,
+            args.ratings,
+            breeds=args.breeds,
+            bulk=not args.slow_seed,
+        )
+    seed_seconds = round(time.perf_counter() - started, 2)
+
+    data = {
+        'breeds': list(Breed.objects.values_list('id', flat=True)),
+        'kittens': list(Kitten.objects.values_list('id', flat=True)),
+    }
+    emails = list(
+        CustomUser.objects.filter(email__startswith='user')
+        .order_by('id')
+        .values_list('email', flat=True)[:args.concurrency]
+    )
+    assert len(emails) == args.concurrency, 'Not enough seeded users for --concurrency.'
+
+    def make_client():
+        return HttpClient(args.base_url) if args.base_url else InProcessClient()
+
+    workers = [
+        Worker(make_client(), email, random.Random(index))
+        for index, email in enumerate(emails)
+    ]
+    for worker in workers:
+        worker.login()
+        rated = set(
+            CustomUser.objects.get(email=worker.email)
+            .ratings.values_list('kitten_id', flat=True)
+        )
+        worker.unrated = [kitten for kitten in data['kittens'] if kitten not in rated]
+        worker.rng.shuffle(worker.unrated)
+
+    results = {}
+    for scenario in args.scenarios:
+        requests = args.requests
+        if scenario == 'token_obtain':
+            requests = args.token_requests
+        if scenario == 'rating_create':
+            requests = min(requests, sum(len(worker.unrated) for worker in workers))
+        results[scenario] = run_scenario(scenario, workers, requests, data)
+        close_old_connections()
+
+    return {
+        'commit': git_commit(),
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'mode': 'http' if args.base_url else 'in-process',
+        'base_url': args.base_url,
+        'concurrency': args.concurrency,
+        'dataset': {
+            'users': args.users,
+            'breeds': args.breeds,
+            'kittens': args.kittens,
+            'ratings': args.ratings,
+            'seeded': args.seed_data,
+            'seed_seconds': seed_seconds,
+        },
+        'scenarios': results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__.split('\n\n')[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--breeds', type=int, default=20)
+    parser.add_argument('--kittens', type=int, default=5000)
+    parser.add_argument('--ratings', type=int, default=100_000)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=2000,
+                        help='Requests per scenario.')
+    parser.add_argument('--token-requests', type=int, default=200,
+                        help='Requests for token_obtain (password hashing is slow).')
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument('--base-url', help='Drive a running server over HTTP.')
+    parser.add_argument('--seed', dest='seed_data', action='store_true',
+                        help='With --base-url: seed the configured database first.')
+    parser.add_argument('--slow-seed', action='store_true',
+                        help='Create objects one by one with the factories.')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Disable the response cache (in-process mode).')
+    parser.add_argument('--output', help='Result file (default: benchmarks/results/).')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+
+    if args.no_cache:
+        settings.RESPONSE_CACHE_ENABLED = False
+    # Сценарии нагружают сервер от одного пользователя и с одного адреса.
+    settings.THROTTLE_ENABLED = False
+
+    if args.base_url:
+        report = run(args)
+    else:
+        # Внутри процесса данные всегда создаются во временной базе.
+        args.seed_data = True
+        with benchmark_database():
+            report = run(args)
+
+    output = args.output
+    if output is None:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        stamp = datetime.datetime.now().strftime('%Y%m%d-%H%M%S')
+        output = RESULTS_DIR / f'{stamp}-{report["commit"]}.json'
+    with open(output, 'w') as file:
+        json.dump(report, file, indent=2)
+
+    print(json.dumps(report['scenarios'], indent=2))
+    print(f'Results saved to {os.fspath(output)}')
+
+
+if __name__ == '__main__':
+    main()
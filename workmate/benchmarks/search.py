@@ -0,0 +1,94 @@
+"""
+Бенчмарк поиска котят: задержка GET /api/kittens/search/?search=
+(выдача по релевантности) и GET /api/kittens/?search= (список) на
+точных именах, именах с опечаткой, цветах и запросах из имени и цвета.
+
+Запуск из каталога workmate (нужен PostgreSQL из настроек: индексы
+поиска создаются миграцией только на нем):
+
+    python -m benchmarks.search --kittens 1000000 --requests 500
+"""
+
+import argparse
+import json
+import random
+import time
+
+from benchmarks.common import benchmark_database, seed, setup_django, summarize
+
+
+def typo(word, rng):
+    """Меняет местами две соседние буквы слова."""
+
+    if len(word) < 3:
+        return word
+    i = rng.randrange(len(word) - 1)
+    return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+
+
+def make_queries(kittens, count, rng):
+    """Запросы каждого вида по случайным котятам из базы."""
+
+    samples = [rng.choice(kittens) for _ in range(count)]
+    return {
+        'name': [name for name, _ in samples],
+        'name_typo': [typo(name, rng) for name, _ in samples],
+        'color': [color for _, color in samples],
+        'name_and_color': [f'{name} {color}' for name, color in samples],
+    }
+
+
+def measure(client, path, queries):
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        response = client.get(path, {'search': query})
+        latencies.append(time.perf_counter() - started)
+        assert response.status_code == 200, response.content
+    return summarize(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--kittens', type=int, default=1_000_000)
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--output', help='Save results as JSON to this file.')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.db import connection
+    from rest_framework.test import APIClient
+
+    from kittens.models import CustomUser, Kitten
+
+    if connection.vendor != 'postgresql':
+        parser.error('This benchmark needs the PostgreSQL database.')
+
+    settings.RESPONSE_CACHE_ENABLED = False
+    rng = random.Random(1)
+    results = {}
+
+    with benchmark_database():
+        seed(users=100, kittens=args.kittens, ratings=0)
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {connection.ops.quote_name(Kitten._meta.db_table)}')
+        kittens = list(Kitten.objects.values_list('name', 'color')[:10_000])
+        queries = make_queries(kittens, args.requests, rng)
+
+        client = APIClient()
+        client.force_authenticate(user=CustomUser.objects.first())
+        for path in ('/api/kittens/search/', '/api/kittens/'):
+            measure(client, path, queries['name'][:20])  # прогрев
+            results[path] = {
+                kind: measure(client, path, values) for kind, values in queries.items()
+            }
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(results, output, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Микробенчмарк сериализации списка: ModelSerializer по объектам моделей
+против ValuesSerializer по строкам queryset.values().
+
+Для каждого варианта замеряется полный путь ответа: выборка из базы,
+сериализация и рендеринг JSON. Перед замером проверяется, что JSON
+совпадает побайтово.
+
+    python -m benchmarks.serializers --kittens 5000 --repeat 20
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+from benchmarks.common import benchmark_database, seed, setup_django
+
+
+def timed(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return {
+        'min_ms': round(min(timings) * 1000, 2),
+        'median_ms': round(statistics.median(timings) * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--kittens', type=int, default=5000)
+    parser.add_argument('--ratings', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--output', help='Save results as JSON to this file.')
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.renderers import JSONRenderer
+
+    from kittens.models import Kitten, Rating
+    from kittens.serializers import (
+        KittenSerializer,
+        KittenValuesSerializer,
+        RatingSerializer,
+        RatingValuesSerializer,
+    )
+
+    renderer = JSONRenderer()
+    cases = (
+        ('kittens', Kitten, KittenSerializer, KittenValuesSerializer),
+        ('ratings', Rating, RatingSerializer, RatingValuesSerializer),
+    )
+    results = {}
+    with benchmark_database():
+        seed(100, args.kittens, args.ratings)
+        for name, model, model_serializer, values_serializer in cases:
+            queryset = model.objects.order_by('id')
+
+            def model_path():
+                return renderer.render(model_serializer(list(queryset), many=True).data)
+
+            def values_path():
+                rows = list(queryset.values(*values_serializer.values_fields()))
+                return renderer.render(values_serializer(rows, many=True).data)
+
+            assert model_path() == values_path(), f'{name}: output differs'
+            model_timing = timed(model_path, args.repeat)
+            values_timing = timed(values_path, args.repeat)
+            results[name] = {
+                'rows': queryset.count(),
+                'model_serializer': model_timing,
+                'values_serializer': values_timing,
+                'speedup': round(model_timing['median_ms'] / values_timing['median_ms'], 2),
+            }
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(results, output, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Сравнение режимов сервера: gunicorn с WSGI-воркерами (gthread)
+и gunicorn с ASGI-воркерами uvicorn и асинхронными GET-запросами.
+
+Для каждого режима запускается gunicorn (см. gunicorn.conf.py),
+benchmarks.run нагружает его по HTTP, затем результаты сравниваются
+командой benchmarks.compare. Данные создаются один раз перед первым
+режимом в базе из настроек (DJANGO_SETTINGS_MODULE), к которой уже
+применены миграции.
+
+    python -m benchmarks.serving --workers 4 --concurrency 32
+"""
+
+import argparse
+import datetime
+import http.client
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from benchmarks.run import RESULTS_DIR
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+MODES = ('wsgi', 'asgi')
+
+
+def wait_for_server(server, host, port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f'gunicorn exited with code {server.returncode}.')
+        try:
+            connection = http.client.HTTPConnection(host, port, timeout=1)
+            connection.request('GET', '/api/')
+            connection.getresponse().read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f'Server on {host}:{port} did not start in {timeout}s.')
+
+
+def run_mode(mode, args, seed_data, output):
+    env = dict(
+        os.environ,
+        SERVER_MODE=mode,
+        BIND=f'{args.host}:{args.port}',
+        WEB_CONCURRENCY=str(args.workers),
+        GUNICORN_ACCESS_LOG='',
+        THROTTLE_ENABLED='false',
+    )
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py'], cwd=PROJECT_DIR, env=env
+    )
+    try:
+        wait_for_server(server, args.host, args.port)
+        command = [
+            sys.executable, '-m', 'benchmarks.run',
+            '--base-url', f'http://{args.host}:{args.port}',
+            '--output', os.fspath(output),
+            *args.run_args,
+        ]
+        if seed_data:
+            command.append('--seed')
+        subprocess.run(command, cwd=PROJECT_DIR, check=True)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__.split('\n\n')[0],
+        epilog='Other arguments are passed to benchmarks.run.',
+    )
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8001)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--no-seed', action='store_true',
+                        help='Use the data already in the database.')
+    args, args.run_args = parser.parse_known_args()
+
+    RESULTS_DIR.mkdir(exist_ok=True)
+    stamp = datetime.datetime.now().strftime('%Y%m%d-%H%M%S')
+    outputs = {mode: RESULTS_DIR / f'{stamp}-{mode}.json' for mode in MODES}
+    for index, mode in enumerate(MODES):
+        run_mode(mode, args, seed_data=index == 0 and not args.no_seed, output=outputs[mode])
+
+    subprocess.run(
+        [sys.executable, '-m', 'benchmarks.compare', *map(os.fspath, outputs.values())],
+        cwd=PROJECT_DIR,
+        check=True,
+    )
+
+
+if __name__ == '__main__':
+    main()
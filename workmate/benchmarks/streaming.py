@@ -0,0 +1,77 @@
+"""
+Память и время выдачи всех оценок: ответ целиком (ModelSerializer
+и JSONRenderer) против потокового /api/ratings/stream/.
+
+Пиковая память Python измеряется tracemalloc во время чтения ответа.
+
+    python -m benchmarks.streaming --ratings 200000
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+
+from benchmarks.common import benchmark_database, seed, setup_django
+
+
+def measure(produce):
+    """Возвращает время, пиковую память и размер ответа."""
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    size = 0
+    for chunk in produce():
+        size += len(chunk)
+    seconds = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        'seconds': round(seconds, 3),
+        'peak_memory_mb': round(peak / 2**20, 1),
+        'response_mb': round(size / 2**20, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--ratings', type=int, default=200_000)
+    parser.add_argument('--output', help='Save results as JSON to this file.')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from rest_framework.renderers import JSONRenderer
+    from rest_framework.test import APIClient
+
+    from kittens.models import CustomUser, Rating
+    from kittens.serializers import RatingSerializer
+
+    settings.RESPONSE_CACHE_ENABLED = False
+    with benchmark_database():
+        users = max(100, args.ratings // 1000)
+        seed(users, max(1000, args.ratings // users + 1), args.ratings)
+        client = APIClient()
+        client.force_authenticate(user=CustomUser.objects.first())
+
+        def full():
+            queryset = Rating.objects.order_by('id')
+            yield JSONRenderer().render(RatingSerializer(queryset, many=True).data)
+
+        def stream():
+            yield from client.get('/api/ratings/stream/').streaming_content
+
+        results = {
+            'ratings': Rating.objects.count(),
+            'full_response': measure(full),
+            'stream': measure(stream),
+        }
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(results, output, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,24 @@
+"""
+Настройки gunicorn для SERVER_MODE=wsgi и SERVER_MODE=asgi.
+
+    SERVER_MODE=asgi gunicorn -c gunicorn.conf.py
+"""
+
+import multiprocessing
+import os
+
+server_mode = os.getenv('SERVER_MODE', 'wsgi')
+
+bind = os.getenv('BIND', '0.0.0.0:8000')
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', '-') or None
+
+if server_mode == 'asgi':
+    wsgi_app = 'workmate.asgi:application'
+    worker_class = 'uvicorn_worker.UvicornWorker'
+else:
+    wsgi_app = 'workmate.wsgi:application'
+    worker_class = 'gthread'
+    threads = int(os.getenv('WSGI_THREADS', 4))
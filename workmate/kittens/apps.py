@@ -1,6 +1,24 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
 
 
 class KittenConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'kittens'
+
+    def ready(self):
+        from .authentication import revoke_inactive_user_tokens
+        from .models import CustomUser
+
+        post_save.connect(revoke_inactive_user_tokens, sender=CustomUser)
+        post_delete.connect(revoke_inactive_user_tokens, sender=CustomUser)
+        if settings.PERF_METRICS_ENABLED:
+            from .metrics import install_query_wrapper
+
+            connection_created.connect(install_query_wrapper)
+        if settings.SLOW_QUERY_LOG:
+            from .slow_queries import install_slow_query_log
+
+            connection_created.connect(install_slow_query_log)
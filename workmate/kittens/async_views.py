@@ -0,0 +1,167 @@
+"""
+Асинхронные обработчики чтения для наборов представлений.
+
+DRF не поддерживает асинхронные представления, поэтому GET-запросы
+к выбранным маршрутам обрабатываются отдельной асинхронной функцией
+(async_read_view), которая повторяет шаги APIView.dispatch, а выборку
+из базы выполняет через асинхронный ORM. Остальные методы передаются
+исходному синхронному представлению DRF. Маршруты подключаются
+в kittens/urls.py при ASYNC_READ_VIEWS = True (режим SERVER_MODE=asgi).
+"""
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.http import Http404, HttpResponse
+from django.template.response import SimpleTemplateResponse
+from django.urls import URLPattern
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+# Параметры запроса, которые не относятся к фильтрации queryset.
+NON_FILTER_PARAMS = {'cursor', 'page_size', 'with_stats', 'format'}
+
+
+class AsyncReadMixin:
+    """
+    Асинхронные варианты list и retrieve (alist, aretrieve).
+
+    Для других действий набор представлений может определить метод
+    a<действие>; действия без такого метода выполняются синхронно.
+    """
+
+    async def adispatch(self, request, *args, **kwargs):
+        """
+        Аналог APIView.dispatch для асинхронных обработчиков.
+
+        Аутентификация, проверка прав и выбор формата выполняются
+        синхронно в отдельном потоке (аутентификация может читать
+        пользователя из базы). Ответ рендерится здесь же (см. arendered),
+        чтобы Django не переключался в поток ради отложенного рендеринга.
+        """
+
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            handler = getattr(self, f'a{self.action}')
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return await arendered(self.response)
+
+    async def afilter_queryset(self, queryset):
+        """
+        Применяет фильтры. django-filter проверяет значения фильтров
+        запросами к базе, поэтому при наличии параметров фильтрации
+        фильтры применяются в отдельном потоке.
+        """
+
+        if set(self.request.query_params) - NON_FILTER_PARAMS:
+            return await sync_to_async(self.filter_queryset)(queryset)
+        return self.filter_queryset(queryset)
+
+    async def aget_object(self):
+        queryset = await self.afilter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        filter_kwargs = {self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        try:
+            obj = await queryset.aget(**filter_kwargs)
+        except (ObjectDoesNotExist, TypeError, ValueError, ValidationError):
+            raise Http404
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+    async def alist(self, request, *args, **kwargs):
+        queryset = await self.afilter_queryset(self.get_queryset())
+        if self.paginator is not None:
+            page = await self.paginator.apaginate_queryset(queryset, request, view=self)
+            if page is not None:
+                serializer = self.get_serializer(page, many=True)
+                return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer([obj async for obj in queryset], many=True)
+        return Response(serializer.data)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        serializer = self.get_serializer(instance)
+        return Response(serializer.data)
+
+
+async def arendered(response):
+    """
+    Рендерит ответ DRF и возвращает обычный HttpResponse с тем же
+    содержимым, статусом и заголовками.
+
+    JSON рендерится в цикле событий. Остальные форматы рендерятся
+    в отдельном потоке: BrowsableAPIRenderer строит формы, которые
+    читают варианты связанных полей из базы.
+    """
+
+    if not isinstance(response, SimpleTemplateResponse):
+        return response
+    if isinstance(getattr(response, 'accepted_renderer', None), JSONRenderer):
+        response.render()
+    else:
+        await sync_to_async(response.render)()
+    result = HttpResponse(response.content, status=response.status_code)
+    for header, value in response.items():
+        result[header] = value
+    return result
+
+
+def async_read_view(sync_view):
+    """
+    Оборачивает представление, созданное роутером DRF: GET и HEAD
+    обрабатываются асинхронно, если у набора представлений есть
+    метод a<действие>, остальные запросы - исходным представлением.
+    """
+
+    viewset_class = sync_view.cls
+    actions = dict(sync_view.actions)
+    if 'get' in actions and 'head' not in actions:
+        actions['head'] = actions['get']
+    initkwargs = sync_view.initkwargs
+    call_sync_view = sync_to_async(sync_view)
+
+    async def view(request, *args, **kwargs):
+        action = actions.get(request.method.lower())
+        if request.method not in ('GET', 'HEAD') or not hasattr(viewset_class, f'a{action}'):
+            return await call_sync_view(request, *args, **kwargs)
+
+        self = viewset_class(**initkwargs)
+        self.action_map = actions
+        for method, method_action in actions.items():
+            setattr(self, method, getattr(self, method_action))
+        self.request = request
+        self.args = args
+        self.kwargs = kwargs
+        return await self.adispatch(request, *args, **kwargs)
+
+    view.cls = viewset_class
+    view.initkwargs = initkwargs
+    view.actions = sync_view.actions
+    return csrf_exempt(view)
+
+
+def async_urlpatterns(urlpatterns, viewsets):
+    """
+    Возвращает маршруты роутера, в которых представления указанных
+    наборов заменены асинхронными обертками async_read_view.
+    """
+
+    result = []
+    for pattern in urlpatterns:
+        callback = getattr(pattern, 'callback', None)
+        if getattr(callback, 'cls', None) in viewsets:
+            pattern = URLPattern(
+                pattern.pattern, async_read_view(callback), pattern.default_args, pattern.name
+            )
+        result.append(pattern)
+    return result
@@ -0,0 +1,214 @@
+"""
+JWT-аутентификация без загрузки пользователя из базы.
+
+Access-токен содержит утверждения role, is_staff, is_superuser
+и is_active, поэтому проверки ролей и владельца (по request.user.id)
+выполняются без запроса к базе. Остальные поля пользователя загружаются
+лениво при первом обращении. Отозванные токены хранятся в кэше до
+истечения их срока действия. При деактивации или удалении пользователя
+в кэш записывается время отзыва, и все его токены, выпущенные раньше,
+отклоняются.
+"""
+
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import caches
+from django.utils.functional import cached_property
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from . import hashing
+from .models import CustomUser
+
+# Поля пользователя, которые копируются в токен.
+USER_CLAIMS = ('role', 'is_staff', 'is_superuser', 'is_active')
+
+
+def _revoked_key(token):
+    return f'revoked-token:{token[api_settings.JTI_CLAIM]}'
+
+
+def revoke_token(token):
+    """Добавляет токен в список отозванных до истечения его срока."""
+
+    timeout = int(token['exp'] - time.time())
+    if timeout > 0:
+        caches[settings.JWT_DENY_LIST_CACHE].set(_revoked_key(token), True, timeout)
+
+
+def _revoked_user_key(user_id):
+    return f'revoked-user:{user_id}'
+
+
+def revoke_user_tokens(user_id):
+    """
+    Отзывает все токены пользователя, выпущенные до текущего момента.
+    Время отзыва хранится, пока не истекут выпущенные refresh-токены.
+    """
+
+    timeout = int(api_settings.REFRESH_TOKEN_LIFETIME.total_seconds())
+    caches[settings.JWT_DENY_LIST_CACHE].set(_revoked_user_key(user_id), time.time(), timeout)
+
+
+def is_revoked(token):
+    """Отозван ли токен или все токены его пользователя (один запрос к кэшу)."""
+
+    token_key = _revoked_key(token)
+    user_key = _revoked_user_key(token.get(api_settings.USER_ID_CLAIM))
+    revoked = caches[settings.JWT_DENY_LIST_CACHE].get_many([token_key, user_key])
+    if token_key in revoked:
+        return True
+    # iat - целые секунды, поэтому токен, выпущенный в ту же секунду,
+    # что и отзыв, тоже считается отозванным.
+    return user_key in revoked and token.get('iat', 0) <= revoked[user_key]
+
+
+def revoke_inactive_user_tokens(sender, instance, **kwargs):
+    """
+    Обработчик post_save и post_delete для CustomUser: токены
+    деактивированного или удаленного пользователя отзываются после
+    фиксации транзакции. QuerySet.update() сигналы не вызывает.
+    """
+
+    if 'created' in kwargs and (kwargs['created'] or instance.is_active):
+        return
+    user_id = instance.pk
+    transaction.on_commit(lambda: revoke_user_tokens(user_id))
+
+
+class LazyTokenUser(TokenUser):
+    """
+    Пользователь, построенный по проверенному access-токену.
+
+    id, role, is_staff и is_superuser берутся из утверждений токена;
+    при обращении к другим полям пользователь один раз загружается
+    из базы. Токены, выпущенные до появления утверждения, тоже
+    работают: недостающее значение читается из базы.
+    """
+
+    @cached_property
+    def role(self):
+        return self._claim('role')
+
+    @cached_property
+    def is_staff(self):
+        return self._claim('is_staff')
+
+    @cached_property
+    def is_superuser(self):
+        return self._claim('is_superuser')
+
+    @cached_property
+    def is_active(self):
+        return self._claim('is_active')
+
+    @cached_property
+    def username(self):
+        return self.db_user.username
+
+    @cached_property
+    def db_user(self):
+        """Пользователь из базы; загружается при первом обращении."""
+
+        try:
+            return CustomUser.objects.get(pk=self.id)
+        except CustomUser.DoesNotExist:
+            raise AuthenticationFailed('User not found', code='user_not_found')
+
+    def get_username(self):
+        return self.db_user.get_username()
+
+    def _claim(self, name):
+        if name in self.token:
+            return self.token[name]
+        return getattr(self.db_user, name)
+
+    def __getattr__(self, attr):
+        if attr.startswith('_'):
+            raise AttributeError(attr)
+        return getattr(self.db_user, attr)
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT-аутентификация с проверкой отозванных токенов. При
+    JWT_STATELESS_AUTH = True request.user - LazyTokenUser, иначе
+    пользователь загружается из базы, как в JWTAuthentication.
+    """
+
+    def get_validated_token(self, raw_token):
+        token = super().get_validated_token(raw_token)
+        if is_revoked(token):
+            raise InvalidToken({'detail': 'Token is revoked', 'code': 'token_revoked'})
+        return token
+
+    def get_user(self, validated_token):
+        if not settings.JWT_STATELESS_AUTH:
+            return super().get_user(validated_token)
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken('Token contained no recognizable user identification')
+        user = LazyTokenUser(validated_token)
+        if not user.is_active:
+            raise AuthenticationFailed('User is inactive', code='user_inactive')
+        return user
+
+
+class RoleTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Выдает пару токенов с ролью и флагами администратора пользователя."""
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        for claim in USER_CLAIMS:
+            token[claim] = getattr(user, claim)
+        return token
+
+
+class RoleTokenRefreshSerializer(TokenRefreshSerializer):
+    """Обновляет access-токен, если refresh-токен не отозван."""
+
+    def validate(self, attrs):
+        if is_revoked(RefreshToken(attrs['refresh'])):
+            raise InvalidToken({'detail': 'Token is revoked', 'code': 'token_revoked'})
+        return super().validate(attrs)
+
+
+class PooledModelBackend(ModelBackend):
+    """
+    ModelBackend, проверяющий пароль в пуле хэширования (kittens.hashing),
+    а не в потоке запроса.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(CustomUser.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = CustomUser._default_manager.get_by_natural_key(username)
+        except CustomUser.DoesNotExist:
+            # Как в ModelBackend: хэш вычисляется и для неизвестного
+            # адреса, чтобы по времени ответа нельзя было узнать,
+            # зарегистрирован ли он.
+            hashing.make_password(password)
+            return None
+
+        is_correct, must_update = hashing.verify_password(password, user.password)
+        if not is_correct:
+            return None
+        if must_update:
+            # Хэш со старыми параметрами пересчитывается один раз.
+            user.password = hashing.make_password(password)
+            user.save(update_fields=['password'])
+        return user if self.user_can_authenticate(user) else None
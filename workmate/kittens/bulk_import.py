@@ -0,0 +1,137 @@
+"""
+Пакетный импорт котят из CSV или JSON.
+
+Породы указываются по названию: существующие находятся одним запросом,
+отсутствующие создаются одним bulk_create. Уникальность описаний
+проверяется внутри файла и одним запросом к базе на пакет. Котята
+вставляются через bulk_create пакетами по batch_size. Используется
+действием import набора котят и командой import_kittens.
+"""
+
+import csv
+import io
+import json
+from itertools import islice
+
+from django.db import IntegrityError, transaction
+from rest_framework.exceptions import ValidationError
+
+from . import cache
+from .models import Breed, Kitten
+from .serializers import KittenImportItemSerializer
+
+FORMATS = ('csv', 'json')
+
+
+def parse_records(content, file_format):
+    """
+    Разбирает содержимое файла (str) в список словарей. CSV должен
+    содержать заголовок name,color,age,description,breed; JSON - список
+    объектов с теми же ключами.
+    """
+
+    if file_format == 'csv':
+        return list(csv.DictReader(io.StringIO(content)))
+    try:
+        records = json.loads(content)
+    except json.JSONDecodeError as exc:
+        raise ValidationError({'detail': f'Invalid JSON: {exc}'})
+    if not isinstance(records, list):
+        raise ValidationError({'detail': 'Expected a list of kittens.'})
+    return records
+
+
+def batches(items, size):
+    items = iter(items)
+    while batch := list(islice(items, size)):
+        yield batch
+
+
+def import_kittens(records, owner_id, batch_size=500, dry_run=False):
+    """
+    Проверяет и импортирует котят владельца owner_id.
+
+    Корректные записи сохраняются, ошибочные возвращаются в отчете
+    с индексами записей. С dry_run=True ничего не сохраняется, а отчет
+    показывает, что было бы создано.
+    """
+
+    errors = []
+    valid = []
+    item_serializer = KittenImportItemSerializer()
+    for index, record in enumerate(records):
+        try:
+            valid.append((index, item_serializer.run_validation(record)))
+        except ValidationError as exc:
+            errors.append({'index': index, 'errors': exc.detail})
+
+    seen = set()
+    unique = []
+    for index, data in valid:
+        if data['description'] in seen:
+            errors.append({'index': index, 'errors': {
+                'description': ['Duplicate description in the file.']
+            }})
+            continue
+        seen.add(data['description'])
+        unique.append((index, data))
+
+    existing = set()
+    for batch in batches(seen, batch_size):
+        existing.update(
+            Kitten.objects.filter(description__in=batch).values_list('description', flat=True)
+        )
+    valid = []
+    for index, data in unique:
+        if data['description'] in existing:
+            errors.append({'index': index, 'errors': {
+                'description': ['Kitten with this description already exists.']
+            }})
+            continue
+        valid.append((index, data))
+
+    breed_names = {data['breed'] for _, data in valid}
+    breed_ids = {}
+    for breed_id, name in Breed.objects.filter(name__in=breed_names).order_by('-id').values_list('id', 'name'):
+        breed_ids[name] = breed_id
+    new_breeds = sorted(breed_names - set(breed_ids))
+
+    errors.sort(key=lambda error: error['index'])
+    report = {
+        'total': len(records),
+        'created': len(valid),
+        'breeds_created': new_breeds,
+        'errors': errors,
+        'dry_run': dry_run,
+    }
+    if dry_run or not valid:
+        return report
+
+    try:
+        with transaction.atomic():
+            created = Breed.objects.bulk_create(
+                [Breed(name=name) for name in new_breeds], batch_size=batch_size
+            )
+            breed_ids.update((breed.name, breed.id) for breed in created)
+            Kitten.objects.bulk_create(
+                (
+                    Kitten(
+                        name=data['name'],
+                        color=data['color'],
+                        age=data['age'],
+                        description=data['description'],
+                        breed_id=breed_ids[data['breed']],
+                        owner_id=owner_id,
+                    )
+                    for _, data in valid
+                ),
+                batch_size=batch_size,
+            )
+            cache.invalidate(cache.BREEDS, cache.KITTENS)
+    except IntegrityError:
+        # Параллельный запрос успел добавить котят с теми же описаниями.
+        raise ValidationError(
+            {'detail': 'Some of these descriptions have just been taken. '
+                       'Please retry the import.'}
+        )
+    return report
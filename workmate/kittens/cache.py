@@ -0,0 +1,275 @@
+import hashlib
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+from .db_router import reading_from_replica
+
+# Пространства имен версий: ответ зависит от одного или нескольких
+# пространств и становится недействительным при увеличении любой версии.
+BREEDS = 'breeds'
+KITTENS = 'kittens'
+RATINGS = 'ratings'
+
+_counters = Counter()
+_counters_lock = threading.Lock()
+
+
+def get_cache():
+    """Возвращает кэш, в котором хранятся ответы и версии."""
+
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+def _version_key(namespace):
+    return f'version:{namespace}'
+
+
+def _modified_key(namespace):
+    return f'modified:{namespace}'
+
+
+def get_version_state(namespaces):
+    """
+    Возвращает текущие версии пространств имен и время последнего
+    изменения любого из них (unix time).
+
+    Отсутствующая версия (новый кэш или вытеснение) инициализируется
+    временем в наносекундах, а не нулем, чтобы не повторить значение,
+    под которым в кэше еще могут лежать старые ответы.
+    """
+
+    cache = get_cache()
+    values = cache.get_many(_state_keys(namespaces))
+    for key, initial in _missing_state(namespaces, values):
+        cache.add(key, initial, timeout=None)
+        values[key] = cache.get(key)
+    return _unpack_state(namespaces, values)
+
+
+async def aget_version_state(namespaces):
+    """Асинхронный вариант get_version_state."""
+
+    cache = get_cache()
+    values = await cache.aget_many(_state_keys(namespaces))
+    for key, initial in _missing_state(namespaces, values):
+        await cache.aadd(key, initial, timeout=None)
+        values[key] = await cache.aget(key)
+    return _unpack_state(namespaces, values)
+
+
+def _state_keys(namespaces):
+    return (
+        [_version_key(namespace) for namespace in namespaces]
+        + [_modified_key(namespace) for namespace in namespaces]
+    )
+
+
+def _missing_state(namespaces, values):
+    """Ключи состояния, которых нет в кэше, и их начальные значения."""
+
+    for namespace in namespaces:
+        if _version_key(namespace) not in values:
+            yield _version_key(namespace), time.time_ns()
+        if _modified_key(namespace) not in values:
+            yield _modified_key(namespace), time.time()
+
+
+def _unpack_state(namespaces, values):
+    versions = [values[_version_key(namespace)] for namespace in namespaces]
+    last_modified = max(
+        (values[_modified_key(namespace)] for namespace in namespaces),
+        default=0,
+    )
+    return versions, last_modified
+
+
+def get_versions(namespaces):
+    """Возвращает текущие версии пространств имен."""
+
+    return get_version_state(namespaces)[0]
+
+
+def bump_versions(*namespaces):
+    """Делает недействительными все ответы, зависящие от пространств имен."""
+
+    cache = get_cache()
+    now = time.time()
+    for namespace in namespaces:
+        key = _version_key(namespace)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), timeout=None)
+        cache.set(_modified_key(namespace), now, timeout=None)
+
+
+def invalidate(*namespaces):
+    """
+    Сбрасывает версии пространств имен после фиксации текущей транзакции,
+    чтобы параллельный запрос не закэшировал данные до коммита.
+    """
+
+    transaction.on_commit(lambda: bump_versions(*namespaces))
+
+
+def record(basename, outcome):
+    """Увеличивает счетчик попаданий или промахов кэша для набора представлений."""
+
+    with _counters_lock:
+        _counters[(basename, outcome)] += 1
+
+
+def cache_stats():
+    """Возвращает счетчики попаданий и промахов кэша текущего процесса."""
+
+    with _counters_lock:
+        counters = dict(_counters)
+    result = {}
+    for (basename, outcome), value in sorted(counters.items()):
+        result.setdefault(basename, {'hits': 0, 'misses': 0})[outcome] = value
+    return result
+
+
+class VersionedMixin:
+    """
+    Общая часть кэша ответов и условных GET-запросов: версии пространств
+    имен, от которых зависит ответ, и отпечаток запроса.
+    """
+
+    cache_namespaces = ()
+
+    def get_cache_namespaces(self):
+        """Пространства имен, от которых зависит ответ на текущий запрос."""
+
+        return self.cache_namespaces
+
+    def get_version_state(self):
+        """Версии и время изменения, прочитанные один раз за запрос."""
+
+        if not hasattr(self, '_version_state'):
+            self._version_state = get_version_state(self.get_cache_namespaces())
+        return self._version_state
+
+    async def aget_version_state(self):
+        """Асинхронный вариант get_version_state."""
+
+        if not hasattr(self, '_version_state'):
+            self._version_state = await aget_version_state(self.get_cache_namespaces())
+        return self._version_state
+
+    def may_be_stale(self):
+        """
+        Могут ли данные ответа отставать от текущих версий: чтение идет
+        с реплики, а последнее изменение было меньше DATABASE_REPLICA_LAG
+        секунд назад. Такой ответ не кэшируется и не получает ETag.
+        """
+
+        if not reading_from_replica():
+            return False
+        _, last_modified = self.get_version_state()
+        return time.time() - last_modified < settings.DATABASE_REPLICA_LAG
+
+    def get_request_fingerprint(self, request):
+        """
+        Строка, однозначно описывающая ответ: набор представлений,
+        версии данных, роль пользователя, путь и параметры запроса.
+        """
+
+        versions, _ = self.get_version_state()
+        version = '.'.join(str(value) for value in versions)
+        query = sorted(request.query_params.lists())
+        digest = hashlib.md5(f'{request.path}?{query}'.encode()).hexdigest()
+        role = getattr(request.user, 'role', '')
+        return f'{self.basename}:{version}:{role}:{digest}'
+
+
+class CachedResponseMixin(VersionedMixin):
+    """
+    Кэширует ответы list и retrieve набора представлений.
+
+    Ключ строится из пути, параметров запроса, роли пользователя
+    и версий пространств имен из get_cache_namespaces(). Записи
+    сбрасывают версии через invalidate(), после чего старые ключи
+    больше не используются и вытесняются по таймауту.
+    """
+
+    def get_cache_key(self, request):
+        return f'response:{self.get_request_fingerprint(request)}'
+
+    def cached_response(self, request, build_response):
+        """
+        Возвращает ответ из кэша или строит его функцией build_response
+        и сохраняет, если он успешный.
+        """
+
+        if not settings.RESPONSE_CACHE_ENABLED:
+            return build_response()
+
+        cache = get_cache()
+        key = self.get_cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            return self._cache_hit(data)
+
+        record(self.basename, 'misses')
+        response = build_response()
+        if response.status_code == status.HTTP_200_OK and not self.may_be_stale():
+            cache.set(key, response.data, settings.RESPONSE_CACHE_TIMEOUT)
+        response['X-Cache'] = 'MISS'
+        return response
+
+    async def acached_response(self, request, build_response):
+        """
+        Асинхронный вариант cached_response; build_response
+        возвращает корутину.
+        """
+
+        if not settings.RESPONSE_CACHE_ENABLED:
+            return await build_response()
+
+        cache = get_cache()
+        await self.aget_version_state()
+        key = self.get_cache_key(request)
+        data = await cache.aget(key)
+        if data is not None:
+            return self._cache_hit(data)
+
+        record(self.basename, 'misses')
+        response = await build_response()
+        if response.status_code == status.HTTP_200_OK and not self.may_be_stale():
+            await cache.aset(key, response.data, settings.RESPONSE_CACHE_TIMEOUT)
+        response['X-Cache'] = 'MISS'
+        return response
+
+    def _cache_hit(self, data):
+        record(self.basename, 'hits')
+        response = Response(data)
+        response['X-Cache'] = 'HIT'
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(
+            request, lambda: super(CachedResponseMixin, self).list(request, *args, **kwargs)
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            request, lambda: super(CachedResponseMixin, self).retrieve(request, *args, **kwargs)
+        )
+
+    async def alist(self, request, *args, **kwargs):
+        return await self.acached_response(
+            request, lambda: super(CachedResponseMixin, self).alist(request, *args, **kwargs)
+        )
+
+    async def aretrieve(self, request, *args, **kwargs):
+        return await self.acached_response(
+            request, lambda: super(CachedResponseMixin, self).aretrieve(request, *args, **kwargs)
+        )
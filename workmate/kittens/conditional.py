@@ -0,0 +1,90 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+
+from .cache import VersionedMixin
+
+
+class ConditionalGetMixin(VersionedMixin):
+    """
+    Добавляет ETag и Last-Modified к ответам list и retrieve и отвечает
+    304 Not Modified на условные запросы.
+
+    ETag вычисляется из версий пространств имен (см. kittens.cache),
+    роли, пути, параметров и формата ответа, поэтому проверка
+    If-None-Match выполняется до обращения к queryset и сериализации.
+    """
+
+    def get_etag(self, request):
+        """Строгий ETag ответа; учитывает формат, выбранный клиентом."""
+
+        media_type = getattr(request, 'accepted_media_type', '')
+        fingerprint = f'{self.get_request_fingerprint(request)}:{media_type}'
+        return quote_etag(hashlib.sha1(fingerprint.encode()).hexdigest())
+
+    def conditional_response(self, request, build_response):
+        """
+        Возвращает 304, если у клиента актуальная версия ответа,
+        иначе строит ответ функцией build_response и добавляет заголовки.
+        """
+
+        etag, last_modified, response = self._check_conditions(request)
+        if response is None:
+            response = build_response()
+        return self._add_validators(response, etag, last_modified)
+
+    async def aconditional_response(self, request, build_response):
+        """
+        Асинхронный вариант conditional_response; build_response
+        возвращает корутину.
+        """
+
+        await self.aget_version_state()
+        etag, last_modified, response = self._check_conditions(request)
+        if response is None:
+            response = await build_response()
+        return self._add_validators(response, etag, last_modified)
+
+    def _check_conditions(self, request):
+        """
+        Вычисляет ETag и Last-Modified по уже прочитанным версиям
+        и возвращает готовый ответ 304, если условие выполнено.
+        """
+
+        etag = self.get_etag(request)
+        _, last_modified = self.get_version_state()
+        last_modified = int(last_modified)
+        response = get_conditional_response(
+            request._request, etag=etag, last_modified=last_modified
+        )
+        return etag, last_modified, response
+
+    def _add_validators(self, response, etag, last_modified):
+        if response.status_code == status.HTTP_200_OK and self.may_be_stale():
+            return response
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            request, lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs)
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            request, lambda: super(ConditionalGetMixin, self).retrieve(request, *args, **kwargs)
+        )
+
+    async def alist(self, request, *args, **kwargs):
+        return await self.aconditional_response(
+            request, lambda: super(ConditionalGetMixin, self).alist(request, *args, **kwargs)
+        )
+
+    async def aretrieve(self, request, *args, **kwargs):
+        return await self.aconditional_response(
+            request, lambda: super(ConditionalGetMixin, self).aretrieve(request, *args, **kwargs)
+        )
@@ -0,0 +1,29 @@
+from django.db import connections
+
+
+def pool_stats():
+    """
+    Возвращает состояние пулов соединений текущего процесса по псевдонимам
+    баз данных. Базы без пула (SQLite, PostgreSQL без OPTIONS['pool'])
+    не включаются.
+
+    checked_out - выданные соединения, waiting - запросы в очереди
+    за соединением, avg_wait_ms - среднее ожидание соединения.
+    Остальные поля - счетчики psycopg_pool (ConnectionPool.get_stats())
+    с момента запуска процесса.
+    """
+
+    result = {}
+    for alias in connections:
+        pool = getattr(connections[alias], 'pool', None)
+        if pool is None:
+            continue
+        stats = pool.get_stats()
+        requests = stats.get('requests_num', 0)
+        result[alias] = {
+            'checked_out': stats.get('pool_size', 0) - stats.get('pool_available', 0),
+            'waiting': stats.get('requests_waiting', 0),
+            'avg_wait_ms': round(stats.get('requests_wait_ms', 0) / requests, 3) if requests else 0,
+            **stats,
+        }
+    return result
@@ -0,0 +1,113 @@
+"""
+Чтение с реплик базы данных.
+
+ReplicaRoutingMiddleware отмечает безопасные запросы (GET, HEAD,
+OPTIONS), для которых чтение можно выполнять с реплик, а ReplicaRouter
+направляет такие чтения на одну из реплик из DATABASE_REPLICAS. Запись
+всегда идет в default. После успешного изменяющего запроса клиент
+получает cookie DATABASE_PRIMARY_COOKIE на DATABASE_REPLICA_LAG секунд,
+и пока она действует, его запросы читают из default и видят
+собственные изменения (read-your-writes).
+"""
+
+import random
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_replica_reads = ContextVar('replica_reads', default=False)
+
+
+def reading_from_replica():
+    """Выполняются ли чтения текущего запроса с реплик."""
+
+    return bool(settings.DATABASE_REPLICAS) and _replica_reads.get()
+
+
+def use_replicas(request):
+    """Можно ли читать данные для запроса с реплик."""
+
+    return (
+        request.method in SAFE_METHODS
+        and settings.DATABASE_PRIMARY_COOKIE not in request.COOKIES
+    )
+
+
+class ReplicaRouter:
+    """
+    Направляет чтение на реплики, если запрос отмечен middleware,
+    а все остальное - в default. Внутри транзакции чтение тоже идет
+    в default, чтобы видеть данные этой транзакции.
+    """
+
+    def db_for_read(self, model, **hints):
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db:
+            return instance._state.db
+        if not reading_from_replica() or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        return obj1._state.db in databases and obj2._state.db in databases
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Реплики получают схему и данные через репликацию.
+        return db not in settings.DATABASE_REPLICAS
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Разрешает чтение с реплик на время безопасного запроса и ставит
+    cookie закрепления за default после успешной записи.
+    Работает и в синхронном, и в асинхронном режиме.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _replica_reads.set(use_replicas(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            _replica_reads.reset(token)
+        return self.process_response(request, response)
+
+    async def __acall__(self, request):
+        token = _replica_reads.set(use_replicas(request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            _replica_reads.reset(token)
+        return self.process_response(request, response)
+
+    def process_response(self, request, response):
+        if (
+            settings.DATABASE_REPLICAS
+            and request.method not in SAFE_METHODS
+            and response.status_code < 400
+        ):
+            response.set_cookie(
+                settings.DATABASE_PRIMARY_COOKIE,
+                '1',
+                max_age=settings.DATABASE_REPLICA_LAG,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
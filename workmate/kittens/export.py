@@ -0,0 +1,209 @@
+"""
+Выгрузка оценок и котят в CSV и NDJSON.
+
+Строки читаются через values_list().iterator(chunk_size) (на PostgreSQL -
+серверным курсором) и кодируются частями, поэтому память не зависит
+от объема выгрузки. Используется действиями export наборов
+представлений и командой export_data. В режиме ASGI действие
+выполняется асинхронно (aexport) с асинхронным генератором частей:
+ответ с синхронным генератором Django собрал бы в память целиком.
+"""
+
+import csv
+import datetime
+import io
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAdminUser
+
+from .models import Kitten, Rating
+from .renderers import FastJSONRenderer
+from .serializers import ExportParamsSerializer
+
+FORMATS = ('csv', 'ndjson')
+
+CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+
+# Колонки выгрузки: (название колонки, поле для values_list).
+RATING_COLUMNS = (
+    ('id', 'id'),
+    ('created_at', 'created_at'),
+    ('score', 'score'),
+    ('comment', 'comment'),
+    ('kitten_id', 'kitten_id'),
+    ('kitten_name', 'kitten__name'),
+    ('breed_id', 'kitten__breed_id'),
+    ('breed_name', 'kitten__breed__name'),
+    ('user_id', 'user_id'),
+)
+
+KITTEN_COLUMNS = (
+    ('id', 'id'),
+    ('name', 'name'),
+    ('color', 'color'),
+    ('age', 'age'),
+    ('description', 'description'),
+    ('breed_id', 'breed_id'),
+    ('breed_name', 'breed__name'),
+    ('owner_id', 'owner_id'),
+)
+
+# Модель, колонки, поле породы и поле даты для фильтров выгрузки.
+EXPORTS = {
+    'ratings': (Rating, RATING_COLUMNS, 'kitten__breed_id', 'created_at'),
+    'kittens': (Kitten, KITTEN_COLUMNS, 'breed_id', None),
+}
+
+
+def day_start(date):
+    """Начало дня в текущем часовом поясе."""
+
+    return timezone.make_aware(datetime.datetime.combine(date, datetime.time.min))
+
+
+def export_queryset(kind, breed=None, date_from=None, date_to=None):
+    """
+    Возвращает queryset кортежей для выгрузки kind ('ratings' или
+    'kittens') в порядке id. Период date_from - date_to (включительно)
+    применяется только к оценкам: у котят нет даты.
+    """
+
+    model, columns, breed_field, date_field = EXPORTS[kind]
+    queryset = model.objects.order_by('id')
+    if breed is not None:
+        queryset = queryset.filter(**{breed_field: breed})
+    if date_field is not None and date_from is not None:
+        queryset = queryset.filter(**{f'{date_field}__gte': day_start(date_from)})
+    if date_field is not None and date_to is not None:
+        next_day = day_start(date_to + datetime.timedelta(days=1))
+        queryset = queryset.filter(**{f'{date_field}__lt': next_day})
+    return queryset.values_list(*(field for _, field in columns))
+
+
+def _plain(value):
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    return value
+
+
+# Начало ячейки, с которого табличный редактор читает формулу.
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _csv_cell(value):
+    """
+    Значение ячейки CSV. Текст пользователей (клички, описания,
+    комментарии), похожий на формулу, экранируется префиксом ',
+    чтобы табличный редактор показал его как текст.
+    """
+
+    value = _plain(value)
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _csv_chunk(rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows([_csv_cell(value) for value in row] for row in rows)
+    return buffer.getvalue().encode()
+
+
+def _ndjson_chunk(rows, names, dumps):
+    return b''.join(
+        dumps(dict(zip(names, map(_plain, row)))) + b'\n' for row in rows
+    )
+
+
+def _chunk_encoder(kind, file_format):
+    """Названия колонок и функция кодирования части строк в file_format."""
+
+    _, columns, _, _ = EXPORTS[kind]
+    names = [name for name, _ in columns]
+    if file_format == 'csv':
+        return names, _csv_chunk
+    dumps = FastJSONRenderer().dumps
+    return names, lambda rows: _ndjson_chunk(rows, names, dumps)
+
+
+def export_chunks(kind, file_format, queryset, chunk_size=2000):
+    """
+    Кодирует строки queryset из export_queryset() в file_format и
+    возвращает генератор частей (bytes) по chunk_size строк.
+    """
+
+    names, encode = _chunk_encoder(kind, file_format)
+    if file_format == 'csv':
+        yield _csv_chunk([names])
+    rows = queryset.iterator(chunk_size=chunk_size)
+    while chunk := list(islice(rows, chunk_size)):
+        yield encode(chunk)
+
+
+async def aexport_chunks(kind, file_format, queryset, chunk_size=2000):
+    """
+    Асинхронный вариант export_chunks. Части строк читаются в потоке
+    через sync_to_async, как в QuerySet.aiterator(): aiterator() для
+    values_list() в Django 5.1 выполняет запрос в цикле событий.
+    """
+
+    names, encode = _chunk_encoder(kind, file_format)
+    if file_format == 'csv':
+        yield _csv_chunk([names])
+    rows = queryset.iterator(chunk_size=chunk_size)
+    next_chunk = sync_to_async(lambda: list(islice(rows, chunk_size)))
+    while chunk := await next_chunk():
+        yield encode(chunk)
+
+
+class ExportMixin:
+    """
+    Добавляет действие export: GET <список>/export/?file_format=csv|ndjson
+    &breed=<id>&date_from=<дата>&date_to=<дата> выгружает все объекты
+    вида export_kind потоковым ответом. Доступно только is_staff.
+    """
+
+    export_kind = None
+
+    # Выгрузка содержит все объекты с id пользователей, поэтому доступна
+    # только организаторам (is_staff), как и остальная статистика для
+    # администраторов.
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
+    def export(self, request):
+        """Выгружает объекты в CSV или NDJSON."""
+
+        file_format, queryset = self.get_export_queryset(request)
+        return self.export_response(file_format, export_chunks(
+            self.export_kind, file_format, queryset, settings.API_STREAM_CHUNK_SIZE
+        ))
+
+    async def aexport(self, request):
+        file_format, queryset = self.get_export_queryset(request)
+        return self.export_response(file_format, aexport_chunks(
+            self.export_kind, file_format, queryset, settings.API_STREAM_CHUNK_SIZE
+        ))
+
+    def get_export_queryset(self, request):
+        """Формат и queryset выгрузки по параметрам запроса."""
+
+        params = ExportParamsSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        options = params.validated_data
+        file_format = options.pop('file_format')
+        return file_format, export_queryset(self.export_kind, **options)
+
+    def export_response(self, file_format, content):
+        response = StreamingHttpResponse(content, content_type=CONTENT_TYPES[file_format])
+        response['Content-Disposition'] = (
+            f'attachment; filename="{self.export_kind}.{file_format}"'
+        )
+        return response
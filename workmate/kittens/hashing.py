@@ -0,0 +1,163 @@
+"""
+Хэширование паролей вне потока запроса.
+
+Хэш PBKDF2 с рабочим числом итераций стоит десятки миллисекунд CPU.
+Регистрация (CustomUserSerializer) и вход (PooledModelBackend) вычисляют
+и проверяют хэши в пуле PASSWORD_HASHING_EXECUTOR:
+
+- 'process' - пул из PASSWORD_HASHING_WORKERS процессов: хэширование
+  не занимает GIL воркера и не конкурирует с обработкой остальных
+  запросов;
+- 'thread' - пул потоков того же размера: hashlib.pbkdf2_hmac отпускает
+  GIL, поэтому для PBKDF2 этого достаточно и нет передачи данных между
+  процессами;
+- 'inline' - в потоке запроса, как без пула.
+
+Пул ограничивает количество одновременных хэшей ядрами, а очередь
+к нему - PASSWORD_HASHING_MAX_PENDING: при переполнении запрос сразу
+получает 503 с Retry-After, а не ждет, пока истечет таймаут воркера.
+Время ожидания в очереди и вычисления, отказы и длина очереди
+отдаются на /metrics.
+
+Процессы пула запускаются через spawn при первом хэше в процессе
+сервера, поэтому безопасны для gunicorn --preload и потоков gthread.
+"""
+
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from .metrics import (
+    PASSWORD_HASH_DURATION,
+    PASSWORD_HASH_PENDING,
+    PASSWORD_HASH_REJECTED,
+    PASSWORD_HASH_WAIT,
+)
+
+EXECUTORS = ('process', 'thread', 'inline')
+
+_executors = {}
+_lock = threading.Lock()
+_pending = 0
+
+
+class HashingOverloaded(APIException):
+    """Очередь хэширования переполнена."""
+
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Too many password checks in progress, try again later.'
+    default_code = 'hashing_overloaded'
+    # DRF передает wait в заголовок Retry-After.
+    wait = 1
+
+
+def get_executor(kind):
+    """Пул для kind ('process' или 'thread'); создается при первом вызове."""
+
+    with _lock:
+        executor = _executors.get(kind)
+        if executor is None:
+            workers = settings.PASSWORD_HASHING_WORKERS
+            if kind == 'process':
+                # spawn: процесс пула не наследует потоки и соединения
+                # воркера; настройки Django он читает из окружения.
+                executor = ProcessPoolExecutor(
+                    workers, mp_context=multiprocessing.get_context('spawn')
+                )
+            else:
+                executor = ThreadPoolExecutor(workers, thread_name_prefix='password-hashing')
+            _executors[kind] = executor
+        return executor
+
+
+def shutdown_executors():
+    """Останавливает пулы процесса (для тестов и завершения работы)."""
+
+    with _lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _discard_executor(kind, executor):
+    with _lock:
+        if _executors.get(kind) is executor:
+            del _executors[kind]
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _timed(function, *args):
+    """Выполняется в пуле: возвращает результат и время вычисления."""
+
+    started = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - started
+
+
+def _set_pending(delta):
+    global _pending
+    with _lock:
+        if delta > 0 and _pending >= settings.PASSWORD_HASHING_MAX_PENDING:
+            return False
+        _pending += delta
+        PASSWORD_HASH_PENDING.set(_pending)
+        return True
+
+
+def run(operation, function, *args):
+    """
+    Выполняет function(*args) в пуле хэширования и возвращает результат.
+    Если очередь заполнена, вызывает HashingOverloaded.
+    """
+
+    kind = settings.PASSWORD_HASHING_EXECUTOR
+    labels = (operation,)
+    if kind == 'inline':
+        result, duration = _timed(function, *args)
+        PASSWORD_HASH_WAIT.observe(labels, 0.0)
+        PASSWORD_HASH_DURATION.observe(labels, duration)
+        return result
+
+    if not _set_pending(1):
+        PASSWORD_HASH_REJECTED.inc(labels)
+        raise HashingOverloaded()
+    try:
+        executor = get_executor(kind)
+        submitted = time.perf_counter()
+        try:
+            result, duration = executor.submit(_timed, function, *args).result()
+        except BrokenProcessPool:
+            # Процесс пула завершился аварийно: пул пересоздается при
+            # следующем вызове, а текущий хэш вычисляется на месте.
+            _discard_executor(kind, executor)
+            submitted = time.perf_counter()
+            result, duration = _timed(function, *args)
+        elapsed = time.perf_counter() - submitted
+    finally:
+        _set_pending(-1)
+    PASSWORD_HASH_WAIT.observe(labels, max(0.0, elapsed - duration))
+    PASSWORD_HASH_DURATION.observe(labels, duration)
+    return result
+
+
+def make_password(password):
+    """Хэш пароля для сохранения (см. django.contrib.auth.hashers)."""
+
+    return run('hash', hashers.make_password, password)
+
+
+def verify_password(password, encoded):
+    """
+    Проверяет пароль по хэшу. Возвращает пару (пароль верен, хэш нужно
+    пересчитать с текущими параметрами).
+    """
+
+    return run('verify', hashers.verify_password, password, encoded)
@@ -0,0 +1,47 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from kittens.export import EXPORTS, FORMATS, export_chunks, export_queryset
+
+
+def parse_date(value):
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        raise CommandError(f'Invalid date: {value!r}, expected YYYY-MM-DD.')
+
+
+class Command(BaseCommand):
+    """
+    Выгружает оценки или котят в CSV или NDJSON в файл или stdout.
+    Строки читаются и записываются частями, память не зависит от объема.
+    """
+
+    help = 'Export ratings or kittens as CSV or NDJSON.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(EXPORTS))
+        parser.add_argument('--file-format', choices=FORMATS, default='csv')
+        parser.add_argument('--breed', type=int, help='Only this breed id.')
+        parser.add_argument('--date-from', type=parse_date, help='Ratings from this date.')
+        parser.add_argument('--date-to', type=parse_date, help='Ratings up to this date.')
+        parser.add_argument('--chunk-size', type=int, default=2000)
+        parser.add_argument('--output', help='Output file (default: stdout).')
+
+    def handle(self, *args, **options):
+        queryset = export_queryset(
+            options['kind'],
+            breed=options['breed'],
+            date_from=options['date_from'],
+            date_to=options['date_to'],
+        )
+        chunks = export_chunks(
+            options['kind'], options['file_format'], queryset, options['chunk_size']
+        )
+        if options['output']:
+            with open(options['output'], 'wb') as output:
+                output.writelines(chunks)
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk.decode(), ending='')
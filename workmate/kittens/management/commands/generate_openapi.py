@@ -0,0 +1,45 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from kittens.openapi import FORMATS, generate_schema, schema_path
+
+
+class Command(BaseCommand):
+    """
+    Строит схему OpenAPI и сохраняет ее в файл, который отдает /swagger/.
+
+    С флагом --check только сравнивает файл с текущей схемой
+    и завершается ошибкой, если файл устарел.
+    """
+
+    help = 'Generate the OpenAPI schema artifact served by /swagger/.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=FORMATS, default='json')
+        parser.add_argument(
+            '--output',
+            help='Write to this file instead of OPENAPI_SCHEMA_DIR/schema-<version>.<format>.',
+        )
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Only check that the file matches the current schema.',
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options['output'] or schema_path(options['format']))
+        content = generate_schema(options['format'])
+
+        if options['check']:
+            if not path.exists() or path.read_bytes() != content:
+                raise CommandError(f'{path} is out of date, run generate_openapi.')
+            self.stdout.write(self.style.SUCCESS(f'{path} is up to date.'))
+            return
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Запись через временный файл: воркеры не прочитают файл наполовину.
+        temporary = path.with_name(path.name + '.tmp')
+        temporary.write_bytes(content)
+        temporary.replace(path)
+        self.stdout.write(self.style.SUCCESS(f'Wrote {path} ({len(content)} bytes).'))
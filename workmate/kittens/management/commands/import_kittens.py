@@ -0,0 +1,51 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ValidationError
+
+from kittens.bulk_import import FORMATS, import_kittens, parse_records
+from kittens.models import CustomUser
+
+
+class Command(BaseCommand):
+    """
+    Импортирует котят из CSV или JSON-файла от имени владельца
+    и печатает отчет в JSON.
+    """
+
+    help = 'Import kittens from a CSV or JSON file.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--owner', required=True, help='Owner email.')
+        parser.add_argument(
+            '--file-format', choices=FORMATS,
+            help='File format (default: by file extension).',
+        )
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        try:
+            owner = CustomUser.objects.get(email=options['owner'])
+        except CustomUser.DoesNotExist:
+            raise CommandError(f'User {options["owner"]!r} does not exist.')
+
+        path = options['path']
+        file_format = options['file_format'] or (
+            'json' if path.lower().endswith('.json') else 'csv'
+        )
+        try:
+            with open(path, encoding='utf-8-sig') as source:
+                records = parse_records(source.read(), file_format)
+            report = import_kittens(
+                records,
+                owner_id=owner.id,
+                batch_size=options['batch_size'],
+                dry_run=options['dry_run'],
+            )
+        except OSError as exc:
+            raise CommandError(str(exc))
+        except ValidationError as exc:
+            raise CommandError(json.dumps(exc.detail, ensure_ascii=False))
+        self.stdout.write(json.dumps(report, ensure_ascii=False, indent=2))
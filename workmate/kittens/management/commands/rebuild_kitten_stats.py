@@ -0,0 +1,95 @@
+import math
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from kittens.models import KittenStats
+from kittens.stats import bayesian_average, compute_stats_from_ratings
+
+STATS_FIELDS = (
+    'breed_id',
+    'total_score',
+    'rating_count',
+    'score_1',
+    'score_2',
+    'score_3',
+    'score_4',
+    'score_5',
+)
+
+
+class Command(BaseCommand):
+    """
+    Пересчитывает статистику оценок котят по таблице Rating.
+
+    С флагом --verify только сравнивает сохраненную статистику
+    с пересчитанной и завершается ошибкой при расхождениях.
+    """
+
+    help = 'Rebuild or verify denormalized kitten rating statistics.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verify',
+            action='store_true',
+            help='Only compare stored statistics with the Rating table.',
+        )
+
+    def handle(self, *args, **options):
+        expected = compute_stats_from_ratings()
+
+        if options['verify']:
+            mismatches = self._find_mismatches(expected)
+            for kitten_id, field, stored, actual in mismatches:
+                self.stdout.write(
+                    f'kitten {kitten_id}: {field} stored={stored} actual={actual}'
+                )
+            if mismatches:
+                raise CommandError(
+                    f'{len(mismatches)} mismatching values found.'
+                )
+            self.stdout.write(self.style.SUCCESS('Kitten statistics are consistent.'))
+            return
+
+        with transaction.atomic():
+            KittenStats.objects.all().delete()
+            KittenStats.objects.bulk_create(expected.values(), batch_size=1000)
+        self.stdout.write(
+            self.style.SUCCESS(f'Rebuilt statistics for {len(expected)} kittens.')
+        )
+
+    def _find_mismatches(self, expected):
+        """Возвращает список расхождений (kitten_id, поле, сохранено, ожидается)."""
+
+        mismatches = []
+        stored = {stats.kitten_id: stats for stats in KittenStats.objects.all()}
+        for kitten_id in stored.keys() | expected.keys():
+            current = stored.get(kitten_id)
+            actual = expected.get(kitten_id)
+            if actual is None:
+                # Все оценки котенка удалены: допустима строка с нулями.
+                actual = KittenStats(
+                    kitten_id=kitten_id,
+                    breed_id=current.breed_id,
+                    bayesian_score=bayesian_average(0, 0),
+                )
+            if current is None:
+                current = KittenStats(kitten_id=kitten_id)
+            for field in STATS_FIELDS:
+                if getattr(current, field) != getattr(actual, field):
+                    mismatches.append(
+                        (kitten_id, field, getattr(current, field), getattr(actual, field))
+                    )
+            for field in ('average_score', 'bayesian_score'):
+                stored_value, actual_value = getattr(current, field), getattr(actual, field)
+                if not _close(stored_value, actual_value):
+                    mismatches.append((kitten_id, field, stored_value, actual_value))
+        return sorted(mismatches)
+
+
+def _close(stored, actual):
+    """Сравнивает вычисленные значения с учетом погрешности и None."""
+
+    if stored is None or actual is None:
+        return stored is actual
+    return math.isclose(stored, actual)
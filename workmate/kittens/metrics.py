@@ -0,0 +1,330 @@
+"""
+Метрики производительности запросов.
+
+PerformanceMiddleware замеряет для каждого запроса общее время,
+количество и время SQL-запросов, время сериализации и размер ответа,
+отдает их клиенту в заголовке Server-Timing и накапливает гистограммы
+по представлениям. Гистограммы отдаются в формате Prometheus на
+/metrics. Значения хранятся в памяти процесса, поэтому при нескольких
+воркерах gunicorn каждый воркер отдает свои.
+
+Если PERF_METRICS_ENABLED выключен, middleware не подключается,
+а обертка SQL-запросов не устанавливается.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.http import require_GET
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+_current = ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    """Счетчики одного запроса; заполняются оберткой SQL и сериализаторами."""
+
+    __slots__ = ('db_queries', 'db_time', 'serializer_time', 'serializing')
+
+    def __init__(self):
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.serializing = False
+
+
+def current_metrics():
+    """Счетчики текущего запроса или None вне PerformanceMiddleware."""
+
+    return _current.get()
+
+
+class Histogram:
+    """Гистограмма Prometheus с метками; потокобезопасна."""
+
+    def __init__(self, name, documentation, buckets, labels=('view', 'method')):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = buckets
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, label_values, value):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(label_values)
+            if entry is None:
+                entry = self._values[label_values] = [[0] * len(self.buckets), 0, 0.0]
+            if index < len(self.buckets):
+                entry[0][index] += 1
+            entry[1] += 1
+            entry[2] += value
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def collect(self):
+        """Строки в текстовом формате Prometheus."""
+
+        with self._lock:
+            values = {
+                key: (list(counts), total, sum_)
+                for key, (counts, total, sum_) in self._values.items()
+            }
+        yield f'# HELP {self.name} {self.documentation}'
+        yield f'# TYPE {self.name} histogram'
+        for label_values, (counts, total, sum_) in sorted(values.items()):
+            labels = format_labels(self.labels, label_values)
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                yield f'{self.name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+            yield f'{self.name}_bucket{{{labels},le="+Inf"}} {total}'
+            yield f'{self.name}_sum{{{labels}}} {sum_}'
+            yield f'{self.name}_count{{{labels}}} {total}'
+
+
+class Counter:
+    """Счетчик Prometheus с метками; потокобезопасен."""
+
+    def __init__(self, name, documentation, labels):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, label_values):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def collect(self):
+        with self._lock:
+            values = dict(self._values)
+        yield f'# HELP {self.name} {self.documentation}'
+        yield f'# TYPE {self.name} counter'
+        for label_values, value in sorted(values.items()):
+            yield f'{self.name}{{{format_labels(self.labels, label_values)}}} {value}'
+
+
+class Gauge:
+    """Текущее значение Prometheus (без меток); потокобезопасно."""
+
+    def __init__(self, name, documentation):
+        self.name = name
+        self.documentation = documentation
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def set(self, value):
+        with self._lock:
+            self._value = value
+
+    def clear(self):
+        self.set(0)
+
+    def collect(self):
+        with self._lock:
+            value = self._value
+        yield f'# HELP {self.name} {self.documentation}'
+        yield f'# TYPE {self.name} gauge'
+        yield f'{self.name} {value}'
+
+
+def format_labels(names, values):
+    return ','.join(
+        f'{name}="{escape_label(value)}"' for name, value in zip(names, values)
+    )
+
+
+def escape_label(value):
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+REQUESTS = Counter(
+    'workmate_requests_total', 'Total HTTP requests.', ('view', 'method', 'status')
+)
+REQUEST_DURATION = Histogram(
+    'workmate_request_duration_seconds', 'Request wall time.', DURATION_BUCKETS
+)
+DB_QUERIES = Histogram(
+    'workmate_db_queries', 'SQL queries per request.', QUERY_COUNT_BUCKETS
+)
+DB_DURATION = Histogram(
+    'workmate_db_duration_seconds', 'SQL time per request.', DURATION_BUCKETS
+)
+SERIALIZER_DURATION = Histogram(
+    'workmate_serializer_duration_seconds', 'Serializer time per request.', DURATION_BUCKETS
+)
+RESPONSE_SIZE = Histogram(
+    'workmate_response_size_bytes', 'Response body size.', SIZE_BUCKETS
+)
+# Хэширование паролей (kittens.hashing); operation - hash или verify.
+PASSWORD_HASH_WAIT = Histogram(
+    'workmate_password_hash_wait_seconds', 'Password hashing queue wait.',
+    DURATION_BUCKETS, labels=('operation',),
+)
+PASSWORD_HASH_DURATION = Histogram(
+    'workmate_password_hash_duration_seconds', 'Password hashing CPU time.',
+    DURATION_BUCKETS, labels=('operation',),
+)
+PASSWORD_HASH_REJECTED = Counter(
+    'workmate_password_hash_rejected_total', 'Password hashing requests shed.', ('operation',)
+)
+PASSWORD_HASH_PENDING = Gauge(
+    'workmate_password_hash_pending', 'Password hashing requests queued or running.'
+)
+METRICS = (
+    REQUESTS, REQUEST_DURATION, DB_QUERIES, DB_DURATION, SERIALIZER_DURATION, RESPONSE_SIZE,
+    PASSWORD_HASH_WAIT, PASSWORD_HASH_DURATION, PASSWORD_HASH_REJECTED, PASSWORD_HASH_PENDING,
+)
+
+
+def render_metrics():
+    """Все метрики процесса в текстовом формате Prometheus."""
+
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.collect())
+    return '\n'.join(lines) + '\n'
+
+
+def reset_metrics():
+    for metric in METRICS:
+        metric.clear()
+
+
+def record_query(execute, sql, params, many, context):
+    """Обертка execute_wrapper: учитывает SQL-запросы текущего запроса."""
+
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.db_time += time.perf_counter() - start
+        metrics.db_queries += 1
+
+
+def install_query_wrapper(sender, connection, **kwargs):
+    """
+    Обработчик connection_created. Обертка ставится на каждое
+    соединение, а не на время запроса, потому что в асинхронных
+    представлениях запросы выполняются в других потоках со своими
+    соединениями; счетчики находятся через ContextVar.
+    """
+
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class TimedSerializerMixin:
+    """
+    Учитывает время to_representation во времени сериализации запроса.
+    Вложенные сериализаторы не учитываются повторно.
+    """
+
+    def to_representation(self, instance):
+        metrics = _current.get()
+        if metrics is None or metrics.serializing:
+            return super().to_representation(instance)
+        metrics.serializing = True
+        start = time.perf_counter()
+        try:
+            return super().to_representation(instance)
+        finally:
+            metrics.serializer_time += time.perf_counter() - start
+            metrics.serializing = False
+
+
+class PerformanceMiddleware:
+    """
+    Замеряет запрос, добавляет заголовок Server-Timing и записывает
+    метрики. Должен стоять первым в MIDDLEWARE, чтобы учитывать время
+    остальных middleware. Работает и в синхронном, и в асинхронном режиме.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.PERF_METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.process_response(request, response, metrics, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.process_response(request, response, metrics, time.perf_counter() - start)
+
+    def process_response(self, request, response, metrics, duration):
+        match = request.resolver_match
+        labels = (match.view_name if match else 'unresolved', request.method)
+        REQUESTS.inc(labels + (response.status_code,))
+        REQUEST_DURATION.observe(labels, duration)
+        DB_QUERIES.observe(labels, metrics.db_queries)
+        DB_DURATION.observe(labels, metrics.db_time)
+        SERIALIZER_DURATION.observe(labels, metrics.serializer_time)
+        # Размер потокового ответа заранее неизвестен.
+        if not response.streaming:
+            RESPONSE_SIZE.observe(labels, len(response.content))
+
+        response['Server-Timing'] = (
+            f'db;dur={metrics.db_time * 1000:.2f};desc="{metrics.db_queries} queries", '
+            f'serializer;dur={metrics.serializer_time * 1000:.2f}, '
+            f'total;dur={duration * 1000:.2f}'
+        )
+        return response
+
+
+@require_GET
+def metrics_view(request):
+    """
+    Отдает метрики в формате Prometheus. Если задан METRICS_TOKEN,
+    требует заголовок Authorization: Bearer <METRICS_TOKEN>.
+    """
+
+    token = settings.METRICS_TOKEN
+    authorization = request.headers.get('Authorization', '')
+    if token and not constant_time_compare(authorization, f'Bearer {token}'):
+        return HttpResponseForbidden()
+    return HttpResponse(render_metrics(), content_type=CONTENT_TYPE)
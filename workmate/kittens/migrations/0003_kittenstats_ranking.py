@@ -0,0 +1,47 @@
+# Generated by Django 5.1.1 on 2026-10-18 14:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_ranking(apps, schema_editor):
+    """Заполняет породу и байесовскую среднюю для существующих строк."""
+
+    from kittens.stats import bayesian_average
+
+    KittenStats = apps.get_model('kittens', 'KittenStats')
+    for stats in KittenStats.objects.select_related('kitten').iterator():
+        stats.breed_id = stats.kitten.breed_id
+        stats.bayesian_score = bayesian_average(
+            stats.total_score, stats.rating_count
+        )
+        stats.save(update_fields=['breed', 'bayesian_score'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kittens', '0002_kittenstats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='kittenstats',
+            name='bayesian_score',
+            field=models.FloatField(default=0, verbose_name='Байесовская средняя оценка'),
+        ),
+        migrations.AddField(
+            model_name='kittenstats',
+            name='breed',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='kittens.breed', verbose_name='Порода'),
+        ),
+        migrations.AddIndex(
+            model_name='kittenstats',
+            index=models.Index(fields=['-bayesian_score', 'kitten'], name='kittenstats_ranking_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='kittenstats',
+            index=models.Index(fields=['breed', '-bayesian_score', 'kitten'], name='kittenstats_breed_ranking_idx'),
+        ),
+        migrations.RunPython(backfill_ranking, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 5.1.1 on 2026-10-18 15:07
+
+from django.db import migrations, models
+from django.db.models import Count, Min, Q, Sum
+
+
+def remove_duplicate_ratings(apps, schema_editor):
+    """
+    Удаляет повторные оценки одного пользователя одному котенку,
+    оставляя самую раннюю, и пересчитывает статистику затронутых котят.
+    """
+
+    from kittens.stats import bayesian_average
+
+    Rating = apps.get_model('kittens', 'Rating')
+    KittenStats = apps.get_model('kittens', 'KittenStats')
+
+    duplicates = (
+        Rating.objects
+        .order_by()
+        .values('user_id', 'kitten_id')
+        .annotate(first_id=Min('id'), total=Count('id'))
+        .filter(total__gt=1)
+    )
+    kitten_ids = set()
+    for group in duplicates:
+        Rating.objects.filter(
+            user_id=group['user_id'], kitten_id=group['kitten_id']
+        ).exclude(id=group['first_id']).delete()
+        kitten_ids.add(group['kitten_id'])
+
+    histogram = {
+        f'score_{score}': Count('id', filter=Q(score=score))
+        for score in range(1, 6)
+    }
+    rows = (
+        Rating.objects
+        .filter(kitten_id__in=kitten_ids)
+        .order_by()
+        .values('kitten_id')
+        .annotate(total_score=Sum('score'), rating_count=Count('id'), **histogram)
+    )
+    for row in rows:
+        kitten_id = row.pop('kitten_id')
+        row['bayesian_score'] = bayesian_average(
+            row['total_score'], row['rating_count']
+        )
+        KittenStats.objects.filter(kitten_id=kitten_id).update(**row)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kittens', '0003_kittenstats_ranking'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='kitten',
+            index=models.Index(fields=['breed', 'id'], name='kitten_breed_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rating',
+            index=models.Index(fields=['kitten', 'score'], name='rating_kitten_score_idx'),
+        ),
+        migrations.RunPython(remove_duplicate_ratings, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='rating',
+            constraint=models.UniqueConstraint(fields=('user', 'kitten'), name='rating_unique_user_kitten'),
+        ),
+    ]
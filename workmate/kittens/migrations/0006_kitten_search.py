@@ -0,0 +1,49 @@
+from django.db import migrations
+
+# Вычисляемый столбец и индексы есть только на PostgreSQL (см. kittens.search).
+# На большой таблице добавление столбца переписывает ее под блокировкой,
+# поэтому миграцию лучше выполнять в окно обслуживания.
+FORWARD_SQL = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    """
+    ALTER TABLE kittens_kitten ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(name, '')), 'A')
+        || setweight(to_tsvector('simple', coalesce(color, '')), 'B')
+        || setweight(to_tsvector('simple', coalesce(description, '')), 'C')
+    ) STORED
+    """,
+    'CREATE INDEX kitten_search_vector_idx ON kittens_kitten USING gin (search_vector)',
+    'CREATE INDEX kitten_name_trgm_idx ON kittens_kitten USING gin (name gin_trgm_ops)',
+    'CREATE INDEX kitten_color_trgm_idx ON kittens_kitten USING gin (color gin_trgm_ops)',
+]
+
+BACKWARD_SQL = [
+    'DROP INDEX IF EXISTS kitten_color_trgm_idx',
+    'DROP INDEX IF EXISTS kitten_name_trgm_idx',
+    'DROP INDEX IF EXISTS kitten_search_vector_idx',
+    'ALTER TABLE kittens_kitten DROP COLUMN IF EXISTS search_vector',
+]
+
+
+def run_on_postgresql(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kittens', '0005_rating_created_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_on_postgresql(FORWARD_SQL), run_on_postgresql(BACKWARD_SQL)
+        ),
+    ]
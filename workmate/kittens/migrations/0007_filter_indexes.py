@@ -0,0 +1,47 @@
+# Generated by Django 5.1.1 on 2026-10-18 16:26
+
+from django.db import migrations, models
+from django.db.models import F, FloatField, Value
+from django.db.models.functions import Cast, NullIf
+
+
+def backfill_average(apps, schema_editor):
+    """Заполняет среднюю оценку существующих строк одним UPDATE."""
+
+    KittenStats = apps.get_model('kittens', 'KittenStats')
+    KittenStats.objects.update(
+        average_score=Cast(F('total_score'), FloatField())
+        / NullIf(Cast(F('rating_count'), FloatField()), Value(0.0))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kittens', '0006_kitten_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='kittenstats',
+            name='average_score',
+            field=models.FloatField(null=True, verbose_name='Средняя оценка'),
+        ),
+        migrations.AddIndex(
+            model_name='kitten',
+            index=models.Index(fields=['age', 'id'], name='kitten_age_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='kitten',
+            index=models.Index(fields=['color', 'id'], name='kitten_color_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='kittenstats',
+            index=models.Index(fields=['average_score', 'kitten'], name='kittenstats_average_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rating',
+            index=models.Index(fields=['score', 'id'], name='rating_score_id_idx'),
+        ),
+        migrations.RunPython(backfill_average, migrations.RunPython.noop),
+    ]
@@ -87,6 +87,14 @@ class Kitten(models.Model):
         verbose_name = 'Котенок'
         verbose_name_plural = 'Котята'
         ordering = ('id',)
+        indexes = [
+            # Список котят с фильтром ?breed= и курсором по id.
+            models.Index(fields=['breed', 'id'], name='kitten_breed_id_idx'),
+            # Фильтры ?age=, ?color= (в том числе диапазоны и __in)
+            # со списком в порядке id.
+            models.Index(fields=['age', 'id'], name='kitten_age_id_idx'),
+            models.Index(fields=['color', 'id'], name='kitten_color_id_idx'),
+        ]
 
 
 class Rating(models.Model):
@@ -111,9 +119,105 @@ class Rating(models.Model):
         verbose_name='Комментарий',
         blank=True,
     )
+    created_at = models.DateTimeField(
+        verbose_name='Дата оценки',
+        auto_now_add=True,
+    )
 
 
     class Meta:
         verbose_name = 'Рейтинг'
         verbose_name_plural = 'Рейтинги'
         ordering = ('id',)
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'kitten'],
+                name='rating_unique_user_kitten',
+            ),
+        ]
+        indexes = [
+            # Агрегаты оценок котенка читаются только из индекса.
+            models.Index(fields=['kitten', 'score'], name='rating_kitten_score_idx'),
+            # Выгрузка оценок за период (kittens.export).
+            models.Index(fields=['created_at'], name='rating_created_at_idx'),
+            # Фильтр оценок по баллу (?score=, ?score__gte=) с курсором по id.
+            models.Index(fields=['score', 'id'], name='rating_score_id_idx'),
+        ]
+
+
+class KittenStats(models.Model):
+    """
+    Денормализованная статистика оценок котенка.
+
+    Поддерживается инкрементально при создании, изменении и удалении
+    оценок (см. kittens.stats), чтобы не агрегировать таблицу Rating
+    на каждый запрос.
+    """
+
+    kitten = models.OneToOneField(
+        Kitten,
+        primary_key=True,
+        related_name='stats',
+        on_delete=models.CASCADE,
+        verbose_name='Котенок',
+    )
+    breed = models.ForeignKey(
+        Breed,
+        related_name='+',
+        on_delete=models.CASCADE,
+        null=True,
+        verbose_name='Порода',
+    )
+    total_score = models.PositiveIntegerField(
+        verbose_name='Сумма оценок',
+        default=0,
+    )
+    rating_count = models.PositiveIntegerField(
+        verbose_name='Количество оценок',
+        default=0,
+    )
+    score_1 = models.PositiveIntegerField(default=0)
+    score_2 = models.PositiveIntegerField(default=0)
+    score_3 = models.PositiveIntegerField(default=0)
+    score_4 = models.PositiveIntegerField(default=0)
+    score_5 = models.PositiveIntegerField(default=0)
+    average_score = models.FloatField(
+        verbose_name='Средняя оценка',
+        null=True,
+    )
+    bayesian_score = models.FloatField(
+        verbose_name='Байесовская средняя оценка',
+        default=0,
+    )
+
+
+    class Meta:
+        verbose_name = 'Статистика оценок'
+        verbose_name_plural = 'Статистика оценок'
+        ordering = ('kitten',)
+        indexes = [
+            # Индексы рейтинга: лидерборд читает первые N строк
+            # в порядке индекса, в том числе в пределах породы.
+            models.Index(
+                fields=['-bayesian_score', 'kitten'],
+                name='kittenstats_ranking_idx',
+            ),
+            models.Index(
+                fields=['breed', '-bayesian_score', 'kitten'],
+                name='kittenstats_breed_ranking_idx',
+            ),
+            # Фильтр котят по средней оценке (?average_score__gte=).
+            models.Index(
+                fields=['average_score', 'kitten'],
+                name='kittenstats_average_idx',
+            ),
+        ]
+
+    @property
+    def histogram(self):
+        """Количество оценок по каждому значению от 1 до 5."""
+
+        return {
+            str(score): getattr(self, f'score_{score}')
+            for score in range(1, 6)
+        }
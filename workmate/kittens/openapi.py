@@ -0,0 +1,141 @@
+"""
+Схема OpenAPI и Swagger UI без генерации схемы на каждый запрос.
+
+Команда generate_openapi один раз строит схему drf-yasg (при запуске
+контейнера, см. entrypoint.sh) и сохраняет ее в файл
+OPENAPI_SCHEMA_DIR/schema-<версия API>.json. /swagger/?format=openapi
+отдает этот файл из памяти процесса с ETag, поэтому повторный запрос
+браузера получает 304 без тела. /swagger/ - шаблон Swagger UI из
+drf-yasg, который загружает схему по тому же адресу.
+
+drf_yasg импортируется только при генерации схемы. Если файла нет
+(например, при runserver без команды), схема строится при первом
+запросе и хранится в памяти процесса.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.shortcuts import render
+from django.test import RequestFactory
+from django.views.decorators.cache import never_cache
+from django.views.decorators.http import condition, require_GET
+from rest_framework.request import Request
+
+logger = logging.getLogger(__name__)
+
+API_VERSION = 'v1'
+INFO = {
+    'title': 'Kitten Exhibition API',
+    'description': 'API for managing kitten exhibitions',
+}
+FORMATS = ('json', 'yaml')
+
+# Настройки Swagger UI: значения по умолчанию drf-yasg. Вход через
+# сессию Django не нужен: API использует JWT (кнопка Authorize).
+SWAGGER_UI_SETTINGS = {
+    'docExpansion': 'list',
+    'deepLinking': False,
+    'showExtensions': True,
+    'defaultModelRendering': 'model',
+    'defaultModelExpandDepth': 3,
+    'defaultModelsExpandDepth': 3,
+    'showCommonExtensions': True,
+    'displayOperationId': True,
+    'persistAuth': False,
+    'refetchWithAuth': False,
+    'refetchOnLogout': False,
+    'fetchSchemaWithQuery': True,
+}
+
+_schema = None
+_lock = threading.Lock()
+
+
+def schema_path(file_format='json'):
+    return Path(settings.OPENAPI_SCHEMA_DIR) / f'schema-{API_VERSION}.{file_format}'
+
+
+def generate_schema(file_format='json'):
+    """Строит схему всех эндпоинтов и возвращает ее в file_format (bytes)."""
+
+    from drf_yasg import openapi
+    from drf_yasg.codecs import OpenAPICodecJson, OpenAPICodecYaml
+    from drf_yasg.generators import OpenAPISchemaGenerator
+
+    generator = OpenAPISchemaGenerator(openapi.Info(default_version=API_VERSION, **INFO))
+    # Представления читают параметры запроса даже при построении схемы,
+    # поэтому им передается анонимный GET-запрос.
+    request = Request(RequestFactory().get('/swagger/'))
+    schema = generator.get_schema(request=request, public=True)
+    # Адрес сервера не сохраняется в файл: Swagger UI подставит адрес,
+    # с которого открыт.
+    schema.pop('host', None)
+    schema.pop('schemes', None)
+    codec = OpenAPICodecYaml if file_format == 'yaml' else OpenAPICodecJson
+    return codec(validators=[]).encode(schema)
+
+
+def get_schema():
+    """Схема JSON из файла (или сгенерированная) и ее ETag."""
+
+    global _schema
+    if _schema is None:
+        with _lock:
+            if _schema is None:
+                path = schema_path()
+                try:
+                    content = path.read_bytes()
+                except FileNotFoundError:
+                    logger.warning(
+                        '%s not found, building the schema in process; '
+                        'run "manage.py generate_openapi" at deploy time.', path
+                    )
+                    content = generate_schema()
+                _schema = (content, hashlib.sha256(content).hexdigest()[:32])
+    return _schema
+
+
+def reset_schema():
+    """Забывает загруженную схему: следующий запрос прочитает файл заново."""
+
+    global _schema
+    with _lock:
+        _schema = None
+
+
+@require_GET
+@condition(etag_func=lambda request: get_schema()[1])
+def schema_view(request):
+    response = HttpResponse(get_schema()[0], content_type='application/json')
+    # Браузер хранит схему, но перед использованием проверяет ETag.
+    response['Cache-Control'] = 'no-cache'
+    return response
+
+
+@never_cache
+def _swagger_ui(request):
+    return render(request, 'drf-yasg/swagger-ui.html', {
+        'title': INFO['title'],
+        'version': API_VERSION,
+        'swagger_settings': json.dumps(SWAGGER_UI_SETTINGS),
+        'oauth2_config': '{}',
+        'USE_SESSION_AUTH': False,
+    })
+
+
+@require_GET
+def swagger_ui_view(request):
+    """
+    Swagger UI; с ?format=openapi отдает схему, как представление drf-yasg,
+    адрес которого Swagger UI использует по умолчанию.
+    """
+
+    if request.GET.get('format') == 'openapi':
+        return schema_view(request)
+    return _swagger_ui(request)
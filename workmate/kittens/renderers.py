@@ -0,0 +1,45 @@
+"""
+Быстрый JSON-рендерер на orjson.
+
+Если orjson не установлен или клиент запросил форматированный вывод
+(application/json; indent=4, Browsable API), используется обычный
+JSONRenderer DRF.
+"""
+
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer, сериализующий данные через orjson. Вывод совпадает
+    с компактным выводом JSONRenderer (UNICODE_JSON, COMPACT_JSON);
+    типы, которые orjson не поддерживает (даты, Decimal, ленивые строки
+    перевода), преобразуются кодировщиком DRF.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        return self.dumps(data)
+
+    def dumps(self, data):
+        """Сериализует данные в компактный JSON (bytes)."""
+
+        if orjson is None:
+            return super().render(data)
+        ret = orjson.dumps(
+            data,
+            default=self.encoder_class().default,
+            option=orjson.OPT_PASSTHROUGH_DATETIME,
+        )
+        # Как и JSONRenderer, экранируем U+2028 и U+2029.
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
@@ -0,0 +1,109 @@
+"""
+Поиск котят по имени, цвету и описанию (?search=).
+
+На PostgreSQL запрос ищется в столбце search_vector (tsvector,
+вычисляемый из имени, цвета и описания, с GIN-индексом) и по
+триграммам имени и цвета (pg_trgm, GIN-индексы gin_trgm_ops), поэтому
+находятся и слова целиком, и имена с опечатками. Релевантность -
+ts_rank плюс триграммное сходство имени. Столбец, расширение
+и индексы создаются миграцией 0006 только на PostgreSQL и не описаны
+в модели: ORM их не читает и не записывает.
+
+На других базах (SQLite в тестах) используется переносимый вариант:
+каждое слово запроса ищется через icontains в имени, цвете или
+описании, релевантность - сумма весов полей, в которых найдены слова.
+"""
+
+from functools import reduce
+from operator import add
+
+from django.db import connections
+from django.db.models import BooleanField, Case, FloatField, IntegerField, Q, Value, When
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import SearchFilter
+
+from .models import Kitten
+
+# Конфигурация полнотекстового поиска: без морфологии и стоп-слов,
+# имена и цвета не зависят от языка.
+SEARCH_CONFIG = 'simple'
+# Не больше слов в запросе, чтобы ограничить сложность SQL.
+MAX_TERMS = 10
+# Веса полей в переносимом варианте.
+FIELD_WEIGHTS = {'name': 3, 'color': 2, 'description': 1}
+
+
+def search_kittens(queryset, terms, ranked=False):
+    """
+    Оставляет в queryset котят, подходящих под слова terms.
+    С ranked=True сортирует результат по убыванию релевантности.
+    """
+
+    terms = [term for term in terms if term][:MAX_TERMS]
+    if not terms:
+        return queryset
+    if connections[queryset.db].vendor == 'postgresql':
+        return _postgres_search(queryset, ' '.join(terms), ranked)
+    return _portable_search(queryset, terms, ranked)
+
+
+def _postgres_search(queryset, query, ranked):
+    table = connections[queryset.db].ops.quote_name(Kitten._meta.db_table)
+    tsquery = 'websearch_to_tsquery(%s, %s)'
+    # %% - оператор сходства pg_trgm (%), экранированный для параметров.
+    match = RawSQL(
+        f'({table}.search_vector @@ {tsquery} '
+        f'OR {table}.name %% %s OR {table}.color %% %s)',
+        (SEARCH_CONFIG, query, query, query),
+        output_field=BooleanField(),
+    )
+    queryset = queryset.filter(match)
+    if ranked:
+        rank = RawSQL(
+            f'ts_rank({table}.search_vector, {tsquery}) + similarity({table}.name, %s)',
+            (SEARCH_CONFIG, query, query),
+            output_field=FloatField(),
+        )
+        queryset = queryset.annotate(search_rank=rank).order_by('-search_rank', 'id')
+    return queryset
+
+
+def _portable_search(queryset, terms, ranked):
+    condition = Q()
+    for term in terms:
+        condition &= reduce(
+            Q.__or__, (Q(**{f'{field}__icontains': term}) for field in FIELD_WEIGHTS)
+        )
+    queryset = queryset.filter(condition)
+    if ranked:
+        rank = reduce(add, (
+            Case(
+                When(**{f'{field}__icontains': term}, then=Value(weight)),
+                default=Value(0),
+                output_field=IntegerField(),
+            )
+            for term in terms
+            for field, weight in FIELD_WEIGHTS.items()
+        ))
+        queryset = queryset.annotate(search_rank=rank).order_by('-search_rank', 'id')
+    return queryset
+
+
+class KittenSearchFilter(SearchFilter):
+    """
+    Фильтр ?search= для списка котят. Порядок списка не меняется
+    (курсорная пагинация идет по id), отсортированную по релевантности
+    выдачу возвращает действие search набора котят.
+    """
+
+    search_description = 'Words to find in the kitten name, colour or description.'
+    # Действия, в документации которых есть параметр search.
+    schema_actions = ('list', 'search')
+
+    def filter_queryset(self, request, queryset, view):
+        return search_kittens(queryset, self.get_search_terms(request))
+
+    def get_schema_operation_parameters(self, view):
+        if getattr(view, 'action', None) not in self.schema_actions:
+            return []
+        return super().get_schema_operation_parameters(view)
@@ -1,4 +1,7 @@
-from .models import Breed, CustomUser, Kitten, Rating
+from . import hashing
+from .metrics import TimedSerializerMixin
+from .models import Breed, CustomUser, Kitten, KittenStats, Rating
+from django.core.exceptions import ImproperlyConfigured
 from rest_framework import serializers
 from rest_framework.serializers import ModelSerializer
 import django_filters
@@ -25,18 +28,21 @@ class CustomUserSerializer(ModelSerializer):
     def create(self, validated_data):
         """Метод создает и возвращает нового пользователя с валидированными данными."""
         
-        user = CustomUser.objects.create_user(
-            email=validated_data['email'],
-            username=validated_data['username'],
+        # Как UserManager.create_user, но хэш вычисляется в пуле
+        # хэширования (kittens.hashing), а не в потоке запроса.
+        user = CustomUser(
+            email=CustomUser.objects.normalize_email(validated_data['email']),
+            username=CustomUser.normalize_username(validated_data['username']),
             first_name=validated_data['first_name'],
             last_name=validated_data['last_name'],
-            password=validated_data['password'],
+            password=hashing.make_password(validated_data['password']),
             role=validated_data['role']
         )
+        user.save()
         return user
 
 
-class BreedSerializer(ModelSerializer):
+class BreedSerializer(TimedSerializerMixin, ModelSerializer):
     """Сериализатор для модели Breed"""
 
 
@@ -45,7 +51,7 @@ class BreedSerializer(ModelSerializer):
         fields = '__all__'
 
 
-class KittenSerializer(ModelSerializer):
+class KittenSerializer(TimedSerializerMixin, ModelSerializer):
     """Сериализатор для модели Kitten."""
 
 
@@ -55,13 +61,129 @@ class KittenSerializer(ModelSerializer):
         read_only_fields = ['owner']
 
 
+class KittenImportItemSerializer(ModelSerializer):
+    """
+    Проверяет одну запись импорта котят. Порода задается названием,
+    уникальность описаний проверяется всем пакетом в kittens.bulk_import.
+    """
+
+    breed = serializers.CharField(max_length=100)
+
+
+    class Meta:
+        model = Kitten
+        fields = ['name', 'color', 'age', 'description', 'breed']
+        extra_kwargs = {'description': {'validators': []}}
+
+
+class KittenStatsSerializer(ModelSerializer):
+    """Сериализатор для статистики оценок котенка."""
+
+    average_score = serializers.FloatField(read_only=True)
+    histogram = serializers.DictField(
+        child=serializers.IntegerField(),
+        read_only=True,
+    )
+
+
+    class Meta:
+        model = KittenStats
+        fields = [
+            'total_score',
+            'rating_count',
+            'average_score',
+            'histogram',
+        ]
+
+
+class KittenWithStatsSerializer(KittenSerializer):
+    """Сериализатор котенка со встроенной статистикой оценок."""
+
+    stats = serializers.SerializerMethodField()
+
+    def get_stats(self, kitten):
+        """Метод возвращает статистику котенка или нулевую, если оценок нет."""
+
+        try:
+            stats = kitten.stats
+        except KittenStats.DoesNotExist:
+            stats = KittenStats(kitten=kitten)
+        return KittenStatsSerializer(stats).data
+
+
+class LeaderboardEntrySerializer(TimedSerializerMixin, ModelSerializer):
+    """Сериализатор строки лидерборда котят."""
+
+    rank = serializers.SerializerMethodField()
+    kitten = serializers.IntegerField(source='kitten_id', read_only=True)
+    name = serializers.CharField(source='kitten.name', read_only=True)
+    breed = serializers.IntegerField(source='breed_id', read_only=True)
+    average_score = serializers.FloatField(read_only=True)
+
+
+    class Meta:
+        model = KittenStats
+        fields = [
+            'rank',
+            'kitten',
+            'name',
+            'breed',
+            'rating_count',
+            'average_score',
+            'bayesian_score',
+        ]
+
+    def get_rank(self, stats):
+        """Метод возвращает место котенка в выдаче, начиная с 1."""
+
+        return self.context['ranks'][stats.kitten_id]
+
+
 class KittinFilter(django_filters.FilterSet):
+    """
+    Фильтры списка котят: точные значения, диапазоны (__gte, __lte)
+    и списки (__in, через запятую). Для каждого фильтра есть индекс:
+    breed, age и color - составные индексы с id, owner - индекс внешнего
+    ключа. Средняя оценка читается из KittenStats.average_score
+    по индексу, а не вычисляется по оценкам на каждый запрос.
+    """
+
+    average_score__gte = django_filters.NumberFilter(
+        field_name='stats__average_score', lookup_expr='gte'
+    )
+    average_score__lte = django_filters.NumberFilter(
+        field_name='stats__average_score', lookup_expr='lte'
+    )
+
+
     class Meta:
         model = Kitten
-        fields = '__all__'
+        fields = {
+            'breed': ['exact', 'in'],
+            'owner': ['exact', 'in'],
+            'age': ['exact', 'gte', 'lte', 'in'],
+            'color': ['exact', 'in'],
+        }
+
+
+class RatingFilter(django_filters.FilterSet):
+    """
+    Фильтры списка оценок: по котенку, автору, баллу (в том числе
+    диапазону баллов) и дате. Для каждого фильтра есть индекс.
+    """
 
 
-class RatingSerializer(ModelSerializer):
+    class Meta:
+        model = Rating
+        fields = {
+            'kitten': ['exact', 'in'],
+            'user': ['exact', 'in'],
+            'score': ['exact', 'gte', 'lte', 'in'],
+            'created_at': ['gte', 'lt'],
+        }
+
+
+class RatingSerializer(TimedSerializerMixin, ModelSerializer):
     """Сериализатор для модели Rating."""
 
 
@@ -79,3 +201,109 @@ class RatingSerializer(ModelSerializer):
                 "Rating must be between 1 and 5."
             )
         return value
+
+
+class RatingBulkItemSerializer(RatingSerializer):
+    """
+    Сериализатор одной оценки при пакетной отправке.
+
+    Котенок принимается как целое число: существование котят
+    проверяется одним запросом для всего пакета, а не по запросу
+    на каждую оценку, как в PrimaryKeyRelatedField.
+    """
+
+    kitten = serializers.IntegerField(min_value=1)
+
+
+class ExportParamsSerializer(serializers.Serializer):
+    """Параметры выгрузки (kittens.export)."""
+
+    file_format = serializers.ChoiceField(choices=['csv', 'ndjson'], default='csv')
+    breed = serializers.IntegerField(required=False, min_value=1)
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        date_from = attrs.get('date_from')
+        date_to = attrs.get('date_to')
+        if date_from and date_to and date_from > date_to:
+            raise serializers.ValidationError('date_from must not be later than date_to.')
+        return attrs
+
+
+class ValuesSerializer(serializers.BaseSerializer):
+    """
+    Быстрый сериализатор только для чтения: строит тот же ответ, что
+    и model_serializer_class, из строк queryset.values(*values_fields()).
+
+    Список полей, ключи строк и функции преобразования вычисляются
+    один раз для класса. Преобразование вызывается только для полей,
+    у которых представление отличается от значения из базы (например,
+    даты); числа и строки копируются как есть.
+    """
+
+    model_serializer_class = None
+
+    # Поля, у которых to_representation не меняет значение из базы.
+    IDENTITY_FIELDS = (
+        serializers.BooleanField,
+        serializers.CharField,
+        serializers.FloatField,
+        serializers.IntegerField,
+        serializers.PrimaryKeyRelatedField,
+    )
+    # Поля, значения которых нельзя получить из одной строки .values().
+    UNSUPPORTED_FIELDS = (
+        serializers.BaseSerializer,
+        serializers.ModelField,
+        serializers.RelatedField,
+        serializers.SerializerMethodField,
+    )
+
+    @classmethod
+    def get_plan(cls):
+        """Список (имя поля ответа, ключ строки .values(), преобразование)."""
+
+        if '_plan' not in cls.__dict__:
+            serializer = cls.model_serializer_class()
+            model = serializer.Meta.model
+            plan = []
+            for name, field in serializer.fields.items():
+                if field.write_only:
+                    continue
+                if isinstance(field, serializers.PrimaryKeyRelatedField) and field.pk_field is None:
+                    key = model._meta.get_field(field.source).attname
+                elif isinstance(field, cls.UNSUPPORTED_FIELDS) or field.source == '*' or '.' in field.source:
+                    raise ImproperlyConfigured(
+                        f'{cls.__name__}: field {name!r} cannot be read from .values().'
+                    )
+                else:
+                    key = field.source
+                convert = None if isinstance(field, cls.IDENTITY_FIELDS) else field.to_representation
+                plan.append((name, key, convert))
+            cls._plan = plan
+        return cls._plan
+
+    @classmethod
+    def values_fields(cls):
+        """Аргументы queryset.values() для этого сериализатора."""
+
+        return [key for _, key, _ in cls.get_plan()]
+
+    def to_representation(self, row):
+        return {
+            name: row[key] if convert is None or row[key] is None else convert(row[key])
+            for name, key, convert in self.get_plan()
+        }
+
+
+class KittenValuesSerializer(TimedSerializerMixin, ValuesSerializer):
+    """Быстрый вариант KittenSerializer для list и retrieve."""
+
+    model_serializer_class = KittenSerializer
+
+
+class RatingValuesSerializer(TimedSerializerMixin, ValuesSerializer):
+    """Быстрый вариант RatingSerializer для list и retrieve."""
+
+    model_serializer_class = RatingSerializer
@@ -0,0 +1,223 @@
+"""
+Журнал медленных SQL-запросов.
+
+Обертка execute_wrapper замеряет каждый запрос и записывает в логгер
+kittens.slow_queries запросы дольше SLOW_QUERY_THRESHOLD_MS вместе
+с представлением и действием, из которого они выполнены. Запросы
+группируются по «форме» (SQL без литералов): форма попадает в журнал
+не чаще раза в SLOW_QUERY_DEDUP_SECONDS, с количеством повторов за это
+время. На PostgreSQL для SELECT можно сохранять план
+EXPLAIN (ANALYZE, BUFFERS) (SLOW_QUERY_EXPLAIN); такой запрос
+выполняется повторно, поэтому план снимается только при записи формы
+в журнал. Сводка по формам доступна администраторам на
+/api/slow-queries/.
+
+Журнал включается SLOW_QUERY_LOG; выключенный не добавляет обертку.
+"""
+
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DatabaseError, transaction
+
+logger = logging.getLogger(__name__)
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+_SPACES = re.compile(r'\s+')
+
+_request = ContextVar('slow_query_request', default=None)
+_explaining = threading.local()
+
+_shapes = OrderedDict()
+_shapes_lock = threading.Lock()
+
+
+def normalize_sql(sql):
+    """Заменяет литералы на '?' и сворачивает списки IN (...)."""
+
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = sql.replace('%s', '?')
+    sql = _IN_LIST.sub('(...)', sql)
+    return _SPACES.sub(' ', sql).strip()
+
+
+def describe_origin(request):
+    """
+    Откуда выполнен запрос: действие набора представлений (или имя
+    представления), метод и путь HTTP-запроса. Вне запроса - '-'.
+    """
+
+    if request is None:
+        return '-'
+    match = request.resolver_match
+    if match is None:
+        view = 'unresolved'
+    else:
+        view_class = getattr(match.func, 'cls', None)
+        actions = getattr(match.func, 'actions', None) or {}
+        action = actions.get(request.method.lower())
+        if view_class is not None and action:
+            view = f'{view_class.__name__}.{action}'
+        else:
+            view = match.view_name or match._func_path
+    return f'{view} ({request.method} {request.path})'
+
+
+def record_shape(shape, duration_ms, origin):
+    """
+    Учитывает медленный запрос в сводке по формам. Возвращает количество
+    повторов с прошлой записи в журнал или None, если форму сейчас
+    записывать не нужно.
+    """
+
+    now = time.monotonic()
+    with _shapes_lock:
+        entry = _shapes.get(shape)
+        if entry is None:
+            entry = _shapes[shape] = {
+                'count': 0,
+                'total_ms': 0.0,
+                'max_ms': 0.0,
+                'last_origin': origin,
+                'logged_at': None,
+                'since_logged': 0,
+            }
+            if len(_shapes) > settings.SLOW_QUERY_MAX_SHAPES:
+                _shapes.popitem(last=False)
+        entry['count'] += 1
+        entry['total_ms'] += duration_ms
+        entry['max_ms'] = max(entry['max_ms'], duration_ms)
+        entry['last_origin'] = origin
+        logged_at = entry['logged_at']
+        if logged_at is not None and now - logged_at < settings.SLOW_QUERY_DEDUP_SECONDS:
+            entry['since_logged'] += 1
+            return None
+        repeats = entry['since_logged']
+        entry['logged_at'] = now
+        entry['since_logged'] = 0
+        return repeats
+
+
+def slow_query_stats():
+    """Сводка медленных запросов текущего процесса, самые долгие первыми."""
+
+    with _shapes_lock:
+        entries = [
+            {
+                'sql': shape,
+                'count': entry['count'],
+                'avg_ms': round(entry['total_ms'] / entry['count'], 2),
+                'max_ms': round(entry['max_ms'], 2),
+                'last_origin': entry['last_origin'],
+            }
+            for shape, entry in _shapes.items()
+        ]
+    return sorted(entries, key=lambda entry: entry['max_ms'], reverse=True)
+
+
+def reset_slow_queries():
+    with _shapes_lock:
+        _shapes.clear()
+
+
+def explain(connection, sql, params):
+    """
+    Возвращает план EXPLAIN (ANALYZE, BUFFERS) для SELECT на PostgreSQL
+    или None. Ошибка получения плана не влияет на исходный запрос.
+    """
+
+    if connection.vendor != 'postgresql' or sql.lstrip()[:6].upper() != 'SELECT':
+        return None
+    _explaining.active = True
+    try:
+        # Точка сохранения: ошибка EXPLAIN не прерывает текущую транзакцию.
+        with transaction.atomic(using=connection.alias):
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN (ANALYZE, BUFFERS) {sql}', params)
+                return '\n'.join(row[0] for row in cursor.fetchall())
+    except DatabaseError as exc:
+        return f'EXPLAIN failed: {exc}'
+    finally:
+        _explaining.active = False
+
+
+def log_slow_queries(execute, sql, params, many, context):
+    """Обертка execute_wrapper: записывает запросы дольше порога."""
+
+    if getattr(_explaining, 'active', False):
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    result = execute(sql, params, many, context)
+    duration_ms = (time.perf_counter() - start) * 1000
+    if duration_ms >= settings.SLOW_QUERY_THRESHOLD_MS:
+        report_slow_query(context['connection'], sql, params, many, duration_ms)
+    return result
+
+
+def report_slow_query(connection, sql, params, many, duration_ms):
+    shape = normalize_sql(sql)
+    origin = describe_origin(_request.get())
+    repeats = record_shape(shape, duration_ms, origin)
+    if repeats is None:
+        return
+
+    message = f'Slow query {duration_ms:.1f} ms on {connection.alias} in {origin}'
+    if repeats:
+        message += f', {repeats} more since last report'
+    message += f'\n{shape}'
+    if settings.SLOW_QUERY_EXPLAIN and not many:
+        plan = explain(connection, sql, params)
+        if plan:
+            message += f'\n{plan}'
+    logger.warning(message)
+
+
+def install_slow_query_log(sender, connection, **kwargs):
+    """Обработчик connection_created: добавляет обертку к соединению."""
+
+    if log_slow_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(log_slow_queries)
+
+
+class SlowQueryMiddleware:
+    """
+    Запоминает текущий запрос, чтобы журнал указывал представление,
+    из которого выполнен SQL. Работает и в синхронном, и в асинхронном
+    режиме.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.SLOW_QUERY_LOG:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _request.set(request)
+        try:
+            return self.get_response(request)
+        finally:
+            _request.reset(token)
+
+    async def __acall__(self, request):
+        token = _request.set(request)
+        try:
+            return await self.get_response(request)
+        finally:
+            _request.reset(token)
@@ -0,0 +1,200 @@
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, FloatField, Q, Sum, Value
+from django.db.models.functions import Cast, NullIf
+
+from .models import Kitten, KittenStats, Rating
+
+
+def bayesian_average(total_score, rating_count):
+    """
+    Байесовская средняя оценка.
+
+    К оценкам котенка добавляется LEADERBOARD_PRIOR_VOTES условных оценок
+    со значением LEADERBOARD_PRIOR_MEAN, поэтому котенок с одной
+    пятеркой не обгоняет котенка с сотней оценок в среднем 4.8.
+    """
+
+    prior_votes = settings.LEADERBOARD_PRIOR_VOTES
+    prior_mean = settings.LEADERBOARD_PRIOR_MEAN
+    return (
+        (prior_votes * prior_mean + total_score)
+        / (prior_votes + rating_count)
+    )
+
+
+def average(total_score, rating_count):
+    """Средняя оценка или None, если оценок нет."""
+
+    if not rating_count:
+        return None
+    return total_score / rating_count
+
+
+def _average_expression(score_delta, count_delta):
+    """
+    SQL-выражение средней оценки после изменения суммы и количества
+    оценок; NULL, если оценок не осталось.
+    """
+
+    return Cast(F('total_score') + score_delta, FloatField()) / NullIf(
+        Cast(F('rating_count') + count_delta, FloatField()), Value(0.0)
+    )
+
+
+def _bayesian_expression(score_delta, count_delta):
+    """
+    SQL-выражение байесовской средней после изменения суммы и количества
+    оценок на указанные величины (для UPDATE с F()).
+    """
+
+    prior_votes = settings.LEADERBOARD_PRIOR_VOTES
+    prior_mean = settings.LEADERBOARD_PRIOR_MEAN
+    numerator = Cast(F('total_score') + score_delta, FloatField()) + Value(
+        float(prior_votes * prior_mean)
+    )
+    denominator = Cast(F('rating_count') + count_delta, FloatField()) + Value(
+        float(prior_votes)
+    )
+    return numerator / denominator
+
+
+def apply_score_changes(changes):
+    """
+    Применяет изменения оценок к статистике котят.
+
+    changes - итерируемое из кортежей (kitten_id, score, delta), где
+    delta равно +1 для добавленной оценки и -1 для удаленной.
+    Для каждого котенка выполняется один UPDATE с выражениями F(),
+    поэтому параллельные запросы не теряют изменения.
+    Вызывать внутри той же транзакции, что и запись в Rating.
+    """
+
+    per_kitten = defaultdict(Counter)
+    for kitten_id, score, delta in changes:
+        per_kitten[kitten_id][score] += delta
+
+    for kitten_id, score_deltas in per_kitten.items():
+        _apply(kitten_id, score_deltas)
+
+
+def _apply(kitten_id, score_deltas):
+    """Применяет изменения гистограммы оценок к одному котенку."""
+
+    score_deltas = {score: n for score, n in score_deltas.items() if n}
+    if not score_deltas:
+        return
+
+    score_delta = sum(score * n for score, n in score_deltas.items())
+    count_delta = sum(score_deltas.values())
+    updates = {
+        'total_score': F('total_score') + score_delta,
+        'rating_count': F('rating_count') + count_delta,
+        'average_score': _average_expression(score_delta, count_delta),
+        'bayesian_score': _bayesian_expression(score_delta, count_delta),
+    }
+    for score, n in score_deltas.items():
+        field = f'score_{score}'
+        updates[field] = F(field) + n
+
+    queryset = KittenStats.objects.filter(kitten_id=kitten_id)
+    if queryset.update(**updates):
+        return
+
+    # Строки статистики еще нет: создаем ее, а при гонке с параллельным
+    # запросом повторяем UPDATE по уже созданной строке.
+    initial = {
+        'breed_id': Kitten.objects.filter(id=kitten_id).values_list(
+            'breed_id', flat=True
+        ).first(),
+        'total_score': score_delta,
+        'rating_count': count_delta,
+        'average_score': average(score_delta, count_delta),
+        'bayesian_score': bayesian_average(score_delta, count_delta),
+    }
+    for score, n in score_deltas.items():
+        initial[f'score_{score}'] = n
+    try:
+        with transaction.atomic():
+            KittenStats.objects.create(kitten_id=kitten_id, **initial)
+    except IntegrityError:
+        queryset.update(**updates)
+
+
+def record_rating(rating):
+    """Учитывает новую оценку в статистике котенка."""
+
+    apply_score_changes([(rating.kitten_id, rating.score, 1)])
+
+
+def forget_rating(kitten_id, score):
+    """Исключает удаленную оценку из статистики котенка."""
+
+    apply_score_changes([(kitten_id, score, -1)])
+
+
+def get_kitten_stats(kitten_id):
+    """
+    Возвращает статистику котенка.
+
+    Если у котенка еще нет оценок, возвращается несохраненный объект
+    с нулевыми значениями. Если котенка не существует - None.
+    """
+
+    stats = KittenStats.objects.filter(kitten_id=kitten_id).first()
+    if stats is not None:
+        return stats
+    if not Kitten.objects.filter(id=kitten_id).exists():
+        return None
+    return KittenStats(kitten_id=kitten_id)
+
+
+async def aget_kitten_stats(kitten_id):
+    """Асинхронный вариант get_kitten_stats."""
+
+    stats = await KittenStats.objects.filter(kitten_id=kitten_id).afirst()
+    if stats is not None:
+        return stats
+    if not await Kitten.objects.filter(id=kitten_id).aexists():
+        return None
+    return KittenStats(kitten_id=kitten_id)
+
+
+def move_kitten_to_breed(kitten):
+    """Синхронизирует породу в статистике после изменения котенка."""
+
+    KittenStats.objects.filter(kitten_id=kitten.id).update(breed_id=kitten.breed_id)
+
+
+def compute_stats_from_ratings():
+    """
+    Вычисляет статистику всех котят по таблице Rating.
+
+    Возвращает словарь {kitten_id: KittenStats} из несохраненных объектов.
+    """
+
+    histogram = {
+        f'score_{score}': Count('id', filter=Q(score=score))
+        for score in range(1, 6)
+    }
+    rows = (
+        Rating.objects
+        .order_by()
+        .values('kitten_id', 'kitten__breed_id')
+        .annotate(
+            total_score=Sum('score'),
+            rating_count=Count('id'),
+            **histogram,
+        )
+    )
+    result = {}
+    for row in rows:
+        row['breed_id'] = row.pop('kitten__breed_id')
+        row['average_score'] = average(row['total_score'], row['rating_count'])
+        row['bayesian_score'] = bayesian_average(
+            row['total_score'], row['rating_count']
+        )
+        result[row['kitten_id']] = KittenStats(**row)
+    return result
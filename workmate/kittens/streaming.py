@@ -0,0 +1,87 @@
+"""
+Потоковая выдача больших списков в виде JSON-массива.
+
+Строки читаются через queryset.values().iterator(chunk_size) (на
+PostgreSQL - серверным курсором), сериализуются быстрым сериализатором
+набора представлений (values_serializer_class) и отправляются клиенту
+частями по API_STREAM_CHUNK_SIZE строк, поэтому память процесса
+не зависит от количества строк.
+"""
+
+from itertools import islice
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework.decorators import action
+
+from .renderers import FastJSONRenderer
+
+
+def chunked(rows, size):
+    """Разбивает итератор строк на списки по size элементов."""
+
+    rows = iter(rows)
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+async def achunked(rows, size):
+    """Асинхронный вариант chunked."""
+
+    chunk = []
+    async for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def encode_chunk(serializer, chunk, first):
+    """Кодирует часть строк как фрагмент JSON-массива без скобок."""
+
+    data = FastJSONRenderer().dumps([serializer.to_representation(row) for row in chunk])
+    return data[1:-1] if first else b',' + data[1:-1]
+
+
+class StreamingListMixin:
+    """
+    Добавляет действие stream: GET <список>/stream/ возвращает все
+    объекты (с учетом фильтров, без пагинации) в порядке id.
+    """
+
+    @action(detail=False, methods=['get'])
+    def stream(self, request):
+        """Возвращает все объекты списка одним потоковым JSON-массивом."""
+
+        queryset = self.get_stream_queryset(self.filter_queryset(self.get_queryset()))
+        rows = queryset.iterator(chunk_size=settings.API_STREAM_CHUNK_SIZE)
+        return self.streaming_response(self.stream_content(rows))
+
+    async def astream(self, request):
+        queryset = self.get_stream_queryset(await self.afilter_queryset(self.get_queryset()))
+        rows = queryset.aiterator(chunk_size=settings.API_STREAM_CHUNK_SIZE)
+        return self.streaming_response(self.astream_content(rows))
+
+    def get_stream_queryset(self, queryset):
+        return queryset.order_by('id').values(*self.values_serializer_class.values_fields())
+
+    def streaming_response(self, content):
+        return StreamingHttpResponse(content, content_type='application/json')
+
+    def stream_content(self, rows):
+        serializer = self.values_serializer_class()
+        yield b'['
+        for index, chunk in enumerate(chunked(rows, settings.API_STREAM_CHUNK_SIZE)):
+            yield encode_chunk(serializer, chunk, first=index == 0)
+        yield b']'
+
+    async def astream_content(self, rows):
+        serializer = self.values_serializer_class()
+        yield b'['
+        first = True
+        async for chunk in achunked(rows, settings.API_STREAM_CHUNK_SIZE):
+            yield encode_chunk(serializer, chunk, first)
+            first = False
+        yield b']'
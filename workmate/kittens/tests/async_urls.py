@@ -0,0 +1,13 @@
+from django.urls import include, path
+
+from kittens.async_views import async_urlpatterns
+from kittens.urls import router
+from kittens.views import BreedViewSet, KittenViewSet, RatingViewSet
+
+# Маршруты API с асинхронной обработкой GET-запросов (ASYNC_READ_VIEWS = True).
+urlpatterns = [
+    path(
+        'api/',
+        include(async_urlpatterns(router.urls, (BreedViewSet, KittenViewSet, RatingViewSet))),
+    ),
+]
@@ -1,8 +1,34 @@
+import pytest
+from django.core.cache import cache
 from pytest_factoryboy import register
 from .factories import CustomUserFactory, BreedFactory, KittenFactory, RatingFactory
+from .query_budget import QueryRecorder
 
 register(CustomUserFactory) 
 register(BreedFactory)
 register(KittenFactory)
 register(RatingFactory)
-   
\ No newline at end of file
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Очищает кэш между тестами: база откатывается, а кэш нет."""
+
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Возвращает контекстный менеджер для проверки бюджета SQL-запросов:
+
+        with query_budget(2, allow_duplicates=False):
+            client.get(url)
+    """
+
+    def budget(max_queries=None, allow_duplicates=True):
+        return QueryRecorder(max_queries, allow_duplicates)
+
+    return budget
@@ -0,0 +1,81 @@
+"""
+Учет SQL-запросов в тестах API.
+
+QueryRecorder записывает запросы, выполненные внутри блока with,
+и группирует их по «форме» - SQL без литералов. Повторяющаяся форма
+внутри одного HTTP-запроса обычно означает N+1.
+"""
+
+from collections import Counter
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from kittens.slow_queries import normalize_sql
+
+
+class QueryRecorder(CaptureQueriesContext):
+    """Записывает SQL-запросы и проверяет их количество и повторы."""
+
+    def __init__(self, max_queries=None, allow_duplicates=True, using=connection):
+        super().__init__(using)
+        self.max_queries = max_queries
+        self.allow_duplicates = allow_duplicates
+
+    @property
+    def count(self):
+        return len(self)
+
+    def shapes(self):
+        """Счетчик нормализованных форм запросов."""
+
+        return Counter(normalize_sql(query['sql']) for query in self.captured_queries)
+
+    def duplicates(self):
+        """Формы запросов, выполненные больше одного раза."""
+
+        return {shape: n for shape, n in self.shapes().items() if n > 1}
+
+    def report(self):
+        """Текстовый отчет о запросах для сообщения об ошибке."""
+
+        lines = [f'{self.count} queries executed:']
+        for shape, n in self.shapes().most_common():
+            lines.append(f'  {n} x {shape}')
+        return '\n'.join(lines)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        super().__exit__(exc_type, exc_value, traceback)
+        if exc_type is not None:
+            return
+        if self.max_queries is not None and self.count > self.max_queries:
+            raise AssertionError(
+                f'Query budget exceeded: {self.count} > {self.max_queries}.\n'
+                + self.report()
+            )
+        if not self.allow_duplicates and self.duplicates():
+            raise AssertionError(
+                'Duplicated query shapes (possible N+1).\n' + self.report()
+            )
+
+
+def assert_constant_queries(make_data, perform, sizes=(10, 100)):
+    """
+    Проверяет, что количество запросов perform() не зависит от объема
+    данных: make_data(n) наполняет базу до n записей перед каждым замером.
+    Возвращает список количеств запросов для каждого размера.
+    """
+
+    counts = []
+    reports = []
+    for size in sizes:
+        make_data(size)
+        with QueryRecorder() as recorder:
+            perform()
+        counts.append(recorder.count)
+        reports.append(recorder.report())
+    assert len(set(counts)) == 1, (
+        f'Query count depends on data size {dict(zip(sizes, counts))}:\n'
+        + '\n'.join(reports)
+    )
+    return counts
@@ -0,0 +1,157 @@
+import json
+
+import pytest
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.urls import resolve
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from kittens import stats
+
+from .factories import CustomUserFactory, KittenFactory, RatingFactory
+
+
+async def collect(content):
+    return [chunk async for chunk in content]
+
+
+@pytest.mark.django_db
+@pytest.mark.urls('kittens.tests.async_urls')
+class TestAsyncReadViews:
+    """Тесты для асинхронной обработки GET-запросов."""
+
+    @pytest.fixture
+    def user(self):
+        return CustomUserFactory(role='participant')
+
+    @pytest.fixture
+    def auth_client(self, user):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    def test_routes_are_async(self):
+        """Проверяет, что маршруты наборов представлений асинхронные."""
+
+        assert iscoroutinefunction(resolve(reverse('kitten-list')).func)
+        assert iscoroutinefunction(resolve(reverse('rating-kitten-stats', args=[1])).func)
+
+    def test_list_is_paginated(self, auth_client):
+        """Проверяет список с курсорной пагинацией."""
+
+        kittens = KittenFactory.create_batch(3)
+        url = reverse('kitten-list')
+        response = auth_client.get(url, {'page_size': 2})
+        assert response.status_code == status.HTTP_200_OK
+        assert [item['id'] for item in response.json()['results']] == [
+            kitten.id for kitten in kittens[:2]
+        ]
+
+        response = auth_client.get(response.json()['next'])
+        assert [item['id'] for item in response.json()['results']] == [kittens[2].id]
+        assert response.json()['next'] is None
+
+    def test_retrieve_and_not_found(self, auth_client):
+        """Проверяет получение объекта и 404 для несуществующего."""
+
+        kitten = KittenFactory()
+        response = auth_client.get(reverse('kitten-detail', args=[kitten.id]))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['name'] == kitten.name
+
+        response = auth_client.get(reverse('kitten-detail', args=[kitten.id + 1]))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        response = auth_client.get(reverse('kitten-detail', args=['abc']))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_authentication_is_required(self):
+        """Проверяет, что проверка прав выполняется и в асинхронном режиме."""
+
+        response = APIClient().get(reverse('kitten-list'))
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_cache_and_conditional_get(self, auth_client):
+        """Проверяет кэш ответов и ответ 304 по ETag."""
+
+        KittenFactory()
+        url = reverse('kitten-list')
+        response = auth_client.get(url)
+        assert response['X-Cache'] == 'MISS'
+        etag = response['ETag']
+
+        response = auth_client.get(url)
+        assert response['X-Cache'] == 'HIT'
+        assert response['ETag'] == etag
+
+        response = auth_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    @pytest.mark.parametrize('name', ['kitten-list', 'breed-list'])
+    def test_browsable_api(self, auth_client, user, name):
+        """
+        Проверяет HTML-ответ: формы браузерного API читают связанные
+        объекты из базы, поэтому рендеринг выполняется в потоке.
+        """
+
+        KittenFactory(owner=user)
+        response = auth_client.get(reverse(name), HTTP_ACCEPT='text/html')
+        assert response.status_code == status.HTTP_200_OK
+        assert response['Content-Type'].startswith('text/html')
+
+    def test_kitten_stats(self, auth_client):
+        """Проверяет асинхронное действие kitten_stats."""
+
+        rating = RatingFactory(score=4)
+        stats.record_rating(rating)
+        response = auth_client.get(reverse('rating-kitten-stats', args=[rating.kitten_id]))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['rating_count'] == 1
+        assert response.json()['total_score'] == 4
+
+        response = auth_client.get(reverse('rating-kitten-stats', args=[rating.kitten_id + 1]))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_stream(self, auth_client, settings):
+        """Проверяет асинхронный потоковый список оценок."""
+
+        settings.API_STREAM_CHUNK_SIZE = 2
+        ratings = RatingFactory.create_batch(3)
+        response = auth_client.get(reverse('rating-stream'))
+        assert response.status_code == status.HTTP_200_OK
+        content = b''.join(async_to_sync(collect)(response.streaming_content))
+        assert [item['id'] for item in json.loads(content)] == [rating.id for rating in ratings]
+
+    def test_export(self, auth_client, settings):
+        """Проверяет асинхронную потоковую выгрузку оценок."""
+
+        settings.API_STREAM_CHUNK_SIZE = 2
+        response = auth_client.get(reverse('rating-export'))
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        auth_client.force_authenticate(user=CustomUserFactory(is_staff=True))
+        ratings = RatingFactory.create_batch(3)
+        response = auth_client.get(reverse('rating-export'), {'file_format': 'ndjson'})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.is_async
+        content = b''.join(async_to_sync(collect)(response.streaming_content))
+        assert [json.loads(line)['id'] for line in content.splitlines()] == [
+            rating.id for rating in ratings
+        ]
+
+        response = auth_client.get(reverse('kitten-export'))
+        assert response.is_async
+        content = b''.join(async_to_sync(collect)(response.streaming_content))
+        assert content.decode().splitlines()[0].startswith('id,name,color')
+
+        response = auth_client.get(reverse('rating-export'), {'file_format': 'xml'})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_writes_use_sync_view(self, auth_client, user):
+        """Проверяет, что запись выполняется синхронным представлением."""
+
+        kitten = KittenFactory(owner=user)
+        response = auth_client.patch(
+            reverse('kitten-detail', args=[kitten.id]), {'name': 'Барсик'}, format='json'
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['name'] == 'Барсик'
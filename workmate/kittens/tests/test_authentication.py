@@ -0,0 +1,180 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from kittens.authentication import LazyTokenUser, RoleTokenObtainPairSerializer
+from kittens.models import CustomUser, Rating
+
+from .factories import CustomUserFactory, KittenFactory
+
+
+def user_queries(captured):
+    """SQL-запросы к таблице пользователей."""
+
+    return [query['sql'] for query in captured if 'kittens_customuser' in query['sql']]
+
+
+def token_client(token):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    return client
+
+
+@pytest.mark.django_db
+class TestStatelessJWT:
+    """Тесты для JWT-аутентификации без загрузки пользователя из базы."""
+
+    @pytest.fixture
+    def user(self):
+        return CustomUserFactory(role='participant')
+
+    @pytest.fixture
+    def refresh(self, user):
+        return RoleTokenObtainPairSerializer.get_token(user)
+
+    @pytest.fixture
+    def auth_client(self, refresh):
+        return token_client(refresh.access_token)
+
+    def test_token_contains_role(self):
+        """Проверяет, что выданный access-токен содержит роль."""
+
+        CustomUser.objects.create_user(
+            email='judge@example.com',
+            username='judge',
+            password='secret-password',
+            role='visitor',
+        )
+        response = APIClient().post(
+            reverse('token_obtain_pair'),
+            {'email': 'judge@example.com', 'password': 'secret-password'},
+            format='json',
+        )
+        assert response.status_code == status.HTTP_200_OK
+        token = AccessToken(response.data['access'])
+        assert token['role'] == 'visitor'
+        assert token['is_staff'] is False
+
+        response = APIClient().post(
+            reverse('token_refresh'), {'refresh': response.data['refresh']}, format='json'
+        )
+        assert AccessToken(response.data['access'])['role'] == 'visitor'
+
+    def test_requests_do_not_load_user(self, auth_client, user):
+        """
+        Проверяет, что проверки роли и владельца выполняются без запроса
+        пользователя из базы.
+        """
+
+        kitten = KittenFactory(owner=user)
+        other_kitten = KittenFactory()
+        with CaptureQueriesContext(connection) as captured:
+            response = auth_client.get(reverse('kitten-list'))
+            assert response.status_code == status.HTTP_200_OK
+            response = auth_client.patch(
+                reverse('kitten-detail', args=[kitten.id]), {'name': 'Барсик'}, format='json'
+            )
+            assert response.status_code == status.HTTP_200_OK
+            response = auth_client.patch(
+                reverse('kitten-detail', args=[other_kitten.id]), {'name': 'Мурзик'}, format='json'
+            )
+            assert response.status_code == status.HTTP_403_FORBIDDEN
+            response = auth_client.post(
+                reverse('rating-list'), {'kitten': other_kitten.id, 'score': 5}, format='json'
+            )
+            assert response.status_code == status.HTTP_201_CREATED
+        assert user_queries(captured) == []
+        assert Rating.objects.get(id=response.data['id']).user_id == user.id
+
+    def test_other_fields_are_loaded_lazily(self, refresh, user):
+        """Проверяет загрузку остальных полей пользователя из базы."""
+
+        token_user = LazyTokenUser(refresh.access_token)
+        with CaptureQueriesContext(connection) as captured:
+            assert token_user.role == 'participant'
+            assert token_user.id == user.id
+        assert len(captured) == 0
+
+        with CaptureQueriesContext(connection) as captured:
+            assert token_user.email == user.email
+            assert token_user.username == user.username
+        assert len(captured) == 1
+
+    def test_token_without_role_claim(self, user):
+        """Проверяет, что токены без утверждения role берут роль из базы."""
+
+        client = token_client(RefreshToken.for_user(user).access_token)
+        response = client.post(reverse('kitten-list'), {}, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    @pytest.mark.parametrize('stateless', [True, False])
+    def test_deactivated_user(
+        self, auth_client, refresh, user, settings, stateless, django_capture_on_commit_callbacks
+    ):
+        """
+        Проверяет, что токены, выпущенные до деактивации пользователя,
+        отклоняются сразу, а не после истечения срока.
+        """
+
+        settings.JWT_STATELESS_AUTH = stateless
+        assert refresh['is_active'] is True
+        assert auth_client.get(reverse('kitten-list')).status_code == status.HTTP_200_OK
+
+        with django_capture_on_commit_callbacks(execute=True):
+            user.is_active = False
+            user.save()
+        assert auth_client.get(reverse('kitten-list')).status_code == status.HTTP_401_UNAUTHORIZED
+        response = APIClient().post(
+            reverse('token_refresh'), {'refresh': str(refresh)}, format='json'
+        )
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_deleted_user(self, auth_client, user, django_capture_on_commit_callbacks):
+        """Проверяет, что токены удаленного пользователя отклоняются."""
+
+        with django_capture_on_commit_callbacks(execute=True):
+            user.delete()
+        assert auth_client.get(reverse('kitten-list')).status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_inactive_claim(self, user):
+        """Проверяет отказ по утверждению is_active без обращения к кэшу отзыва."""
+
+        token = RoleTokenObtainPairSerializer.get_token(user).access_token
+        token['is_active'] = False
+        response = token_client(token).get(reverse('kitten-list'))
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_revoke(self, auth_client, refresh):
+        """Проверяет отзыв access- и refresh-токенов."""
+
+        response = auth_client.post(
+            reverse('token_revoke'), {'refresh': str(refresh)}, format='json'
+        )
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+
+        response = auth_client.get(reverse('kitten-list'))
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        response = APIClient().post(
+            reverse('token_refresh'), {'refresh': str(refresh)}, format='json'
+        )
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_revoke_foreign_refresh_token(self, auth_client):
+        """Проверяет, что нельзя отозвать чужой refresh-токен."""
+
+        other = RoleTokenObtainPairSerializer.get_token(CustomUserFactory())
+        response = auth_client.post(reverse('token_revoke'), {'refresh': str(other)}, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_database_mode(self, auth_client, user, settings):
+        """Проверяет загрузку пользователя из базы при JWT_STATELESS_AUTH = False."""
+
+        settings.JWT_STATELESS_AUTH = False
+        with CaptureQueriesContext(connection) as captured:
+            response = auth_client.get(reverse('kitten-list'))
+        assert response.status_code == status.HTTP_200_OK
+        assert len(user_queries(captured)) == 1
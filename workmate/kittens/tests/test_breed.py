@@ -32,7 +32,7 @@ class TestBreedViewSet:
         url = reverse('breed-list')
         response = auth_client.get(url)
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) == 3
+        assert len(response.data['results']) == 3
 
     def test_create_breed(self, auth_client):
         """Проверяет, что порода успешно создается."""
@@ -0,0 +1,102 @@
+import pytest
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from .factories import BreedFactory, CustomUserFactory, KittenFactory
+from kittens import cache
+
+
+@pytest.mark.django_db
+class TestResponseCache:
+    """Тесты для кэша ответов наборов представлений."""
+
+    @pytest.fixture
+    def user(self):
+        return CustomUserFactory(role='participant')
+
+    @pytest.fixture
+    def auth_client(self, user):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    def test_repeated_get_is_served_from_cache(self, auth_client):
+        """Проверяет, что повторный запрос обслуживается из кэша."""
+
+        BreedFactory.create_batch(2)
+        url = reverse('breed-list')
+        first = auth_client.get(url)
+        second = auth_client.get(url)
+        assert first['X-Cache'] == 'MISS'
+        assert second['X-Cache'] == 'HIT'
+        assert second.data == first.data
+
+        other = auth_client.get(url, {'page_size': 1})
+        assert other['X-Cache'] == 'MISS'
+
+    def test_write_invalidates_cache(self, auth_client, django_capture_on_commit_callbacks):
+        """Проверяет, что создание записи сбрасывает кэш списка."""
+
+        url = reverse('breed-list')
+        auth_client.get(url)
+        with django_capture_on_commit_callbacks(execute=True):
+            response = auth_client.post(url, {'name': 'Siamese'}, format='json')
+        assert response.status_code == status.HTTP_201_CREATED
+
+        response = auth_client.get(url)
+        assert response['X-Cache'] == 'MISS'
+        assert [item['name'] for item in response.data['results']] == ['Siamese']
+
+    def test_rating_write_invalidates_kittens_with_stats(
+        self, auth_client, django_capture_on_commit_callbacks
+    ):
+        """
+        Проверяет, что запись оценки сбрасывает только ответы,
+        зависящие от оценок.
+        """
+
+        kitten = KittenFactory()
+        plain_url = reverse('kitten-list')
+        stats_url = plain_url + '?with_stats=1'
+        auth_client.get(plain_url)
+        auth_client.get(stats_url)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            auth_client.post(
+                reverse('rating-list'), {'kitten': kitten.id, 'score': 5}, format='json'
+            )
+
+        assert auth_client.get(plain_url)['X-Cache'] == 'HIT'
+        response = auth_client.get(stats_url)
+        assert response['X-Cache'] == 'MISS'
+        assert response.data['results'][0]['stats']['total_score'] == 5
+
+    def test_cache_key_depends_on_role(self, auth_client):
+        """Проверяет, что ответы для разных ролей кэшируются раздельно."""
+
+        KittenFactory()
+        url = reverse('kitten-list')
+        auth_client.get(url)
+
+        visitor_client = APIClient()
+        visitor_client.force_authenticate(user=CustomUserFactory(role='visitor'))
+        assert visitor_client.get(url)['X-Cache'] == 'MISS'
+
+    def test_cache_stats_endpoint(self, auth_client):
+        """Проверяет счетчики попаданий и промахов кэша."""
+
+        url = reverse('breed-list')
+        before = cache.cache_stats().get('breed', {'hits': 0, 'misses': 0})
+        auth_client.get(url)
+        auth_client.get(url)
+
+        admin_client = APIClient()
+        admin_client.force_authenticate(user=CustomUserFactory(is_staff=True))
+        response = admin_client.get(reverse('cache-stats'))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['breed']['hits'] == before['hits'] + 1
+        assert response.data['breed']['misses'] == before['misses'] + 1
+
+        response = auth_client.get(reverse('cache-stats'))
+        assert response.status_code == status.HTTP_403_FORBIDDEN
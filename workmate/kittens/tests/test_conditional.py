@@ -0,0 +1,75 @@
+import pytest
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from .factories import CustomUserFactory, KittenFactory, RatingFactory
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+    """Тесты для ETag и условных GET-запросов."""
+
+    @pytest.fixture
+    def user(self):
+        return CustomUserFactory(role='participant')
+
+    @pytest.fixture
+    def auth_client(self, user):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    def test_if_none_match_returns_304(
+        self, auth_client, django_assert_num_queries
+    ):
+        """
+        Проверяет, что совпадающий ETag дает 304 без запросов к базе.
+        """
+
+        KittenFactory.create_batch(2)
+        url = reverse('kitten-list')
+        response = auth_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        etag = response['ETag']
+        assert etag.startswith('"')
+        assert 'Last-Modified' in response
+
+        with django_assert_num_queries(0):
+            response = auth_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response['ETag'] == etag
+
+    def test_etag_changes_after_write(
+        self, auth_client, user, django_capture_on_commit_callbacks
+    ):
+        """Проверяет, что после изменения данных ETag меняется."""
+
+        rating = RatingFactory(user=user)
+        url = reverse('rating-detail', args=[rating.id])
+        etag = auth_client.get(url)['ETag']
+
+        with django_capture_on_commit_callbacks(execute=True):
+            auth_client.put(
+                url, {'kitten': rating.kitten_id, 'score': 1}, format='json'
+            )
+
+        response = auth_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response['ETag'] != etag
+        assert response.data['score'] == 1
+
+    def test_etag_depends_on_query(self, auth_client):
+        """Проверяет, что разные параметры запроса дают разные ETag."""
+
+        url = reverse('breed-list')
+        first = auth_client.get(url)['ETag']
+        second = auth_client.get(url, {'page_size': 1})['ETag']
+        assert first != second
+
+    def test_missing_object_has_no_etag(self, auth_client):
+        """Проверяет, что ответ 404 не получает ETag."""
+
+        response = auth_client.get(reverse('kitten-detail', args=[999999]))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert 'ETag' not in response
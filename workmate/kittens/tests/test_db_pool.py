@@ -0,0 +1,54 @@
+import pytest
+from django.db import connection
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from .factories import CustomUserFactory
+
+
+class StubPool:
+    """Пул с фиксированными счетчиками psycopg_pool."""
+
+    def get_stats(self):
+        return {
+            'pool_min': 2,
+            'pool_max': 10,
+            'pool_size': 4,
+            'pool_available': 1,
+            'requests_waiting': 2,
+            'requests_num': 8,
+            'requests_wait_ms': 20,
+        }
+
+
+@pytest.mark.django_db
+class TestDatabasePoolStats:
+    """Тесты для статистики пула соединений."""
+
+    def test_pool_stats_endpoint(self, monkeypatch):
+        """Проверяет метрики пула и доступ только для администраторов."""
+
+        monkeypatch.setattr(connection, 'pool', StubPool(), raising=False)
+        admin_client = APIClient()
+        admin_client.force_authenticate(user=CustomUserFactory(is_staff=True))
+        response = admin_client.get(reverse('db-pool-stats'))
+        assert response.status_code == status.HTTP_200_OK
+        stats = response.data['default']
+        assert stats['checked_out'] == 3
+        assert stats['waiting'] == 2
+        assert stats['avg_wait_ms'] == 2.5
+        assert stats['pool_max'] == 10
+
+        client = APIClient()
+        client.force_authenticate(user=CustomUserFactory())
+        response = client.get(reverse('db-pool-stats'))
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_without_pool(self):
+        """Проверяет, что базы без пула не попадают в статистику."""
+
+        admin_client = APIClient()
+        admin_client.force_authenticate(user=CustomUserFactory(is_staff=True))
+        response = admin_client.get(reverse('db-pool-stats'))
+        assert response.data == {}
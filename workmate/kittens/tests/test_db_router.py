@@ -0,0 +1,145 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import transaction
+from django.http import HttpResponse
+from django.test import RequestFactory
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from kittens.db_router import ReplicaRouter, ReplicaRoutingMiddleware
+from kittens.models import Kitten
+
+from .factories import CustomUserFactory, KittenFactory
+
+
+@pytest.fixture
+def replicas(settings):
+    settings.DATABASE_REPLICAS = ['replica1', 'replica2']
+    return settings.DATABASE_REPLICAS
+
+
+def route_read(request, status_code=200):
+    """
+    Выполняет запрос через middleware и возвращает ответ и базу,
+    выбранную роутером для чтения внутри запроса.
+    """
+
+    chosen = []
+
+    def view(request):
+        chosen.append(ReplicaRouter().db_for_read(Kitten))
+        return HttpResponse(status=status_code)
+
+    response = ReplicaRoutingMiddleware(view)(request)
+    return response, chosen[0]
+
+
+class TestReplicaRouter:
+    """Тесты для выбора базы данных роутером реплик."""
+
+    def test_reads_outside_request_use_default(self, replicas):
+        """Проверяет, что вне запроса (команды, задачи) чтение идет в default."""
+
+        assert ReplicaRouter().db_for_read(Kitten) == 'default'
+        assert ReplicaRouter().db_for_write(Kitten) == 'default'
+
+    def test_safe_request_reads_from_replica(self, replicas, rf):
+        """Проверяет чтение с реплики для GET и из default для POST."""
+
+        _, database = route_read(rf.get('/api/kittens/'))
+        assert database in replicas
+
+        _, database = route_read(rf.post('/api/kittens/'))
+        assert database == 'default'
+
+    def test_without_replicas(self, settings, rf):
+        """Проверяет, что без реплик чтение идет в default и cookie не ставится."""
+
+        settings.DATABASE_REPLICAS = []
+        _, database = route_read(rf.get('/api/kittens/'))
+        assert database == 'default'
+
+        response, _ = route_read(rf.post('/api/kittens/'))
+        assert settings.DATABASE_PRIMARY_COOKIE not in response.cookies
+
+    def test_write_sets_sticky_cookie(self, replicas, settings, rf):
+        """Проверяет закрепление за default после успешной записи."""
+
+        response, _ = route_read(rf.post('/api/ratings/'))
+        cookie = response.cookies[settings.DATABASE_PRIMARY_COOKIE]
+        assert cookie['max-age'] == settings.DATABASE_REPLICA_LAG
+
+        response, _ = route_read(rf.post('/api/ratings/'), status_code=400)
+        assert settings.DATABASE_PRIMARY_COOKIE not in response.cookies
+
+        request = RequestFactory(
+            HTTP_COOKIE=f'{settings.DATABASE_PRIMARY_COOKIE}=1'
+        ).get('/api/kittens/')
+        _, database = route_read(request)
+        assert database == 'default'
+
+    def test_async_middleware(self, replicas, rf):
+        """Проверяет выбор базы в асинхронном режиме."""
+
+        chosen = []
+
+        async def view(request):
+            chosen.append(ReplicaRouter().db_for_read(Kitten))
+            return HttpResponse()
+
+        async_to_sync(ReplicaRoutingMiddleware(view))(rf.get('/api/kittens/'))
+        assert chosen[0] in replicas
+
+    @pytest.mark.django_db
+    def test_reads_in_transaction_use_default(self, replicas, rf):
+        """Проверяет, что чтение внутри транзакции идет в default."""
+
+        def view(request):
+            with transaction.atomic():
+                database = ReplicaRouter().db_for_read(Kitten)
+            return HttpResponse(database)
+
+        response = ReplicaRoutingMiddleware(view)(rf.get('/api/kittens/'))
+        assert response.content == b'default'
+
+    def test_related_reads_follow_instance(self, replicas):
+        """Проверяет, что связанные объекты читаются из базы объекта."""
+
+        kitten = Kitten()
+        kitten._state.db = 'replica2'
+        assert ReplicaRouter().db_for_read(Kitten, instance=kitten) == 'replica2'
+
+    def test_no_migrations_on_replicas(self, replicas):
+        """Проверяет, что миграции применяются только к default."""
+
+        router = ReplicaRouter()
+        assert router.allow_migrate('default', 'kittens')
+        assert not router.allow_migrate('replica1', 'kittens')
+
+
+@pytest.mark.django_db
+class TestReplicaLagAndCache:
+    """Тесты для кэша ответов при чтении с реплик."""
+
+    def test_recent_replica_reads_are_not_cached(self, settings, monkeypatch):
+        """
+        Проверяет, что ответ, прочитанный с реплики сразу после изменения,
+        не кэшируется и не получает ETag.
+        """
+
+        monkeypatch.setattr('kittens.cache.reading_from_replica', lambda: True)
+        settings.DATABASE_REPLICA_LAG = 60
+        KittenFactory()
+        client = APIClient()
+        client.force_authenticate(user=CustomUserFactory())
+        url = reverse('kitten-list')
+
+        response = client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert 'ETag' not in response
+        assert client.get(url)['X-Cache'] == 'MISS'
+
+        settings.DATABASE_REPLICA_LAG = 0
+        assert 'ETag' in client.get(url)
+        assert client.get(url)['X-Cache'] == 'HIT'
@@ -0,0 +1,221 @@
+import csv
+import datetime
+import io
+import json
+import tracemalloc
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from kittens.export import export_chunks, export_queryset
+from kittens.models import Breed, CustomUser, Kitten, Rating
+
+from .factories import BreedFactory, CustomUserFactory, KittenFactory, RatingFactory
+
+
+def content(response):
+    return b''.join(response.streaming_content).decode()
+
+
+def create_ratings(users, kittens):
+    """
+    Быстро создает users * kittens оценок одним INSERT ... SELECT
+    (каждый пользователь оценивает каждого котенка).
+    """
+
+    breed = Breed.objects.create(name='Export')
+    CustomUser.objects.bulk_create(
+        CustomUser(email=f'export{i}@example.com', username=f'export{i}', password='!')
+        for i in range(users)
+    )
+    owner = CustomUser.objects.first()
+    Kitten.objects.bulk_create(
+        Kitten(name=f'Kitten {i}', color='grey', age=1, description=f'Kitten {i}',
+               breed=breed, owner=owner)
+        for i in range(kittens)
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {Rating._meta.db_table} '
+            '(kitten_id, user_id, score, comment, created_at) '
+            f'SELECT k.id, u.id, 1 + (k.id + u.id) % 5, %s, %s '
+            f'FROM {Kitten._meta.db_table} k CROSS JOIN {CustomUser._meta.db_table} u',
+            ['', timezone.now()],
+        )
+
+
+def peak_memory(chunks):
+    """Пиковая память Python (байты) при чтении всех частей выгрузки."""
+
+    tracemalloc.start()
+    try:
+        rows = sum(chunk.count(b'\n') for chunk in chunks)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return rows, peak
+
+
+@pytest.mark.django_db
+class TestExport:
+    """Тесты для выгрузки оценок и котят."""
+
+    @pytest.fixture
+    def auth_client(self):
+        client = APIClient()
+        client.force_authenticate(user=CustomUserFactory(is_staff=True))
+        return client
+
+    def test_ratings_csv(self, auth_client):
+        """Проверяет CSV-выгрузку оценок с данными котенка и породы."""
+
+        rating = RatingFactory(comment='Отлично, "пушистый"')
+        response = auth_client.get(reverse('rating-export'))
+        assert response.status_code == status.HTTP_200_OK
+        assert response['Content-Type'] == 'text/csv; charset=utf-8'
+        assert response['Content-Disposition'] == 'attachment; filename="ratings.csv"'
+
+        rows = list(csv.DictReader(io.StringIO(content(response))))
+        assert rows == [{
+            'id': str(rating.id),
+            'created_at': rating.created_at.isoformat(),
+            'score': str(rating.score),
+            'comment': rating.comment,
+            'kitten_id': str(rating.kitten_id),
+            'kitten_name': rating.kitten.name,
+            'breed_id': str(rating.kitten.breed_id),
+            'breed_name': rating.kitten.breed.name,
+            'user_id': str(rating.user_id),
+        }]
+
+    def test_csv_formulas_are_escaped(self, auth_client):
+        """Проверяет, что текст, похожий на формулу, выгружается как текст."""
+
+        kitten = KittenFactory(name='=HYPERLINK("http://example.com")', description='-1')
+        RatingFactory(kitten=kitten, comment='@SUM(A1)', score=5)
+        response = auth_client.get(reverse('rating-export'))
+        row = next(csv.DictReader(io.StringIO(content(response))))
+        assert row['kitten_name'] == "'" + kitten.name
+        assert row['comment'] == "'@SUM(A1)"
+        assert row['score'] == '5'
+
+        response = auth_client.get(reverse('kitten-export'))
+        row = next(csv.DictReader(io.StringIO(content(response))))
+        assert row['description'] == "'-1"
+
+        response = auth_client.get(reverse('rating-export'), {'file_format': 'ndjson'})
+        assert json.loads(content(response))['comment'] == '@SUM(A1)'
+
+    def test_staff_only(self):
+        """Проверяет, что выгрузка доступна только организаторам."""
+
+        client = APIClient()
+        client.force_authenticate(user=CustomUserFactory(role='participant'))
+        assert client.get(reverse('rating-export')).status_code == status.HTTP_403_FORBIDDEN
+        assert client.get(reverse('kitten-export')).status_code == status.HTTP_403_FORBIDDEN
+        response = APIClient().get(reverse('rating-export'))
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_ratings_ndjson_filters(self, auth_client):
+        """Проверяет NDJSON и фильтры по породе и периоду."""
+
+        breed = BreedFactory()
+        old, new, _ = (
+            RatingFactory(kitten=KittenFactory(breed=breed)),
+            RatingFactory(kitten=KittenFactory(breed=breed)),
+            RatingFactory(),
+        )
+        Rating.objects.filter(id=old.id).update(
+            created_at=timezone.now() - datetime.timedelta(days=10)
+        )
+        today = timezone.localdate()
+
+        response = auth_client.get(
+            reverse('rating-export'), {'file_format': 'ndjson', 'breed': breed.id}
+        )
+        assert response['Content-Type'] == 'application/x-ndjson'
+        lines = [json.loads(line) for line in content(response).splitlines()]
+        assert [line['id'] for line in lines] == [old.id, new.id]
+
+        response = auth_client.get(reverse('rating-export'), {
+            'file_format': 'ndjson',
+            'breed': breed.id,
+            'date_from': today - datetime.timedelta(days=1),
+            'date_to': today,
+        })
+        assert [json.loads(line)['id'] for line in content(response).splitlines()] == [new.id]
+
+    def test_invalid_params(self, auth_client):
+        """Проверяет ошибки в параметрах выгрузки."""
+
+        response = auth_client.get(reverse('rating-export'), {'file_format': 'xml'})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        response = auth_client.get(
+            reverse('rating-export'), {'date_from': '2024-05-02', 'date_to': '2024-05-01'}
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_kittens(self, auth_client):
+        """Проверяет выгрузку котят."""
+
+        kitten = KittenFactory()
+        response = auth_client.get(reverse('kitten-export'), {'breed': kitten.breed_id})
+        rows = list(csv.DictReader(io.StringIO(content(response))))
+        assert [row['name'] for row in rows] == [kitten.name]
+        assert rows[0]['breed_name'] == kitten.breed.name
+
+    def test_command(self, tmp_path):
+        """Проверяет команду export_data."""
+
+        rating = RatingFactory()
+        output = tmp_path / 'ratings.ndjson'
+        call_command('export_data', 'ratings', '--file-format', 'ndjson', '--output', output)
+        assert json.loads(output.read_text())['id'] == rating.id
+
+        stdout = io.StringIO()
+        call_command('export_data', 'kittens', stdout=stdout)
+        assert stdout.getvalue().splitlines()[0].startswith('id,name,color')
+
+    def test_memory_does_not_grow(self):
+        """
+        Проверяет, что пиковая память выгрузки 20 000 оценок частями
+        по 500 строк не больше, чем у выгрузки 2 000 оценок.
+        """
+
+        create_ratings(100, 200)
+        for file_format in ('csv', 'ndjson'):
+            small = export_queryset('ratings').filter(id__lte=2000)
+            rows, small_peak = peak_memory(export_chunks('ratings', file_format, small, 500))
+            assert rows >= 2000
+
+            queryset = export_queryset('ratings')
+            rows, peak = peak_memory(export_chunks('ratings', file_format, queryset, 500))
+            assert rows >= 20_000
+            assert peak < small_peak * 1.5
+
+    @pytest.mark.slow
+    def test_memory_is_constant(self):
+        """
+        Проверяет, что пиковая память выгрузки 1 000 000 оценок в CSV
+        не больше, чем у выгрузки 10 000 оценок. NDJSON использует то же
+        чтение частями и проверяется на 100 000 оценок: tracemalloc
+        замедляет выгрузку в несколько раз.
+        """
+
+        create_ratings(1000, 1000)
+        for file_format, limit in (('csv', None), ('ndjson', 100_000)):
+            small = export_queryset('ratings').filter(id__lte=10_000)
+            rows, small_peak = peak_memory(export_chunks('ratings', file_format, small))
+            assert rows >= 10_000
+
+            queryset = export_queryset('ratings')
+            if limit is not None:
+                queryset = queryset.filter(id__lte=limit)
+            rows, peak = peak_memory(export_chunks('ratings', file_format, queryset))
+            assert rows >= (limit or 1_000_000)
+            assert peak < small_peak * 1.5
@@ -0,0 +1,197 @@
+import pytest
+from django.db import connection
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from kittens.models import Kitten, KittenStats, Rating
+from kittens.serializers import KittinFilter, RatingFilter
+from .factories import BreedFactory, CustomUserFactory, KittenFactory, RatingFactory
+
+
+@pytest.mark.django_db
+class TestKittenFilters:
+    """Тесты для фильтров списка котят."""
+
+    @pytest.fixture
+    def user(self):
+        return CustomUserFactory(role='participant')
+
+    @pytest.fixture
+    def auth_client(self, user):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    @pytest.fixture
+    def kittens(self, user):
+        return [
+            KittenFactory(age=1, color='black', owner=user),
+            KittenFactory(age=3, color='white'),
+            KittenFactory(age=5, color='black'),
+            KittenFactory(age=8, color='ginger'),
+        ]
+
+    def list_ids(self, client, params):
+        response = client.get(reverse('kitten-list'), params)
+        assert response.status_code == status.HTTP_200_OK
+        return [item['id'] for item in response.data['results']]
+
+    def test_age_range(self, auth_client, kittens):
+        """Проверяет фильтр по диапазону возраста."""
+
+        ids = self.list_ids(auth_client, {'age__gte': 3, 'age__lte': 5})
+        assert ids == [kittens[1].id, kittens[2].id]
+
+    def test_in_lookups(self, auth_client, kittens):
+        """Проверяет фильтры по спискам значений через запятую."""
+
+        ids = self.list_ids(auth_client, {'color__in': 'white,ginger'})
+        assert ids == [kittens[1].id, kittens[3].id]
+        ids = self.list_ids(auth_client, {'age__in': '1,8', 'color': 'black'})
+        assert ids == [kittens[0].id]
+
+    def test_owner_and_breed(self, auth_client, user, kittens):
+        """Проверяет фильтры по владельцу и списку пород."""
+
+        assert self.list_ids(auth_client, {'owner': user.id}) == [kittens[0].id]
+        breeds = f'{kittens[2].breed_id},{kittens[3].breed_id}'
+        assert self.list_ids(auth_client, {'breed__in': breeds}) == [
+            kittens[2].id, kittens[3].id
+        ]
+
+    def rate(self, kitten, score):
+        client = APIClient()
+        client.force_authenticate(user=CustomUserFactory())
+        response = client.post(reverse('rating-list'), {'kitten': kitten.id, 'score': score})
+        assert response.status_code == status.HTTP_201_CREATED
+
+    def test_average_score(self, auth_client, kittens, django_capture_on_commit_callbacks):
+        """
+        Проверяет фильтр по средней оценке: значение берется
+        из статистики, а закэшированный список сбрасывается оценкой.
+        """
+
+        for kitten, score in ((0, 5), (1, 5), (1, 3), (2, 2)):
+            self.rate(kittens[kitten], score)
+
+        ids = self.list_ids(auth_client, {'average_score__gte': 4})
+        assert ids == [kittens[0].id, kittens[1].id]
+        assert self.list_ids(auth_client, {'average_score__lte': 2}) == [kittens[2].id]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            self.rate(kittens[1], 1)
+        assert self.list_ids(auth_client, {'average_score__gte': 4}) == [kittens[0].id]
+
+    def test_invalid_value(self, auth_client, kittens):
+        """Проверяет, что некорректное значение фильтра возвращает 400."""
+
+        response = auth_client.get(reverse('kitten-list'), {'age__gte': 'old'})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'age__gte' in response.data
+
+
+@pytest.mark.django_db
+class TestRatingFilters:
+    """Тесты для фильтров списка оценок."""
+
+    @pytest.fixture
+    def auth_client(self):
+        client = APIClient()
+        client.force_authenticate(user=CustomUserFactory(role='visitor'))
+        return client
+
+    def test_score_band(self, auth_client):
+        """Проверяет фильтр по диапазону баллов и котенку."""
+
+        kitten = KittenFactory()
+        ratings = [RatingFactory(kitten=kitten, score=score) for score in (1, 4, 5)]
+        other = RatingFactory(score=5)
+
+        response = auth_client.get(reverse('rating-list'), {'score__gte': 4})
+        assert response.status_code == status.HTTP_200_OK
+        assert [item['id'] for item in response.data['results']] == [
+            ratings[1].id, ratings[2].id, other.id
+        ]
+
+        response = auth_client.get(
+            reverse('rating-list'), {'kitten': kitten.id, 'score__in': '1,5'}
+        )
+        assert [item['id'] for item in response.data['results']] == [
+            ratings[0].id, ratings[2].id
+        ]
+
+
+def query_plan(queryset):
+    """
+    План запроса queryset. На PostgreSQL последовательное сканирование
+    отключается: на маленьких тестовых таблицах оно дешевле индекса.
+    """
+
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+    return queryset.explain()
+
+
+@pytest.mark.django_db
+class TestFilterIndexes:
+    """Проверяет, что запросы фильтров используют индексы."""
+
+    @pytest.fixture(autouse=True)
+    def data(self):
+        breeds = BreedFactory.create_batch(10)
+        users = CustomUserFactory.create_batch(10)
+        kittens = Kitten.objects.bulk_create(
+            Kitten(
+                name=f'Kitten {i}',
+                color=f'color {i % 50}',
+                age=i % 15,
+                description=f'Kitten {i}',
+                breed=breeds[i % len(breeds)],
+                owner=users[i % len(users)],
+            )
+            for i in range(2000)
+        )
+        Rating.objects.bulk_create(
+            Rating(kitten=kitten, user=users[i % len(users)], score=i % 5 + 1)
+            for i, kitten in enumerate(kittens)
+        )
+        KittenStats.objects.bulk_create(
+            KittenStats(
+                kitten=kitten,
+                breed_id=kitten.breed_id,
+                total_score=i % 5 + 1,
+                rating_count=1,
+                average_score=i % 5 + 1,
+            )
+            for i, kitten in enumerate(kittens)
+        )
+        # Статистика таблиц для планировщика.
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        self.kittens = kittens
+
+    @pytest.mark.parametrize('params, index', [
+        ({'age__gte': 3, 'age__lte': 4}, 'kitten_age_id_idx'),
+        ({'color': 'color 7'}, 'kitten_color_id_idx'),
+        ({'color__in': 'color 7,color 8'}, 'kitten_color_id_idx'),
+        ({'average_score__gte': 5}, 'kittenstats_average_idx'),
+    ])
+    def test_kitten_filters(self, params, index):
+        """Проверяет индексы фильтров котят."""
+
+        queryset = KittinFilter(params, queryset=Kitten.objects.all()).qs
+        assert index in query_plan(queryset)
+
+    def test_rating_filters(self):
+        """Проверяет индексы фильтров оценок."""
+
+        queryset = RatingFilter({'score': 5}, queryset=Rating.objects.all()).qs
+        assert 'rating_score_id_idx' in query_plan(queryset)
+
+        kittens = f'{self.kittens[0].id},{self.kittens[1].id}'
+        queryset = RatingFilter(
+            {'kitten__in': kittens, 'score__gte': 4}, queryset=Rating.objects.all()
+        ).qs
+        assert 'rating_kitten_score_idx' in query_plan(queryset)
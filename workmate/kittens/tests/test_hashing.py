@@ -0,0 +1,102 @@
+import pytest
+from django.contrib.auth.hashers import make_password
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from kittens import hashing, metrics
+from kittens.models import CustomUser
+from .factories import CustomUserFactory
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    metrics.reset_metrics()
+    yield
+    metrics.reset_metrics()
+
+
+def hash_count(operation):
+    line = f'workmate_password_hash_duration_seconds_count{{operation="{operation}"}}'
+    for row in metrics.render_metrics().splitlines():
+        if row.startswith(line):
+            return int(row.rsplit(' ', 1)[1])
+    return 0
+
+
+def obtain_token(email, password):
+    return APIClient().post(
+        reverse('token_obtain_pair'), {'email': email, 'password': password}, format='json'
+    )
+
+
+@pytest.mark.django_db
+class TestPasswordHashing:
+    """Тесты для хэширования паролей в пуле при регистрации и входе."""
+
+    @pytest.fixture(params=['process', 'thread', 'inline'])
+    def executor(self, request, settings):
+        settings.PASSWORD_HASHING_EXECUTOR = request.param
+        return request.param
+
+    def test_register_and_login(self, executor):
+        """Проверяет регистрацию и вход с хэшированием в каждом режиме пула."""
+
+        response = APIClient().post(reverse('register'), {
+            'username': 'tom',
+            'first_name': 'Tom',
+            'last_name': 'Cat',
+            'email': 'Tom@Example.COM',
+            'password': 'correct-horse',
+            'role': 'visitor',
+        }, format='json')
+        assert response.status_code == status.HTTP_201_CREATED
+        user = CustomUser.objects.get(username='tom')
+        assert user.email == 'Tom@example.com'
+        assert user.check_password('correct-horse')
+
+        assert obtain_token('Tom@example.com', 'correct-horse').status_code == status.HTTP_200_OK
+        response = obtain_token('Tom@example.com', 'wrong')
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert hash_count('hash') == 1
+        assert hash_count('verify') == 2
+
+    def test_unknown_user_is_hashed(self, settings):
+        """Проверяет, что вход с неизвестным адресом тоже вычисляет хэш."""
+
+        settings.PASSWORD_HASHING_EXECUTOR = 'thread'
+        response = obtain_token('nobody@example.com', 'secret')
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert hash_count('hash') == 1
+
+    def test_outdated_hash_is_upgraded(self, settings):
+        """Проверяет, что хэш устаревшим алгоритмом пересчитывается при входе."""
+
+        settings.PASSWORD_HASHING_EXECUTOR = 'thread'
+        settings.PASSWORD_HASHERS = [
+            'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+            'django.contrib.auth.hashers.MD5PasswordHasher',
+        ]
+        user = CustomUserFactory()
+        user.password = make_password('secret', hasher='md5')
+        user.save(update_fields=['password'])
+
+        assert obtain_token(user.email, 'secret').status_code == status.HTTP_200_OK
+        user.refresh_from_db()
+        assert user.password.startswith('pbkdf2_sha256$')
+
+    def test_overload_sheds_load(self, settings):
+        """Проверяет ответ 503 с Retry-After при переполненной очереди."""
+
+        settings.PASSWORD_HASHING_EXECUTOR = 'thread'
+        settings.PASSWORD_HASHING_MAX_PENDING = 0
+        user = CustomUserFactory()
+
+        response = obtain_token(user.email, 'secret')
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response['Retry-After'] == '1'
+        assert (
+            'workmate_password_hash_rejected_total{operation="verify"} 1'
+            in metrics.render_metrics()
+        )
+        assert hashing._pending == 0
@@ -33,7 +33,7 @@ class TestKittenViewSet:
         url = reverse('kitten-list')
         response = auth_client.get(url)
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) == 3
+        assert len(response.data['results']) == 3
 
     def test_create_kitten(self, auth_client):
         """ Проверяет, что котенок успешно создается."""
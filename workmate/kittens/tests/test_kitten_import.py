@@ -0,0 +1,158 @@
+import json
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from .factories import BreedFactory, CustomUserFactory, KittenFactory
+from kittens.models import Breed, Kitten
+
+
+CSV_CONTENT = (
+    'name,color,age,description,breed\n'
+    'Tom,grey,2,Grey tabby,Siamese\n'
+    'Kitty,white,1,White fluffy,Persian\n'
+    'Felix,black,3,Black and quick,Persian\n'
+)
+
+
+@pytest.mark.django_db
+class TestKittenImport:
+    """Тесты для импорта котят из CSV и JSON."""
+
+    @pytest.fixture
+    def user(self):
+        return CustomUserFactory(role='participant')
+
+    @pytest.fixture
+    def auth_client(self, user):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    def test_import_csv_file(self, auth_client, user):
+        """
+        Проверяет импорт CSV: существующая порода находится по названию,
+        отсутствующая создается, котята принадлежат пользователю.
+        """
+
+        siamese = BreedFactory(name='Siamese')
+        upload = SimpleUploadedFile('kittens.csv', CSV_CONTENT.encode(), 'text/csv')
+        response = auth_client.post(
+            reverse('kitten-import-kittens'), {'file': upload}, format='multipart'
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data['created'] == 3
+        assert response.data['breeds_created'] == ['Persian']
+        assert response.data['errors'] == []
+        assert Kitten.objects.filter(owner=user).count() == 3
+        assert Kitten.objects.get(name='Tom').breed == siamese
+        assert Breed.objects.filter(name='Persian').count() == 1
+
+    def test_import_json_body(self, auth_client):
+        """Проверяет импорт из JSON-списка в теле запроса."""
+
+        data = [
+            {'name': 'Tom', 'color': 'grey', 'age': 2,
+             'description': 'Grey tabby', 'breed': 'Siamese'},
+        ]
+        response = auth_client.post(reverse('kitten-import-kittens'), data, format='json')
+        assert response.status_code == status.HTTP_201_CREATED
+        assert Kitten.objects.get(description='Grey tabby').breed.name == 'Siamese'
+
+    def test_per_item_errors(self, auth_client):
+        """
+        Проверяет, что ошибочные записи, повторы описаний в файле
+        и в базе возвращаются с индексами, а остальные сохраняются.
+        """
+
+        KittenFactory(description='Taken')
+        data = [
+            {'name': 'A', 'color': 'grey', 'age': 'old',
+             'description': 'First', 'breed': 'Siamese'},
+            {'name': 'B', 'color': 'grey', 'age': 1,
+             'description': 'Taken', 'breed': 'Siamese'},
+            {'name': 'C', 'color': 'grey', 'age': 1,
+             'description': 'Same', 'breed': 'Siamese'},
+            {'name': 'D', 'color': 'grey', 'age': 1,
+             'description': 'Same', 'breed': 'Siamese'},
+        ]
+        response = auth_client.post(reverse('kitten-import-kittens'), data, format='json')
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data['created'] == 1
+        assert [error['index'] for error in response.data['errors']] == [0, 1, 3]
+        assert 'age' in response.data['errors'][0]['errors']
+        assert Kitten.objects.filter(name='C').exists()
+
+    def test_dry_run(self, auth_client):
+        """Проверяет, что dry_run возвращает отчет и ничего не сохраняет."""
+
+        upload = SimpleUploadedFile('kittens.csv', CSV_CONTENT.encode(), 'text/csv')
+        response = auth_client.post(
+            reverse('kitten-import-kittens') + '?dry_run=1',
+            {'file': upload},
+            format='multipart',
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['dry_run'] is True
+        assert response.data['created'] == 3
+        assert response.data['breeds_created'] == ['Persian', 'Siamese']
+        assert not Kitten.objects.exists()
+        assert not Breed.objects.exists()
+
+    def test_query_count_does_not_depend_on_size(self, auth_client):
+        """
+        Проверяет, что число запросов не растет с размером импорта:
+        породы и описания проверяются пакетно, вставка идет bulk_create.
+        """
+
+        def run(size, prefix):
+            data = [
+                {'name': 'Kitten', 'color': 'grey', 'age': 1,
+                 'description': f'{prefix} {index}', 'breed': f'{prefix} breed {index % 3}'}
+                for index in range(size)
+            ]
+            with CaptureQueriesContext(connection) as queries:
+                response = auth_client.post(
+                    reverse('kitten-import-kittens'), data, format='json'
+                )
+            assert response.status_code == status.HTTP_201_CREATED
+            return len(queries)
+
+        assert run(5, 'small') == run(50, 'large')
+
+    def test_visitor_forbidden(self):
+        """Проверяет, что посетитель не может импортировать котят."""
+
+        client = APIClient()
+        client.force_authenticate(user=CustomUserFactory(role='visitor'))
+        response = client.post(reverse('kitten-import-kittens'), [], format='json')
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_too_many_records(self, auth_client, settings):
+        """Проверяет ограничение размера импорта."""
+
+        settings.KITTEN_IMPORT_MAX_SIZE = 1
+        data = [{'name': 'A'}, {'name': 'B'}]
+        response = auth_client.post(reverse('kitten-import-kittens'), data, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not Kitten.objects.exists()
+
+    def test_command(self, user, tmp_path, capsys):
+        """Проверяет команду import_kittens с JSON-файлом и пакетами по 2."""
+
+        path = tmp_path / 'kittens.json'
+        path.write_text(json.dumps([
+            {'name': f'Kitten {index}', 'color': 'grey', 'age': 1,
+             'description': f'Kitten {index}', 'breed': 'Siamese'}
+            for index in range(5)
+        ]))
+        call_command('import_kittens', str(path), owner=user.email, batch_size=2)
+        report = json.loads(capsys.readouterr().out)
+        assert report['created'] == 5
+        assert Kitten.objects.filter(owner=user).count() == 5
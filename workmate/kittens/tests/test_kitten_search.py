@@ -0,0 +1,72 @@
+import pytest
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from .factories import BreedFactory, CustomUserFactory, KittenFactory
+
+
+@pytest.mark.django_db
+class TestKittenSearch:
+    """Тесты для поиска котят (переносимый вариант на SQLite)."""
+
+    @pytest.fixture
+    def auth_client(self):
+        client = APIClient()
+        client.force_authenticate(user=CustomUserFactory(role='visitor'))
+        return client
+
+    @pytest.fixture
+    def kittens(self):
+        breed = BreedFactory()
+        return {
+            'tom': KittenFactory(name='Tom', color='grey', description='Likes milk', breed=breed),
+            'smoky': KittenFactory(name='Smoky', color='black', description='Friend of Tom'),
+            'snow': KittenFactory(name='Snow', color='white', description='Grey eyes, fluffy'),
+            'felix': KittenFactory(name='Felix', color='black', description='Quick hunter'),
+        }
+
+    def test_list_search(self, auth_client, kittens):
+        """Проверяет фильтр ?search= по имени, цвету и описанию без учета регистра."""
+
+        response = auth_client.get(reverse('kitten-list'), {'search': 'GREY'})
+        assert response.status_code == status.HTTP_200_OK
+        assert [item['id'] for item in response.data['results']] == [
+            kittens['tom'].id, kittens['snow'].id
+        ]
+
+    def test_all_terms_must_match(self, auth_client, kittens):
+        """Проверяет, что каждое слово запроса должно найтись в котенке."""
+
+        response = auth_client.get(reverse('kitten-list'), {'search': 'black quick'})
+        assert [item['id'] for item in response.data['results']] == [kittens['felix'].id]
+
+    def test_ranked_search(self, auth_client, kittens):
+        """
+        Проверяет, что действие search сортирует по релевантности:
+        совпадение в имени выше совпадения в описании.
+        """
+
+        response = auth_client.get(reverse('kitten-search'), {'search': 'tom'})
+        assert response.status_code == status.HTTP_200_OK
+        assert [item['id'] for item in response.data] == [
+            kittens['tom'].id, kittens['smoky'].id
+        ]
+        assert set(response.data[0]) >= {'id', 'name', 'color', 'description', 'breed'}
+
+    def test_ranked_search_with_breed_and_limit(self, auth_client, kittens):
+        """Проверяет фильтр по породе и ограничение выдачи в действии search."""
+
+        breed = kittens['tom'].breed_id
+        response = auth_client.get(reverse('kitten-search'), {'search': 'tom', 'breed': breed})
+        assert [item['id'] for item in response.data] == [kittens['tom'].id]
+
+        response = auth_client.get(reverse('kitten-search'), {'search': 'black', 'limit': 1})
+        assert [item['id'] for item in response.data] == [kittens['smoky'].id]
+
+    def test_search_is_required(self, auth_client):
+        """Проверяет, что действие search без запроса возвращает 400."""
+
+        response = auth_client.get(reverse('kitten-search'))
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'search' in response.data
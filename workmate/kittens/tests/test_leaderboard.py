@@ -0,0 +1,112 @@
+import pytest
+from django.core.management import call_command
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from .factories import BreedFactory, CustomUserFactory, KittenFactory, RatingFactory
+from kittens.models import KittenStats
+from kittens.stats import bayesian_average
+
+
+@pytest.mark.django_db
+class TestLeaderboard:
+    """Тесты для лидерборда котят."""
+
+    @pytest.fixture
+    def user(self):
+        return CustomUserFactory(role='visitor')
+
+    @pytest.fixture
+    def auth_client(self, user):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    @pytest.fixture
+    def breed(self):
+        return BreedFactory()
+
+    @pytest.fixture
+    def kittens(self, breed):
+        """
+        Три котенка: с одной пятеркой, с множеством четверок
+        и котенок другой породы с тройками.
+        """
+
+        lucky = KittenFactory(breed=breed)
+        steady = KittenFactory(breed=breed)
+        other = KittenFactory()
+        RatingFactory(kitten=lucky, score=5)
+        for _ in range(10):
+            RatingFactory(kitten=steady, score=4)
+        RatingFactory(kitten=other, score=3)
+        RatingFactory(kitten=other, score=3)
+        call_command('rebuild_kitten_stats')
+        return lucky, steady, other
+
+    def test_bayesian_ordering(self, auth_client, kittens):
+        """
+        Проверяет, что котенок с большим числом высоких оценок
+        опережает котенка с единственной пятеркой.
+        """
+
+        lucky, steady, other = kittens
+        response = auth_client.get(reverse('kitten-leaderboard'))
+        assert response.status_code == status.HTTP_200_OK
+        assert [entry['kitten'] for entry in response.data] == [
+            steady.id, lucky.id, other.id
+        ]
+        first = response.data[0]
+        assert first['rank'] == 1
+        assert first['name'] == steady.name
+        assert first['average_score'] == 4
+        assert first['bayesian_score'] == pytest.approx(bayesian_average(40, 10))
+
+    def test_breed_filter_and_limit(self, auth_client, kittens, breed):
+        """Проверяет фильтр по породе и ограничение размера выдачи."""
+
+        lucky, steady, other = kittens
+        url = reverse('kitten-leaderboard')
+        response = auth_client.get(url, {'breed': breed.id, 'limit': 1})
+        assert [entry['kitten'] for entry in response.data] == [steady.id]
+
+    def test_min_votes(self, auth_client, kittens):
+        """Проверяет порог минимального количества оценок."""
+
+        lucky, steady, other = kittens
+        response = auth_client.get(reverse('kitten-leaderboard'), {'min_votes': 2})
+        assert [entry['kitten'] for entry in response.data] == [steady.id, other.id]
+
+    def test_invalid_params(self, auth_client):
+        """Проверяет, что некорректные параметры приводят к ошибке 400."""
+
+        response = auth_client.get(reverse('kitten-leaderboard'), {'limit': 'ten'})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_ranking_follows_rating_writes(self, auth_client, breed):
+        """
+        Проверяет, что индекс рейтинга обновляется при записи оценок
+        через API и при смене породы котенка.
+        """
+
+        kitten = KittenFactory(breed=breed)
+        response = auth_client.post(
+            reverse('rating-list'), {'kitten': kitten.id, 'score': 5}, format='json'
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        stats = KittenStats.objects.get(kitten=kitten)
+        assert stats.breed_id == breed.id
+        assert stats.bayesian_score == pytest.approx(bayesian_average(5, 1))
+
+        new_breed = BreedFactory()
+        owner_client = APIClient()
+        owner_client.force_authenticate(user=kitten.owner)
+        response = owner_client.patch(
+            reverse('kitten-detail', args=[kitten.id]),
+            {'breed': new_breed.id},
+            format='json',
+        )
+        assert response.status_code == status.HTTP_200_OK
+        response = auth_client.get(reverse('kitten-leaderboard'), {'breed': new_breed.id})
+        assert [entry['kitten'] for entry in response.data] == [kitten.id]
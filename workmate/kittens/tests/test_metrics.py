@@ -0,0 +1,104 @@
+import re
+
+import pytest
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from kittens import metrics
+
+from .factories import CustomUserFactory, KittenFactory
+
+SERVER_TIMING = re.compile(
+    r'db;dur=[\d.]+;desc="(\d+) queries", serializer;dur=([\d.]+), total;dur=[\d.]+'
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    metrics.reset_metrics()
+    yield
+    metrics.reset_metrics()
+
+
+@pytest.fixture
+def auth_client():
+    client = APIClient()
+    client.force_authenticate(user=CustomUserFactory(role='participant'))
+    return client
+
+
+def test_histogram_buckets_are_cumulative():
+    """Проверяет формат гистограммы Prometheus."""
+
+    histogram = metrics.Histogram('test_seconds', 'Test.', (0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(('kitten-list', 'GET'), value)
+    lines = list(histogram.collect())
+    assert 'test_seconds_bucket{view="kitten-list",method="GET",le="0.1"} 1' in lines
+    assert 'test_seconds_bucket{view="kitten-list",method="GET",le="1.0"} 2' in lines
+    assert 'test_seconds_bucket{view="kitten-list",method="GET",le="+Inf"} 3' in lines
+    assert 'test_seconds_count{view="kitten-list",method="GET"} 3' in lines
+
+
+@pytest.mark.django_db
+class TestPerformanceMiddleware:
+    """Тесты для метрик запросов и /metrics."""
+
+    def test_server_timing_header(self, auth_client):
+        """Проверяет заголовок Server-Timing с запросами к базе и сериализацией."""
+
+        KittenFactory.create_batch(3)
+        response = auth_client.get(reverse('kitten-list'))
+        assert response.status_code == status.HTTP_200_OK
+        match = SERVER_TIMING.fullmatch(response['Server-Timing'])
+        assert match
+        assert int(match[1]) > 0
+        assert float(match[2]) > 0
+
+    def test_metrics_endpoint(self, auth_client):
+        """Проверяет, что запросы попадают в метрики по представлениям."""
+
+        KittenFactory()
+        auth_client.get(reverse('kitten-list'))
+        auth_client.get(reverse('kitten-list'))
+
+        response = APIClient().get('/metrics')
+        assert response.status_code == status.HTTP_200_OK
+        assert response['Content-Type'].startswith('text/plain; version=0.0.4')
+        body = response.content.decode()
+        assert 'workmate_requests_total{view="kitten-list",method="GET",status="200"} 2' in body
+        assert 'workmate_request_duration_seconds_count{view="kitten-list",method="GET"} 2' in body
+        assert 'workmate_db_queries_bucket{view="kitten-list",method="GET",le="+Inf"} 2' in body
+        assert 'workmate_response_size_bytes_count{view="kitten-list",method="GET"} 2' in body
+
+    def test_metrics_token(self, settings):
+        """Проверяет, что при заданном METRICS_TOKEN нужен заголовок Authorization."""
+
+        settings.METRICS_TOKEN = 'secret'
+        assert APIClient().get('/metrics').status_code == status.HTTP_403_FORBIDDEN
+        response = APIClient().get('/metrics', HTTP_AUTHORIZATION='Bearer secret')
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_disabled(self, settings):
+        """Проверяет, что выключенный middleware не добавляет заголовок и метрики."""
+
+        settings.PERF_METRICS_ENABLED = False
+        client = APIClient()
+        client.force_authenticate(user=CustomUserFactory())
+        response = client.get(reverse('kitten-list'))
+        assert response.status_code == status.HTTP_200_OK
+        assert 'Server-Timing' not in response
+        assert 'view="kitten-list"' not in metrics.render_metrics()
+
+    @pytest.mark.urls('kittens.tests.async_urls')
+    def test_async_view_queries_are_counted(self, auth_client):
+        """
+        Проверяет, что запросы асинхронного представления, выполненные
+        в другом потоке, учитываются в метриках запроса.
+        """
+
+        KittenFactory()
+        response = auth_client.get(reverse('kitten-list'))
+        assert response.status_code == status.HTTP_200_OK
+        assert int(SERVER_TIMING.fullmatch(response['Server-Timing'])[1]) > 0
@@ -0,0 +1,96 @@
+import json
+import subprocess
+import sys
+
+import pytest
+from django.conf import settings as django_settings
+from django.core.management import CommandError, call_command
+from django.test import Client
+from django.urls import reverse
+
+from kittens import openapi
+
+
+@pytest.fixture(autouse=True)
+def schema_dir(settings, tmp_path):
+    settings.OPENAPI_SCHEMA_DIR = str(tmp_path)
+    openapi.reset_schema()
+    yield tmp_path
+    openapi.reset_schema()
+
+
+class TestOpenAPISchema:
+    """Тесты для готовой схемы OpenAPI и Swagger UI."""
+
+    def test_generate_and_check(self, schema_dir):
+        """Проверяет запись файла схемы и проверку его актуальности."""
+
+        call_command('generate_openapi')
+        path = schema_dir / 'schema-v1.json'
+        schema = json.loads(path.read_bytes())
+        assert schema['info']['title'] == 'Kitten Exhibition API'
+        assert '/kittens/' in schema['paths']
+        assert 'host' not in schema
+        call_command('generate_openapi', '--check')
+
+        path.write_text('{}')
+        with pytest.raises(CommandError):
+            call_command('generate_openapi', '--check')
+
+        call_command('generate_openapi', '--format', 'yaml')
+        assert (schema_dir / 'schema-v1.yaml').read_text().startswith('swagger:')
+
+    def test_serves_file_with_etag(self, schema_dir):
+        """Проверяет, что схема отдается из файла с ETag и ответом 304."""
+
+        (schema_dir / 'schema-v1.json').write_bytes(b'{"swagger": "2.0"}')
+        client = Client()
+        url = reverse('schema-swagger-ui') + '?format=openapi'
+
+        response = client.get(url)
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'application/json'
+        assert response['Cache-Control'] == 'no-cache'
+        assert response.content == b'{"swagger": "2.0"}'
+
+        response = client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        assert response.status_code == 304
+        assert response.content == b''
+
+        # Файл читается один раз при первом запросе.
+        (schema_dir / 'schema-v1.json').write_bytes(b'{}')
+        assert client.get(url).content == b'{"swagger": "2.0"}'
+
+    def test_generated_without_file(self):
+        """Проверяет построение схемы при первом запросе, если файла нет."""
+
+        response = Client().get(reverse('schema-swagger-ui'), {'format': 'openapi'})
+        assert response.status_code == 200
+        assert '/ratings/' in response.json()['paths']
+
+    def test_swagger_ui(self):
+        """Проверяет страницу Swagger UI."""
+
+        response = Client().get(reverse('schema-swagger-ui'))
+        assert response.status_code == 200
+        assert b'swagger-ui' in response.content
+        assert 'no-store' in response['Cache-Control']
+
+    def test_urlconf_does_not_import_drf_yasg(self):
+        """
+        Проверяет, что загрузка URLconf не импортирует модули drf_yasg
+        (настройки и окружение берутся из текущего процесса).
+        """
+
+        code = (
+            'import sys, django; django.setup(); import workmate.urls; '
+            'print([name for name in sys.modules if name.startswith("drf_yasg.")])'
+        )
+        result = subprocess.run(
+            [sys.executable, '-c', code],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=django_settings.BASE_DIR,
+        )
+        assert result.stdout.strip() == '[]'
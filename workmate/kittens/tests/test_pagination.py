@@ -0,0 +1,59 @@
+import pytest
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from .factories import BreedFactory, CustomUserFactory
+from kittens.pagination import IdCursorPagination
+
+
+@pytest.mark.django_db
+class TestIdCursorPagination:
+    """Тесты для курсорной пагинации списков."""
+
+    @pytest.fixture
+    def auth_client(self):
+        client = APIClient()
+        client.force_authenticate(user=CustomUserFactory(role='participant'))
+        return client
+
+    def test_pages_follow_id_order(self, auth_client):
+        """
+        Проверяет, что переход по ссылкам next/previous возвращает
+        записи по возрастанию id без пропусков и повторов.
+        """
+
+        breeds = BreedFactory.create_batch(5)
+        url = reverse('breed-list') + '?page_size=2'
+
+        seen = []
+        pages = []
+        while url:
+            response = auth_client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            pages.append(response.data)
+            seen.extend(item['id'] for item in response.data['results'])
+            url = response.data['next']
+
+        assert seen == [breed.id for breed in breeds]
+        assert len(pages) == 3
+        assert pages[0]['previous'] is None
+
+        response = auth_client.get(pages[-1]['previous'])
+        assert [item['id'] for item in response.data['results']] == seen[2:4]
+
+    def test_page_size_is_capped(self, auth_client, monkeypatch):
+        """Проверяет, что запрошенный размер страницы ограничен сверху."""
+
+        monkeypatch.setattr(IdCursorPagination, 'max_page_size', 2)
+        BreedFactory.create_batch(3)
+        response = auth_client.get(reverse('breed-list') + '?page_size=50')
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data['results']) == 2
+        assert response.data['next'] is not None
+
+    def test_invalid_cursor(self, auth_client):
+        """Проверяет, что некорректный курсор приводит к ошибке 404."""
+
+        response = auth_client.get(reverse('kitten-list') + '?cursor=garbage')
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,146 @@
+import pytest
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from .factories import BreedFactory, CustomUserFactory, KittenFactory, RatingFactory
+from .query_budget import assert_constant_queries, normalize_sql
+from kittens import stats
+from kittens.models import Kitten, KittenStats, Rating
+from kittens.stats import compute_stats_from_ratings
+
+
+@pytest.mark.django_db
+class TestQueryBudget:
+    """
+    Бюджеты SQL-запросов для эндпоинтов: количество запросов
+    фиксировано и не растет вместе с объемом данных.
+    """
+
+    @pytest.fixture(autouse=True)
+    def disable_response_cache(self, settings):
+        settings.RESPONSE_CACHE_ENABLED = False
+
+    @pytest.fixture
+    def user(self):
+        return CustomUserFactory(role='participant')
+
+    @pytest.fixture
+    def auth_client(self, user):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    @pytest.fixture
+    def breed(self):
+        return BreedFactory()
+
+    @pytest.fixture
+    def add_kittens(self, breed, user):
+        """Добавляет котят (и по одной оценке каждому) до заданного количества."""
+
+        def add(total):
+            missing = total - Kitten.objects.count()
+            kittens = Kitten.objects.bulk_create(
+                KittenFactory.build_batch(missing, breed=breed, owner=user)
+            )
+            Rating.objects.bulk_create(
+                RatingFactory.build(kitten=kitten, user=user) for kitten in kittens
+            )
+            KittenStats.objects.all().delete()
+            KittenStats.objects.bulk_create(compute_stats_from_ratings().values())
+
+        return add
+
+    @pytest.mark.parametrize('url, budget', [
+        ('/api/kittens/?page_size=100', 1),
+        ('/api/kittens/?page_size=100&with_stats=1', 1),
+        ('/api/ratings/?page_size=100', 1),
+        ('/api/kittens/leaderboard/?limit=100', 1),
+    ])
+    def test_list_budget_is_constant(
+        self, auth_client, add_kittens, query_budget, url, budget
+    ):
+        """
+        Проверяет, что списки укладываются в бюджет и не делают
+        запросов на каждую строку.
+        """
+
+        counts = assert_constant_queries(add_kittens, lambda: auth_client.get(url))
+        assert counts[0] <= budget
+
+        with query_budget(budget, allow_duplicates=False):
+            auth_client.get(url)
+
+    def test_breed_filter_budget(self, auth_client, add_kittens, breed, query_budget):
+        """Проверяет бюджет списка котят с фильтром по породе."""
+
+        add_kittens(10)
+        # Проверка существования породы фильтром и выборка страницы.
+        with query_budget(2, allow_duplicates=False):
+            auth_client.get(reverse('kitten-list'), {'breed': breed.id})
+
+    def test_detail_and_stats_budget(self, auth_client, add_kittens, query_budget):
+        """Проверяет бюджет детального ответа и статистики котенка."""
+
+        add_kittens(3)
+        kitten = Kitten.objects.first()
+        with query_budget(1):
+            auth_client.get(reverse('kitten-detail', args=[kitten.id]))
+        with query_budget(1):
+            auth_client.get(
+                reverse('rating-kitten-stats', kwargs={'kitten_id': kitten.id})
+            )
+
+    def test_owner_write_budget(self, auth_client, user, breed, query_budget):
+        """
+        Проверяет, что изменение и удаление своих объектов загружают
+        не больше одной строки: владение проверяется в том же запросе,
+        а оценка удаляется одним DELETE ... RETURNING.
+        """
+
+        kitten = KittenFactory(owner=user, breed=breed)
+        rating = RatingFactory(user=user, kitten=kitten, score=4)
+        stats.record_rating(rating)
+
+        # SELECT котенка владельца и UPDATE.
+        with query_budget(2):
+            response = auth_client.patch(
+                reverse('kitten-detail', args=[kitten.id]), {'name': 'Барсик'}, format='json'
+            )
+        assert response.status_code == 200
+
+        # SELECT оценки автора, UPDATE оценки и статистики, точка сохранения.
+        with query_budget(5):
+            response = auth_client.patch(
+                reverse('rating-detail', args=[rating.id]), {'score': 2}, format='json'
+            )
+        assert response.status_code == 200
+
+        # DELETE ... RETURNING, UPDATE статистики, точка сохранения.
+        with query_budget(4) as recorder:
+            response = auth_client.delete(reverse('rating-detail', args=[rating.id]))
+        assert response.status_code == 204
+        assert sum(query['sql'].startswith('DELETE') for query in recorder.captured_queries) == 1
+        assert sum(query['sql'].startswith('SELECT') for query in recorder.captured_queries) == 0
+        assert KittenStats.objects.get(kitten=kitten).rating_count == 0
+
+        # SELECT котенка владельца и DELETE оценок, статистики и котенка.
+        with query_budget(4):
+            response = auth_client.delete(reverse('kitten-detail', args=[kitten.id]))
+        assert response.status_code == 204
+
+    def test_budget_violation_reports_duplicates(self, breed, query_budget):
+        """Проверяет, что превышение бюджета сообщает о повторах."""
+
+        BreedFactory.create_batch(2)
+        with pytest.raises(AssertionError, match='2 x SELECT'):
+            with query_budget(1):
+                for kitten_breed in [breed.id, breed.id + 1]:
+                    list(Kitten.objects.filter(breed_id=kitten_breed))
+
+
+def test_normalize_sql():
+    """Проверяет нормализацию SQL в форму без литералов."""
+
+    sql = "SELECT * FROM t WHERE a = 'x' AND b IN (1, 2, 3) AND c = 4.5"
+    assert normalize_sql(sql) == 'SELECT * FROM t WHERE a = ? AND b IN (...) AND c = ?'
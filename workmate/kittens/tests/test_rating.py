@@ -1,4 +1,5 @@
 import pytest
+from django.db import IntegrityError, transaction
 from rest_framework.test import APIClient
 from rest_framework.reverse import reverse
 from rest_framework import status
@@ -32,7 +33,7 @@ class TestRatingViewSet:
         url = reverse('rating-list')
         response = auth_client.get(url)
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) == 3
+        assert len(response.data['results']) == 3
 
     def test_create_rating(self, auth_client):
         """Проверяет, что рейтинг успешно создается."""
@@ -129,6 +130,23 @@ class TestRatingViewSet:
         response = auth_client.delete(url)
         assert response.status_code == status.HTTP_403_FORBIDDEN
 
+    def test_update_and_delete_missing_rating(self, auth_client):
+        """
+        Проверяет, что изменение и удаление несуществующей оценки
+        возвращают 404, а не 403.
+        """
+
+        url = reverse('rating-detail', args=[999999])
+        response = auth_client.patch(url, {'score': 1}, format='json')
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert auth_client.delete(url).status_code == status.HTTP_404_NOT_FOUND
+        assert auth_client.delete('/api/ratings/abc/').status_code == status.HTTP_404_NOT_FOUND
+
+        # id вне диапазона bigint
+        url = reverse('rating-detail', args=[10 ** 20])
+        assert auth_client.get(url).status_code == status.HTTP_404_NOT_FOUND
+        assert auth_client.delete(url).status_code == status.HTTP_404_NOT_FOUND
+
     def test_user_cannot_rate_kitten_multiple_times(self, auth_client):
         """
         Проверяет, что пользователь не может оставить несколько оценок для
@@ -152,3 +170,28 @@ class TestRatingViewSet:
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         assert any('You have already rated this kitten.' in str(error) for error in response.data)
         assert Rating.objects.count() == 1
+
+    def test_rating_unique_constraint(self, user):
+        """
+        Проверяет, что повторная оценка отклоняется ограничением
+        уникальности в базе данных.
+        """
+
+        rating = RatingFactory(user=user)
+        with pytest.raises(IntegrityError), transaction.atomic():
+            RatingFactory(user=user, kitten=rating.kitten)
+
+    def test_cannot_move_rating_to_already_rated_kitten(self, auth_client, user):
+        """
+        Проверяет, что оценку нельзя перенести на котенка, которого
+        пользователь уже оценил.
+        """
+
+        first = RatingFactory(user=user)
+        second = RatingFactory(user=user)
+        url = reverse('rating-detail', args=[second.id])
+        data = {'score': 3, 'kitten': first.kitten_id}
+        response = auth_client.put(url, data, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        second.refresh_from_db()
+        assert second.kitten_id != first.kitten_id
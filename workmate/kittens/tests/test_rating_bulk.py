@@ -0,0 +1,106 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from .factories import BreedFactory, CustomUserFactory, KittenFactory, RatingFactory
+from kittens.models import KittenStats, Rating
+
+
+@pytest.mark.django_db
+class TestRatingBulk:
+    """Тесты для пакетного создания оценок."""
+
+    @pytest.fixture
+    def user(self):
+        return CustomUserFactory(role='visitor')
+
+    @pytest.fixture
+    def auth_client(self, user):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    @pytest.fixture
+    def kittens(self):
+        breed = BreedFactory()
+        owner = CustomUserFactory(role='participant')
+        return KittenFactory.create_batch(3, breed=breed, owner=owner)
+
+    def test_bulk_create(self, auth_client, user, kittens):
+        """Проверяет создание пакета оценок и обновление статистики."""
+
+        data = [
+            {'kitten': kitten.id, 'score': score, 'comment': 'Nice'}
+            for kitten, score in zip(kittens, [5, 4, 3])
+        ]
+        response = auth_client.post(reverse('rating-bulk'), data, format='json')
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data['errors'] == []
+        assert [item['score'] for item in response.data['created']] == [5, 4, 3]
+        assert all(item['id'] for item in response.data['created'])
+        assert Rating.objects.filter(user=user).count() == 3
+        assert KittenStats.objects.get(kitten=kittens[0]).total_score == 5
+
+    def test_per_item_errors(self, auth_client, user, kittens):
+        """
+        Проверяет, что ошибочные элементы не мешают создать остальные
+        и возвращаются с индексами.
+        """
+
+        RatingFactory(user=user, kitten=kittens[0])
+        data = [
+            {'kitten': kittens[0].id, 'score': 5},
+            {'kitten': kittens[1].id, 'score': 9},
+            {'kitten': 999999, 'score': 3},
+            {'kitten': kittens[2].id, 'score': 4},
+            {'kitten': kittens[2].id, 'score': 2},
+        ]
+        response = auth_client.post(reverse('rating-bulk'), data, format='json')
+        assert response.status_code == status.HTTP_201_CREATED
+        assert len(response.data['created']) == 1
+        assert response.data['created'][0]['kitten'] == kittens[2].id
+        errors = {error['index']: error['errors'] for error in response.data['errors']}
+        assert set(errors) == {0, 1, 2, 4}
+        assert 'already rated' in str(errors[0]['kitten'][0])
+        assert 'score' in errors[1]
+        assert 'does not exist' in str(errors[2]['kitten'][0])
+
+    def test_all_items_invalid(self, auth_client, kittens):
+        """Проверяет ответ 400, если не создано ни одной оценки."""
+
+        data = [{'kitten': kittens[0].id, 'score': 0}]
+        response = auth_client.post(reverse('rating-bulk'), data, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data['created'] == []
+
+    def test_payload_must_be_list(self, auth_client, kittens):
+        """Проверяет, что тело запроса должно быть списком."""
+
+        data = {'kitten': kittens[0].id, 'score': 5}
+        response = auth_client.post(reverse('rating-bulk'), data, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_query_count_does_not_grow_with_batch(self, auth_client, kittens):
+        """
+        Проверяет, что количество SQL-запросов не зависит от размера пакета
+        для уже существующей статистики котят.
+        """
+
+        url = reverse('rating-bulk')
+        client = APIClient()
+        client.force_authenticate(user=CustomUserFactory(role='visitor'))
+        client.post(url, [{'kitten': k.id, 'score': 1} for k in kittens], format='json')
+
+        with CaptureQueriesContext(connection) as small:
+            auth_client.post(url, [{'kitten': kittens[0].id, 'score': 5}], format='json')
+
+        other = APIClient()
+        other.force_authenticate(user=CustomUserFactory(role='visitor'))
+        with CaptureQueriesContext(connection) as large:
+            other.post(url, [{'kitten': k.id, 'score': 5} for k in kittens], format='json')
+
+        # Один UPDATE статистики на котенка, остальное - постоянно.
+        assert len(large) - len(small) == len(kittens) - 1
@@ -0,0 +1,80 @@
+import datetime
+import decimal
+import json
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from kittens.models import Rating
+from kittens.renderers import FastJSONRenderer
+from kittens.serializers import RatingSerializer
+
+from .factories import CustomUserFactory, RatingFactory
+
+
+class TestFastJSONRenderer:
+    """Тесты для JSON-рендерера на orjson."""
+
+    def test_output_matches_json_renderer(self):
+        """Проверяет совпадение вывода с JSONRenderer DRF."""
+
+        data = {
+            'name': 'Мурзик\u2028"кот"\u2029',
+            'age': 3,
+            'score': 4.5,
+            'ok': True,
+            'missing': None,
+            'created': datetime.datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+            'day': datetime.date(2024, 5, 1),
+            'price': decimal.Decimal('1.50'),
+            'label': gettext_lazy('Имя'),
+            'items': [{'id': 1}, {'id': 2}],
+        }
+        assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+
+    def test_indent_uses_json_renderer(self):
+        """Проверяет форматированный вывод по запросу клиента."""
+
+        data = {'id': 1}
+        rendered = FastJSONRenderer().render(data, 'application/json; indent=2')
+        assert rendered == JSONRenderer().render(data, 'application/json; indent=2')
+        assert FastJSONRenderer().render(None) == b''
+
+
+@pytest.mark.django_db
+class TestStreaming:
+    """Тесты для потокового списка оценок."""
+
+    @pytest.fixture
+    def auth_client(self):
+        client = APIClient()
+        client.force_authenticate(user=CustomUserFactory())
+        return client
+
+    def test_stream_matches_list(self, auth_client, settings):
+        """Проверяет, что поток содержит все оценки в порядке id."""
+
+        settings.API_STREAM_CHUNK_SIZE = 2
+        RatingFactory.create_batch(5)
+        response = auth_client.get(reverse('rating-stream'))
+        assert response.status_code == 200
+        assert response.streaming
+        assert response['Content-Type'] == 'application/json'
+        content = b''.join(response.streaming_content)
+        expected = RatingSerializer(Rating.objects.order_by('id'), many=True).data
+        assert content == JSONRenderer().render(expected)
+
+    def test_empty_stream(self, auth_client):
+        """Проверяет пустой поток."""
+
+        response = auth_client.get(reverse('rating-stream'))
+        assert json.loads(b''.join(response.streaming_content)) == []
+
+    def test_stream_requires_authentication(self):
+        """Проверяет, что поток доступен только аутентифицированным."""
+
+        response = APIClient().get(reverse('rating-stream'))
+        assert response.status_code == 401
@@ -0,0 +1,106 @@
+import logging
+
+import pytest
+from django.db import connection
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from kittens import slow_queries
+
+from .factories import CustomUserFactory, KittenFactory
+
+
+@pytest.fixture(autouse=True)
+def reset_slow_queries():
+    slow_queries.reset_slow_queries()
+    yield
+    slow_queries.reset_slow_queries()
+
+
+@pytest.fixture
+def slow_query_log(settings):
+    """Включает журнал с нулевым порогом на время теста."""
+
+    settings.SLOW_QUERY_LOG = True
+    settings.SLOW_QUERY_THRESHOLD_MS = 0
+    with connection.execute_wrapper(slow_queries.log_slow_queries):
+        yield
+
+
+def test_normalize_sql():
+    """Проверяет, что запросы с разными литералами имеют одну форму."""
+
+    first = slow_queries.normalize_sql("SELECT * FROM t WHERE id IN (1, 2) AND name = 'a'")
+    second = slow_queries.normalize_sql("SELECT *  FROM t WHERE id IN (3) AND name = 'b'")
+    assert first == second == 'SELECT * FROM t WHERE id IN (...) AND name = ?'
+
+
+@pytest.mark.django_db
+class TestSlowQueryLog:
+    """Тесты для журнала медленных SQL-запросов."""
+
+    @pytest.fixture
+    def auth_client(self):
+        client = APIClient()
+        client.force_authenticate(user=CustomUserFactory())
+        return client
+
+    def test_logs_view_and_deduplicates(self, auth_client, slow_query_log, caplog):
+        """
+        Проверяет, что запрос записывается с действием набора
+        представлений, а повтор той же формы - только в сводку.
+        """
+
+        kitten = KittenFactory()
+        caplog.clear()
+        url = reverse('kitten-list')
+        with caplog.at_level(logging.WARNING, logger='kittens.slow_queries'):
+            auth_client.get(url, {'breed': kitten.breed_id})
+        messages = [record.getMessage() for record in caplog.records]
+        assert messages
+        assert all('KittenViewSet.list (GET /api/kittens/)' in message for message in messages)
+        assert any('"kittens_kitten"' in message for message in messages)
+
+        caplog.clear()
+        with caplog.at_level(logging.WARNING, logger='kittens.slow_queries'):
+            auth_client.get(url, {'breed': kitten.breed_id, 'page_size': 5})
+        assert caplog.records == []
+        counts = [
+            entry['count'] for entry in slow_queries.slow_query_stats()
+            if entry['last_origin'].startswith('KittenViewSet.list')
+        ]
+        assert counts and all(count == 2 for count in counts)
+
+    def test_threshold(self, auth_client, slow_query_log, settings, caplog):
+        """Проверяет, что быстрые запросы не записываются."""
+
+        settings.SLOW_QUERY_THRESHOLD_MS = 60_000
+        with caplog.at_level(logging.WARNING, logger='kittens.slow_queries'):
+            auth_client.get(reverse('kitten-list'))
+        assert caplog.records == []
+        assert slow_queries.slow_query_stats() == []
+
+    def test_outside_request(self, slow_query_log, caplog):
+        """Проверяет запись запросов вне HTTP-запроса и отсутствие EXPLAIN на SQLite."""
+
+        with caplog.at_level(logging.WARNING, logger='kittens.slow_queries'):
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+        assert caplog.records[0].getMessage().startswith('Slow query')
+        assert ' in -\n' in caplog.records[0].getMessage()
+        assert slow_queries.explain(connection, 'SELECT 1', ()) is None
+
+    def test_stats_endpoint(self, slow_query_log):
+        """Проверяет, что сводка доступна только администраторам."""
+
+        client = APIClient()
+        client.force_authenticate(user=CustomUserFactory(is_staff=True))
+        response = client.get(reverse('slow-queries'))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data
+        assert {'sql', 'count', 'avg_ms', 'max_ms', 'last_origin'} <= set(response.data[0])
+
+        client.force_authenticate(user=CustomUserFactory(is_staff=False))
+        response = client.get(reverse('slow-queries'))
+        assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -0,0 +1,112 @@
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from .factories import CustomUserFactory, KittenFactory, RatingFactory
+from kittens.models import KittenStats
+
+
+@pytest.mark.django_db
+class TestKittenStats:
+    """Тесты для денормализованной статистики оценок."""
+
+    @pytest.fixture
+    def user(self):
+        return CustomUserFactory(role='visitor')
+
+    @pytest.fixture
+    def auth_client(self, user):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    @pytest.fixture
+    def kitten(self):
+        return KittenFactory()
+
+    def get_stats(self, client, kitten):
+        url = reverse('rating-kitten-stats', kwargs={'kitten_id': kitten.id})
+        response = client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        return response.data
+
+    def test_stats_follow_rating_writes(self, auth_client, kitten):
+        """
+        Проверяет, что создание, изменение и удаление оценки
+        отражаются в статистике котенка.
+        """
+
+        other = CustomUserFactory()
+        RatingFactory(kitten=kitten, user=other, score=2)
+        call_command('rebuild_kitten_stats')
+
+        url = reverse('rating-list')
+        response = auth_client.post(url, {'kitten': kitten.id, 'score': 5}, format='json')
+        assert response.status_code == status.HTTP_201_CREATED
+        data = self.get_stats(auth_client, kitten)
+        assert data['total_score'] == 7
+        assert data['rating_count'] == 2
+        assert data['average_score'] == 3.5
+        assert data['histogram'] == {'1': 0, '2': 1, '3': 0, '4': 0, '5': 1}
+
+        detail = reverse('rating-detail', args=[response.data['id']])
+        response = auth_client.put(
+            detail, {'kitten': kitten.id, 'score': 3}, format='json'
+        )
+        assert response.status_code == status.HTTP_200_OK
+        data = self.get_stats(auth_client, kitten)
+        assert data['total_score'] == 5
+        assert data['histogram']['3'] == 1
+        assert data['histogram']['5'] == 0
+
+        response = auth_client.delete(detail)
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        data = self.get_stats(auth_client, kitten)
+        assert data['total_score'] == 2
+        assert data['rating_count'] == 1
+
+    def test_stats_without_ratings(self, auth_client, kitten):
+        """Проверяет статистику котенка, у которого еще нет оценок."""
+
+        data = self.get_stats(auth_client, kitten)
+        assert data['total_score'] == 0
+        assert data['rating_count'] == 0
+        assert data['average_score'] is None
+
+    def test_stats_unknown_kitten(self, auth_client):
+        """Проверяет, что для несуществующего котенка возвращается 404."""
+
+        url = reverse('rating-kitten-stats', kwargs={'kitten_id': 999999})
+        response = auth_client.get(url)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_kitten_list_with_stats(self, auth_client, kitten):
+        """Проверяет встраивание статистики в список котят."""
+
+        auth_client.post(
+            reverse('rating-list'), {'kitten': kitten.id, 'score': 4}, format='json'
+        )
+        response = auth_client.get(reverse('kitten-list') + '?with_stats=1')
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['results'][0]['stats']['total_score'] == 4
+
+        response = auth_client.get(reverse('kitten-list'))
+        assert 'stats' not in response.data['results'][0]
+
+    def test_rebuild_and_verify_command(self, kitten):
+        """Проверяет пересчет и сверку статистики командой управления."""
+
+        RatingFactory(kitten=kitten, score=1)
+        RatingFactory(kitten=kitten, score=4)
+        with pytest.raises(CommandError):
+            call_command('rebuild_kitten_stats', '--verify')
+
+        call_command('rebuild_kitten_stats')
+        stats = KittenStats.objects.get(kitten=kitten)
+        assert stats.total_score == 5
+        assert stats.score_1 == 1
+        assert stats.score_4 == 1
+        call_command('rebuild_kitten_stats', '--verify')
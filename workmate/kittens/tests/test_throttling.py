@@ -0,0 +1,163 @@
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import status
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from kittens.models import CustomUser
+from kittens.throttling import TokenBucketThrottle, parse_rate
+
+from .factories import CustomUserFactory, KittenFactory
+
+
+def test_parse_rate():
+    """Проверяет разбор лимитов с емкостью корзины и без нее."""
+
+    assert parse_rate('60/min') == (60, 1.0)
+    assert parse_rate('60/min:20') == (20, 1.0)
+    assert parse_rate('7200/hour:5') == (5, 2.0)
+    assert parse_rate('0/min') == (0, 0.0)
+    with pytest.raises(ImproperlyConfigured):
+        parse_rate('-1/min')
+    with pytest.raises(ImproperlyConfigured):
+        parse_rate('60/min:-1')
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Управляемые часы ограничений: clock[0] - текущее время."""
+
+    now = [1_000_000.0]
+    monkeypatch.setattr(TokenBucketThrottle, 'timer', staticmethod(lambda: now[0]))
+    return now
+
+
+@pytest.fixture
+def rates(settings):
+    settings.THROTTLE_RATES = {
+        'rating_create': '60/min:2',
+        'rating_create_ip': '600/min:100',
+        'token_obtain_ip': '600/min:100',
+        'token_obtain_account': '60/min:2',
+    }
+    return settings.THROTTLE_RATES
+
+
+def client_for(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.mark.django_db
+class TestRatingThrottle:
+    """Тесты для ограничения частоты создания оценок."""
+
+    def rate(self, client, kitten):
+        return client.post(
+            reverse('rating-list'), {'kitten': kitten.id, 'score': 5}, format='json'
+        )
+
+    def test_burst_then_refill(self, rates, clock):
+        """
+        Проверяет, что после исчерпания корзины запрос получает 429
+        с Retry-After, а через секунду токен восстанавливается.
+        """
+
+        client = client_for(CustomUserFactory(role='visitor'))
+        kittens = KittenFactory.create_batch(4)
+        assert self.rate(client, kittens[0]).status_code == status.HTTP_201_CREATED
+        assert self.rate(client, kittens[1]).status_code == status.HTTP_201_CREATED
+
+        response = self.rate(client, kittens[2])
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert response['Retry-After'] == '1'
+
+        clock[0] += 1
+        assert self.rate(client, kittens[2]).status_code == status.HTTP_201_CREATED
+        assert self.rate(client, kittens[3]).status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+    @pytest.mark.parametrize('rate', ['0/min', '60/min:0', '0/min:5'])
+    def test_zero_rate_blocks(self, rates, clock, rate):
+        """Проверяет, что нулевой лимит запрещает действие ответом 429."""
+
+        rates['rating_create'] = rate
+        client = client_for(CustomUserFactory())
+        response = self.rate(client, KittenFactory())
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert response['Retry-After'] == '60'
+
+    def test_reads_are_not_throttled(self, rates, clock):
+        """Проверяет, что ограничение не касается чтения оценок."""
+
+        rates['rating_create'] = '1/min:1'
+        client = client_for(CustomUserFactory())
+        for _ in range(3):
+            assert client.get(reverse('rating-list')).status_code == status.HTTP_200_OK
+
+    def test_role_rate_and_separate_users(self, rates, clock):
+        """Проверяет лимит для роли и отдельные корзины пользователей."""
+
+        rates['rating_create.participant'] = '60/min:1'
+        kittens = KittenFactory.create_batch(2)
+        participant = client_for(CustomUserFactory(role='participant'))
+        assert self.rate(participant, kittens[0]).status_code == status.HTTP_201_CREATED
+        assert self.rate(participant, kittens[1]).status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+        visitor = client_for(CustomUserFactory(role='visitor'))
+        assert self.rate(visitor, kittens[0]).status_code == status.HTTP_201_CREATED
+        assert self.rate(visitor, kittens[1]).status_code == status.HTTP_201_CREATED
+
+    def test_ip_throttle(self, rates, clock):
+        """Проверяет общую корзину запросов с одного IP-адреса."""
+
+        rates['rating_create_ip'] = '60/min:2'
+        kitten = KittenFactory()
+        for expected in (status.HTTP_201_CREATED, status.HTTP_201_CREATED,
+                         status.HTTP_429_TOO_MANY_REQUESTS):
+            client = client_for(CustomUserFactory())
+            assert self.rate(client, kitten).status_code == expected
+
+    def test_disabled(self, rates, clock, settings):
+        """Проверяет, что THROTTLE_ENABLED = False выключает ограничения."""
+
+        settings.THROTTLE_ENABLED = False
+        client = client_for(CustomUserFactory(role='visitor'))
+        for kitten in KittenFactory.create_batch(3):
+            assert self.rate(client, kitten).status_code == status.HTTP_201_CREATED
+
+
+@pytest.mark.django_db
+class TestTokenObtainThrottle:
+    """Тесты для ограничения частоты выдачи токенов."""
+
+    def obtain(self, email, password):
+        return APIClient().post(
+            reverse('token_obtain_pair'),
+            {'email': email, 'password': password},
+            format='json',
+        )
+
+    def test_account_throttle(self, rates, clock):
+        """
+        Проверяет, что попытки входа в одну учетную запись ограничены,
+        а вход в другую запись с того же адреса доступен.
+        """
+
+        CustomUser.objects.create_user(
+            email='user@example.com', username='user', password='secret-pass'
+        )
+        assert self.obtain('user@example.com', 'wrong').status_code == status.HTTP_401_UNAUTHORIZED
+        assert self.obtain('User@Example.com', 'wrong').status_code == status.HTTP_401_UNAUTHORIZED
+        response = self.obtain('user@example.com', 'secret-pass')
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert int(response['Retry-After']) >= 1
+
+        assert self.obtain('other@example.com', 'wrong').status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_ip_throttle(self, rates, clock):
+        """Проверяет ограничение попыток входа с одного IP-адреса."""
+
+        rates['token_obtain_ip'] = '60/min:1'
+        assert self.obtain('a@example.com', 'wrong').status_code == status.HTTP_401_UNAUTHORIZED
+        assert self.obtain('b@example.com', 'wrong').status_code == status.HTTP_429_TOO_MANY_REQUESTS
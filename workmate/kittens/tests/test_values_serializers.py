@@ -0,0 +1,83 @@
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.reverse import reverse
+from rest_framework.test import APIClient
+
+from kittens.models import Kitten, Rating
+from kittens.serializers import (
+    KittenSerializer,
+    KittenValuesSerializer,
+    RatingSerializer,
+    RatingValuesSerializer,
+    ValuesSerializer,
+)
+
+from .factories import CustomUserFactory, KittenFactory, RatingFactory
+
+
+def render(data):
+    return JSONRenderer().render(data)
+
+
+@pytest.mark.django_db
+class TestValuesSerializers:
+    """Тесты для быстрых сериализаторов list и retrieve."""
+
+    @pytest.fixture
+    def auth_client(self):
+        client = APIClient()
+        client.force_authenticate(user=CustomUserFactory())
+        return client
+
+    @pytest.mark.parametrize('model, model_serializer, values_serializer', [
+        (Kitten, KittenSerializer, KittenValuesSerializer),
+        (Rating, RatingSerializer, RatingValuesSerializer),
+    ])
+    def test_output_is_identical(self, model, model_serializer, values_serializer):
+        """Проверяет побайтовое совпадение JSON с ModelSerializer."""
+
+        KittenFactory(name='Мурзик "Младший"', description='')
+        RatingFactory.create_batch(3)
+        queryset = model.objects.order_by('id')
+        expected = render(model_serializer(queryset, many=True).data)
+        rows = queryset.values(*values_serializer.values_fields())
+        assert render(values_serializer(rows, many=True).data) == expected
+
+        instance = queryset.first()
+        row = rows.get(id=instance.id)
+        assert render(values_serializer(row).data) == render(model_serializer(instance).data)
+
+    def test_field_order(self):
+        """Проверяет порядок полей: id, поля модели, внешние ключи."""
+
+        assert KittenValuesSerializer.values_fields() == [
+            'id', 'color', 'name', 'age', 'description', 'breed_id', 'owner_id'
+        ]
+
+    def test_list_and_retrieve_use_values(self, auth_client):
+        """Проверяет, что GET list и retrieve отдают тот же ответ, что и раньше."""
+
+        ratings = RatingFactory.create_batch(2)
+        response = auth_client.get(reverse('rating-list'))
+        assert response.data['results'] == RatingSerializer(ratings, many=True).data
+
+        kitten = ratings[0].kitten
+        response = auth_client.get(reverse('kitten-detail', args=[kitten.id]))
+        assert render(response.data) == render(KittenSerializer(kitten).data)
+
+        response = auth_client.get(reverse('kitten-list'), {'with_stats': 1})
+        assert 'stats' in response.data['results'][0]
+
+    def test_unsupported_field(self):
+        """Проверяет ошибку для полей, которые нельзя прочитать из .values()."""
+
+        class KittenWithOwnerName(KittenSerializer):
+            owner_name = serializers.CharField(source='owner.username')
+
+        class KittenWithOwnerNameValues(ValuesSerializer):
+            model_serializer_class = KittenWithOwnerName
+
+        with pytest.raises(ImproperlyConfigured):
+            KittenWithOwnerNameValues.values_fields()
@@ -0,0 +1,143 @@
+"""
+Ограничение частоты запросов алгоритмом token bucket.
+
+У каждого клиента (пользователя, IP-адреса или учетной записи, в которую
+выполняется вход) есть корзина на capacity токенов, которая пополняется
+со скоростью rate токенов в секунду; запрос забирает один токен. Так
+клиент может сделать до capacity запросов подряд, а в среднем - не
+больше rate. Состояние корзины - пара (токены, время) в кэше
+THROTTLE_CACHE_ALIAS, проверка - одно чтение и одна запись. Чтение
+и запись не атомарны, поэтому параллельные запросы одного клиента
+могут изредка получить на несколько токенов больше.
+
+Лимиты задаются в THROTTLE_RATES строками '<число>/<период>' или
+'<число>/<период>:<емкость>', например '60/min:20'. Для роли можно
+задать отдельный лимит ключом '<scope>.<роль>'. Лимит '0/min' (или
+емкость 0) запрещает действие.
+"""
+
+import hashlib
+import math
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.throttling import BaseThrottle
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+# Retry-After (секунды) для запрещенного лимитом действия.
+BLOCKED_WAIT = 60
+
+
+def parse_rate(rate):
+    """
+    Разбирает лимит '60/min' или '60/min:20' в пару (емкость корзины,
+    токенов в секунду). Без явной емкости она равна числу запросов.
+    """
+
+    text = rate
+    rate, _, capacity = rate.partition(':')
+    count, period = rate.split('/')
+    count = int(count)
+    capacity = int(capacity) if capacity else count
+    if count < 0 or capacity < 0:
+        raise ImproperlyConfigured(f'Invalid throttle rate {text!r}: values must not be negative.')
+    return capacity, count / PERIODS[period[0]]
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Базовый класс ограничений; подклассы задают scope и get_bucket_ident().
+    """
+
+    scope = None
+    timer = time.time
+
+    def get_rate(self, request):
+        """Лимит для роли пользователя или общий лимит scope."""
+
+        rates = settings.THROTTLE_RATES
+        role = getattr(request.user, 'role', None) if request.user.is_authenticated else None
+        return rates.get(f'{self.scope}.{role}') or rates.get(self.scope)
+
+    def get_bucket_ident(self, request, view):
+        """Идентификатор корзины клиента или None, если ограничение не нужно."""
+
+        raise NotImplementedError
+
+    def allow_request(self, request, view):
+        self.wait_time = 0
+        if not settings.THROTTLE_ENABLED:
+            return True
+        rate = self.get_rate(request)
+        ident = self.get_bucket_ident(request, view) if rate else None
+        if ident is None:
+            return True
+
+        capacity, refill = parse_rate(rate)
+        if not capacity or not refill:
+            # Корзина никогда не наполнится: действие запрещено.
+            self.wait_time = BLOCKED_WAIT
+            return False
+        cache = caches[settings.THROTTLE_CACHE_ALIAS]
+        key = f'throttle:{self.scope}:{ident}'
+        now = self.timer()
+        tokens, updated = cache.get(key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * refill)
+        if tokens < 1:
+            self.wait_time = (1 - tokens) / refill
+            return False
+        # Через capacity / refill секунд корзина снова полна, и ключ
+        # можно удалить: отсутствующий ключ означает полную корзину.
+        cache.set(key, (tokens - 1, now), math.ceil(capacity / refill))
+        return True
+
+    def wait(self):
+        return self.wait_time
+
+
+class UserTokenBucketThrottle(TokenBucketThrottle):
+    """Корзина на пользователя; для анонимных запросов - на IP-адрес."""
+
+    def get_bucket_ident(self, request, view):
+        if request.user.is_authenticated:
+            return f'user:{request.user.id}'
+        return f'ip:{self.get_ident(request)}'
+
+
+class IPTokenBucketThrottle(TokenBucketThrottle):
+    """Корзина на IP-адрес клиента (с учетом NUM_PROXIES)."""
+
+    def get_bucket_ident(self, request, view):
+        return f'ip:{self.get_ident(request)}'
+
+
+class RatingCreateThrottle(UserTokenBucketThrottle):
+    scope = 'rating_create'
+
+
+class RatingCreateIPThrottle(IPTokenBucketThrottle):
+    scope = 'rating_create_ip'
+
+
+class TokenObtainIPThrottle(IPTokenBucketThrottle):
+    scope = 'token_obtain_ip'
+
+
+class TokenObtainAccountThrottle(TokenBucketThrottle):
+    """
+    Корзина на учетную запись, в которую выполняется вход: ограничивает
+    подбор пароля к одному адресу с разных IP.
+    """
+
+    scope = 'token_obtain_account'
+
+    def get_bucket_ident(self, request, view):
+        data = request.data
+        username = data.get(get_user_model().USERNAME_FIELD) if hasattr(data, 'get') else None
+        if not isinstance(username, str) or not username:
+            return None
+        return hashlib.sha1(username.strip().lower().encode()).hexdigest()
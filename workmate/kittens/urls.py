@@ -1,12 +1,29 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import BreedViewSet, KittenViewSet, RatingViewSet
+from .async_views import async_urlpatterns
+from .views import (
+    BreedViewSet,
+    CacheStatsView,
+    DatabasePoolStatsView,
+    KittenViewSet,
+    RatingViewSet,
+    SlowQueryStatsView,
+)
 
 router = DefaultRouter()
 router.register(r'breeds', BreedViewSet)
 router.register(r'kittens', KittenViewSet)
 router.register(r'ratings', RatingViewSet)
 
+router_urls = router.urls
+if settings.ASYNC_READ_VIEWS:
+    # GET-запросы обрабатываются асинхронно (см. kittens.async_views).
+    router_urls = async_urlpatterns(router_urls, (BreedViewSet, KittenViewSet, RatingViewSet))
+
 urlpatterns = [
-    path('', include(router.urls)),
+    path('cache-stats/', CacheStatsView.as_view(), name='cache-stats'),
+    path('db-pool-stats/', DatabasePoolStatsView.as_view(), name='db-pool-stats'),
+    path('slow-queries/', SlowQueryStatsView.as_view(), name='slow-queries'),
+    path('', include(router_urls)),
 ]
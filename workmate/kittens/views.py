@@ -1,13 +1,47 @@
 from rest_framework import generics, status, viewsets
-from rest_framework.permissions import BasePermission, IsAuthenticated
+from rest_framework.permissions import BasePermission, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.exceptions import ValidationError, PermissionDenied
 from rest_framework.decorators import action
-from django.db.models import Sum, Count
-
-from .models import Breed, CustomUser, Kitten, Rating
-from .serializers import BreedSerializer, CustomUserSerializer, KittenSerializer, RatingSerializer
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.views import TokenObtainPairView
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, connections, router, transaction
+from django.http import Http404
+
+from .models import Breed, CustomUser, Kitten, KittenStats, Rating
+from .serializers import (
+    BreedSerializer,
+    CustomUserSerializer,
+    KittenSerializer,
+    KittenStatsSerializer,
+    KittenValuesSerializer,
+    KittenWithStatsSerializer,
+    KittinFilter,
+    LeaderboardEntrySerializer,
+    RatingBulkItemSerializer,
+    RatingFilter,
+    RatingSerializer,
+    RatingValuesSerializer,
+)
+from . import authentication, bulk_import, cache, db_pool, slow_queries, stats
+from .async_views import AsyncReadMixin
+from .cache import CachedResponseMixin
+from .conditional import ConditionalGetMixin
+from .export import ExportMixin
+from .search import KittenSearchFilter, search_kittens
+from .streaming import StreamingListMixin
+from .throttling import (
+    RatingCreateIPThrottle,
+    RatingCreateThrottle,
+    TokenObtainAccountThrottle,
+    TokenObtainIPThrottle,
+)
 
 
 class IsParticipant(BasePermission):
@@ -37,7 +71,166 @@ class RegisterView(generics.CreateAPIView):
     serializer_class = CustomUserSerializer
 
 
-class BreedViewSet(viewsets.ModelViewSet):
+class ThrottledTokenObtainPairView(TokenObtainPairView):
+    """
+    Выдача токенов с ограничением частоты по IP-адресу и по учетной
+    записи: проверка пароля дорогая и без ограничения позволяет
+    одному клиенту занять все воркеры.
+    """
+
+    throttle_classes = [TokenObtainIPThrottle, TokenObtainAccountThrottle]
+
+
+class TokenRevokeView(APIView):
+    """
+    Отзывает access-токен текущего запроса и переданный refresh-токен
+    пользователя ({"refresh": "..."}).
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        refresh = request.data.get('refresh')
+        if refresh:
+            try:
+                token = RefreshToken(refresh)
+            except TokenError as exc:
+                raise ValidationError({'refresh': [str(exc)]})
+            if str(token.get(jwt_settings.USER_ID_CLAIM)) != str(request.user.id):
+                raise ValidationError({'refresh': ['Token belongs to another user.']})
+            authentication.revoke_token(token)
+        if request.auth is not None:
+            authentication.revoke_token(request.auth)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class CacheStatsView(APIView):
+    """
+    Возвращает счетчики попаданий и промахов кэша ответов.
+    Доступно только администраторам.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(cache.cache_stats())
+
+
+class DatabasePoolStatsView(APIView):
+    """
+    Возвращает состояние пулов соединений с базой данных текущего
+    процесса. Доступно только администраторам.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(db_pool.pool_stats())
+
+
+class SlowQueryStatsView(APIView):
+    """
+    Возвращает сводку медленных SQL-запросов текущего процесса
+    по формам запросов. Доступно только администраторам.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(slow_queries.slow_query_stats())
+
+
+class ListFilterBackend(DjangoFilterBackend):
+    """
+    DjangoFilterBackend, параметры которого документируются только для
+    действий из filter_actions набора представлений: выгрузка,
+    лидерборд и статистика фильтры набора не применяют.
+    """
+
+    def get_schema_operation_parameters(self, view):
+        if getattr(view, 'action', None) not in getattr(view, 'filter_actions', ('list',)):
+            return []
+        return super().get_schema_operation_parameters(view)
+
+
+OWNER_ACTIONS = ('update', 'partial_update', 'destroy')
+
+
+class OwnerScopedMixin:
+    """
+    Изменение и удаление только своих объектов. Для update,
+    partial_update и destroy queryset ограничивается условием
+    owner_field = request.user.id, поэтому владение проверяется в том же
+    SQL-запросе, что и поиск объекта. Если объект не найден, один
+    дополнительный запрос отличает чужой объект (403) от отсутствующего (404).
+    """
+
+    owner_field = None
+    owner_denied_messages = {}
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in OWNER_ACTIONS:
+            queryset = queryset.filter(**{self.owner_field: self.request.user.id})
+        return queryset
+
+    def get_object(self):
+        try:
+            return super().get_object()
+        except Http404:
+            self.check_foreign_object()
+            raise
+
+    def check_foreign_object(self):
+        """
+        Вызывается, когда объект не найден среди объектов пользователя:
+        возвращает 403, если объект существует, но принадлежит другому.
+        """
+
+        if self.action not in OWNER_ACTIONS:
+            return
+        lookup = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        try:
+            exists = super().get_queryset().filter(**{self.lookup_field: lookup}).exists()
+        except (TypeError, ValueError, DjangoValidationError):
+            return
+        if exists:
+            action = 'delete' if self.action == 'destroy' else 'update'
+            raise PermissionDenied(self.owner_denied_messages[action])
+
+
+class ValuesReadMixin:
+    """
+    Для GET-запросов list и retrieve читает строки через queryset.values()
+    и сериализует их values_serializer_class (см. ValuesSerializer) вместо
+    создания объектов моделей и ModelSerializer.
+    """
+
+    values_serializer_class = None
+    values_actions = ('list', 'retrieve')
+
+    def use_values(self):
+        # Для схемы OpenAPI (drf-yasg) нужны поля ModelSerializer.
+        return (
+            self.values_serializer_class is not None
+            and not getattr(self, 'swagger_fake_view', False)
+            and self.action in self.values_actions
+            and self.request.method in ('GET', 'HEAD')
+        )
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.use_values():
+            queryset = queryset.values(*self.values_serializer_class.values_fields())
+        return queryset
+
+    def get_serializer_class(self):
+        if self.use_values():
+            return self.values_serializer_class
+        return super().get_serializer_class()
+
+
+class BreedViewSet(ConditionalGetMixin, CachedResponseMixin, AsyncReadMixin, viewsets.ModelViewSet):
     """
     Набор представлений для управления породами
     Доступен только аутентифицированным пользователям с ролью 'participant'.
@@ -46,9 +239,31 @@ class BreedViewSet(viewsets.ModelViewSet):
     queryset = Breed.objects.all()
     serializer_class = BreedSerializer
     permission_classes = [IsAuthenticated, IsParticipant]
+    cache_namespaces = (cache.BREEDS,)
 
-
-class KittenViewSet(viewsets.ModelViewSet):
+    def perform_create(self, serializer):
+        serializer.save()
+        cache.invalidate(cache.BREEDS)
+
+    def perform_update(self, serializer):
+        serializer.save()
+        cache.invalidate(cache.BREEDS)
+
+    def perform_destroy(self, instance):
+        # Удаление породы каскадно удаляет ее котят и их оценки.
+        instance.delete()
+        cache.invalidate(cache.BREEDS, cache.KITTENS, cache.RATINGS)
+
+
+class KittenViewSet(
+    ConditionalGetMixin,
+    CachedResponseMixin,
+    OwnerScopedMixin,
+    ValuesReadMixin,
+    ExportMixin,
+    AsyncReadMixin,
+    viewsets.ModelViewSet,
+):
     """
     Набор представлений для управления котятами.
     Доступен только аутентифицированным пользователям.
@@ -56,9 +271,51 @@ class KittenViewSet(viewsets.ModelViewSet):
 
     queryset = Kitten.objects.all()
     serializer_class = KittenSerializer
-    filter_backends = [DjangoFilterBackend]
-    filterset_fields = ['breed']
+    values_serializer_class = KittenValuesSerializer
+    values_actions = ('list', 'retrieve', 'search')
+    export_kind = 'kittens'
+    filter_backends = [ListFilterBackend, KittenSearchFilter]
+    filterset_class = KittinFilter
+    filter_actions = ('list', 'search')
     permission_classes = [IsAuthenticated]
+    owner_field = 'owner_id'
+    owner_denied_messages = {
+        'update': 'You do not have permission to modify this kitten.',
+        'delete': 'You do not have permission to delete this kitten.',
+    }
+
+    def with_stats(self):
+        """
+        Возвращает True, если клиент запросил встроенную статистику
+        оценок параметром ?with_stats=1.
+        """
+
+        value = self.request.query_params.get('with_stats', '')
+        return value.lower() in ('1', 'true', 'yes')
+
+    def use_values(self):
+        return not self.with_stats() and super().use_values()
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.with_stats():
+            queryset = queryset.select_related('stats')
+        return queryset
+
+    def get_serializer_class(self):
+        if self.with_stats():
+            return KittenWithStatsSerializer
+        return super().get_serializer_class()
+
+    def filters_by_stats(self):
+        """Возвращает True, если список фильтруется по средней оценке."""
+
+        return any(name.startswith('average_score') for name in self.request.query_params)
+
+    def get_cache_namespaces(self):
+        if self.action == 'leaderboard' or self.with_stats() or self.filters_by_stats():
+            return (cache.KITTENS, cache.RATINGS)
+        return (cache.KITTENS,)
 
     def perform_create(self, serializer):
         """
@@ -70,19 +327,30 @@ class KittenViewSet(viewsets.ModelViewSet):
                 {'detail': 'You do not have permission to add kittens.'},
                 status=status.HTTP_403_FORBIDDEN
             )
-        serializer.save(owner=self.request.user)
+        serializer.save(owner_id=self.request.user.id)
+        cache.invalidate(cache.KITTENS)
+
+    def perform_update(self, serializer):
+        """
+        Сохраняет котенка и переносит его статистику в новую породу.
+        """
+
+        old_breed_id = serializer.instance.breed_id
+        kitten = serializer.save()
+        if kitten.breed_id != old_breed_id:
+            stats.move_kitten_to_breed(kitten)
+        cache.invalidate(cache.KITTENS)
+
+    def perform_destroy(self, instance):
+        # Удаление котенка каскадно удаляет его оценки.
+        instance.delete()
+        cache.invalidate(cache.KITTENS, cache.RATINGS)
 
     def update(self, request, *args, **kwargs):
         """
         Обновляет информацию о котенке, если пользователь является его владельцем.
         """
 
-        instance = self.get_object()
-        if instance.owner != request.user:
-            return Response(
-                {'detail': 'You do not have permission to modify this kitten.'},
-                status=status.HTTP_403_FORBIDDEN
-            )
         return super().update(request, *args, **kwargs)
 
     def destroy(self, request, *args, **kwargs):
@@ -90,16 +358,154 @@ class KittenViewSet(viewsets.ModelViewSet):
         Удаляет котенка, если пользователь является его владельцем.
         """
 
-        instance = self.get_object()
-        if instance.owner != request.user:
-            return Response(
-                {'detail': 'You do not have permission to delete this kitten.'},
-                status=status.HTTP_403_FORBIDDEN
-            )
         return super().destroy(request, *args, **kwargs)
 
+    @action(detail=False, methods=['post'], url_path='import')
+    def import_kittens(self, request):
+        """
+        Импортирует котят текущего пользователя из CSV или JSON.
+
+        Принимает файл в поле file (формат по ?file_format= или по
+        расширению) или JSON-список в теле запроса. Породы задаются
+        названием, отсутствующие создаются. С ?dry_run=1 только
+        возвращает отчет без сохранения.
+        """
+
+        if request.user.role != 'participant':
+            raise PermissionDenied('You do not have permission to add kittens.')
+
+        upload = request.FILES.get('file')
+        if upload is not None:
+            file_format = request.query_params.get('file_format') or (
+                'json' if upload.name.lower().endswith('.json') else 'csv'
+            )
+            if file_format not in bulk_import.FORMATS:
+                raise ValidationError({'file_format': f'"{file_format}" is not a valid choice.'})
+            try:
+                content = upload.read().decode('utf-8-sig')
+            except UnicodeDecodeError:
+                raise ValidationError({'file': 'The file must be UTF-8 encoded.'})
+            records = bulk_import.parse_records(content, file_format)
+        else:
+            records = request.data
+            if not isinstance(records, list):
+                raise ValidationError({'detail': 'Expected a list of kittens or a file.'})
+
+        max_size = settings.KITTEN_IMPORT_MAX_SIZE
+        if len(records) > max_size:
+            raise ValidationError(
+                {'detail': f'Ensure the import has no more than {max_size} kittens.'}
+            )
+
+        dry_run = request.query_params.get('dry_run', '').lower() in ('1', 'true', 'yes')
+        report = bulk_import.import_kittens(
+            records,
+            owner_id=request.user.id,
+            batch_size=settings.KITTEN_IMPORT_BATCH_SIZE,
+            dry_run=dry_run,
+        )
+        if not report['created']:
+            response_status = status.HTTP_400_BAD_REQUEST
+        elif dry_run:
+            response_status = status.HTTP_200_OK
+        else:
+            response_status = status.HTTP_201_CREATED
+        return Response(report, status=response_status)
+
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """
+        Возвращает первые N котят, найденных по ?search=, в порядке
+        убывания релевантности.
+
+        Параметры: search - слова для поиска в имени, цвете и описании,
+        фильтры списка котят, limit - размер выдачи (по умолчанию 20).
+        """
+
+        return self.conditional_response(
+            request,
+            lambda: self.cached_response(request, self._build_search),
+        )
+
+    def _build_search(self):
+        terms = KittenSearchFilter().get_search_terms(self.request)
+        if not terms:
+            raise ValidationError({'search': 'This query parameter is required.'})
+        limit = self._int_param('limit', default=20, minimum=1)
+        limit = min(limit, settings.API_MAX_PAGE_SIZE)
+        queryset = ListFilterBackend().filter_queryset(
+            self.request, self.get_queryset(), self
+        )
+        kittens = search_kittens(queryset, terms, ranked=True)[:limit]
+        return Response(self.get_serializer(kittens, many=True).data)
+
+    @action(detail=False, methods=['get'])
+    def leaderboard(self, request):
+        """
+        Возвращает первые N котят по байесовской средней оценке.
+
+        Параметры: breed - фильтр по породе, min_votes - минимальное
+        количество оценок (по умолчанию 1), limit - размер выдачи.
+        Строки читаются из индекса по KittenStats, поэтому стоимость
+        запроса зависит от limit, а не от количества оценок.
+        """
+
+        return self.conditional_response(
+            request,
+            lambda: self.cached_response(request, self._build_leaderboard),
+        )
 
-class RatingViewSet(viewsets.ModelViewSet):
+    def _build_leaderboard(self):
+        params = self.request.query_params
+        limit = self._int_param('limit', default=10, minimum=1)
+        limit = min(limit, settings.API_MAX_PAGE_SIZE)
+        min_votes = self._int_param('min_votes', default=1, minimum=1)
+
+        queryset = KittenStats.objects.filter(rating_count__gte=min_votes)
+        if params.get('breed'):
+            queryset = queryset.filter(
+                breed_id=self._int_param('breed', default=None, minimum=1)
+            )
+        entries = list(
+            queryset
+            .select_related('kitten')
+            .order_by('-bayesian_score', 'kitten_id')[:limit]
+        )
+
+        ranks = {entry.kitten_id: rank for rank, entry in enumerate(entries, 1)}
+        serializer = LeaderboardEntrySerializer(
+            entries, many=True, context={'ranks': ranks}
+        )
+        return Response(serializer.data)
+
+    def _int_param(self, name, default, minimum):
+        """
+        Читает целочисленный параметр запроса или возвращает ошибку 400.
+        """
+
+        value = self.request.query_params.get(name)
+        if value in (None, ''):
+            return default
+        try:
+            value = int(value)
+        except ValueError:
+            raise ValidationError({name: 'A valid integer is required.'})
+        if value < minimum:
+            raise ValidationError(
+                {name: f'Ensure this value is greater than or equal to {minimum}.'}
+            )
+        return value
+
+
+class RatingViewSet(
+    ConditionalGetMixin,
+    OwnerScopedMixin,
+    ValuesReadMixin,
+    StreamingListMixin,
+    ExportMixin,
+    AsyncReadMixin,
+    viewsets.ModelViewSet,
+):
     """
     Набор представлений для управления оценками.
     Доступен только аутентифицированным пользователям.
@@ -107,30 +513,65 @@ class RatingViewSet(viewsets.ModelViewSet):
 
     queryset = Rating.objects.all()
     serializer_class = RatingSerializer
+    values_serializer_class = RatingValuesSerializer
+    export_kind = 'ratings'
+    filter_backends = [ListFilterBackend]
+    filterset_class = RatingFilter
+    filter_actions = ('list', 'stream')
     permission_classes = [IsAuthenticated]
+    throttle_classes = [RatingCreateThrottle, RatingCreateIPThrottle]
+    cache_namespaces = (cache.RATINGS,)
+    owner_field = 'user_id'
+    owner_denied_messages = {
+        'update': 'You do not have permission to modify this reting.',
+        'delete': 'You do not have permission to delete this rating.',
+    }
+
+    def get_throttles(self):
+        # Ограничивается только создание оценок.
+        if self.action not in ('create', 'bulk'):
+            return []
+        return super().get_throttles()
 
     def perform_create(self, serializer):
         """
         Создает новую оценку, если пользователь еще не оценивал данного котенка.
         """
 
-        user = self.request.user
-        kitten = serializer.validated_data.get('kitten')
-        if Rating.objects.filter(user=user, kitten=kitten).exists():
+        # Уникальность пары (user, kitten) обеспечивает ограничение в базе:
+        # вставка без предварительной проверки исключает гонку между
+        # параллельными запросами и экономит один запрос.
+        try:
+            with transaction.atomic():
+                rating = serializer.save(user_id=self.request.user.id)
+                stats.record_rating(rating)
+                cache.invalidate(cache.RATINGS)
+        except IntegrityError:
+            raise ValidationError('You have already rated this kitten.')
+
+    def perform_update(self, serializer):
+        """
+        Сохраняет оценку и переносит изменение в статистику котенка.
+        """
+
+        old_kitten_id = serializer.instance.kitten_id
+        old_score = serializer.instance.score
+        try:
+            with transaction.atomic():
+                rating = serializer.save()
+                stats.apply_score_changes([
+                    (old_kitten_id, old_score, -1),
+                    (rating.kitten_id, rating.score, 1),
+                ])
+                cache.invalidate(cache.RATINGS)
+        except IntegrityError:
             raise ValidationError('You have already rated this kitten.')
-        serializer.save(user=user)
-    
+
     def update(self, request, *args, **kwargs):
         """
         Обновляет оценку, если пользователь является ее автором.
         """
 
-        instance = self.get_object()
-        if instance.user != request.user:
-            return Response(
-                {'detail': 'You do not have permission to modify this reting.'},
-                status=status.HTTP_403_FORBIDDEN
-            )
         return super().update(request, *args, **kwargs)
 
     def destroy(self, request, *args, **kwargs):
@@ -138,27 +579,151 @@ class RatingViewSet(viewsets.ModelViewSet):
         Удаляет оценку, если пользователь является ее автором.
         """
 
-        instance = self.get_object()
-        if instance.user != request.user:
-            return Response(
-                {'detail': 'You do not have permission to delete this rating.'},
-                status=status.HTTP_403_FORBIDDEN
+        # Один запрос DELETE ... RETURNING с условием на автора сразу
+        # возвращает котенка и балл для обновления статистики.
+        with transaction.atomic():
+            deleted = self._delete_own_rating(kwargs['pk'])
+            if deleted is None:
+                self.check_foreign_object()
+                raise Http404
+            stats.forget_rating(*deleted)
+            cache.invalidate(cache.RATINGS)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    def _delete_own_rating(self, pk):
+        """
+        Удаляет оценку pk текущего пользователя и возвращает ее
+        (kitten_id, score) или None, если такой оценки нет.
+        """
+
+        connection = connections[router.db_for_write(Rating)]
+        opts = Rating._meta
+        try:
+            pk = int(pk)
+        except ValueError:
+            return None
+        # Как и ORM, значение вне диапазона первичного ключа считается
+        # отсутствующей строкой: иначе база вернет ошибку переполнения.
+        min_value, max_value = connection.ops.integer_field_range(opts.pk.get_internal_type())
+        if not min_value <= pk <= max_value:
+            return None
+        table, pk_column, user_column, kitten_column, score_column = (
+            connection.ops.quote_name(name)
+            for name in (
+                opts.db_table,
+                opts.pk.column,
+                opts.get_field('user').column,
+                opts.get_field('kitten').column,
+                opts.get_field('score').column,
             )
-        return super().destroy(request, *args, **kwargs)
-    
+        )
+        # ORM не умеет DELETE ... RETURNING; его поддерживают
+        # PostgreSQL и SQLite 3.35+.
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {table} WHERE {pk_column} = %s AND {user_column} = %s '
+                f'RETURNING {kitten_column}, {score_column}',
+                [pk, self.request.user.id],
+            )
+            return cursor.fetchone()
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request):
+        """
+        Создает пакет оценок текущего пользователя.
+
+        Принимает список объектов {kitten, score, comment}. Существование
+        котят и повторные оценки проверяются одним запросом на весь пакет,
+        корректные оценки вставляются через bulk_create. В ответе
+        возвращаются созданные оценки и ошибки с индексами элементов.
+        """
+
+        items = request.data
+        if not isinstance(items, list):
+            raise ValidationError({'detail': 'Expected a list of ratings.'})
+        max_size = settings.RATING_BULK_MAX_SIZE
+        if len(items) > max_size:
+            raise ValidationError(
+                {'detail': f'Ensure this list has no more than {max_size} ratings.'}
+            )
+
+        user_id = request.user.id
+        errors = []
+        valid = []
+        item_serializer = RatingBulkItemSerializer()
+        for index, item in enumerate(items):
+            try:
+                valid.append((index, item_serializer.run_validation(item)))
+            except ValidationError as exc:
+                errors.append({'index': index, 'errors': exc.detail})
+
+        kitten_ids = {data['kitten'] for _, data in valid}
+        existing_kittens = set(
+            Kitten.objects.filter(id__in=kitten_ids).values_list('id', flat=True)
+        )
+        already_rated = set(
+            Rating.objects
+            .filter(user_id=user_id, kitten_id__in=existing_kittens)
+            .values_list('kitten_id', flat=True)
+        )
+
+        ratings = []
+        for index, data in valid:
+            kitten_id = data['kitten']
+            if kitten_id not in existing_kittens:
+                errors.append({'index': index, 'errors': {
+                    'kitten': [f'Invalid pk "{kitten_id}" - object does not exist.']
+                }})
+                continue
+            if kitten_id in already_rated:
+                errors.append({'index': index, 'errors': {
+                    'kitten': ['You have already rated this kitten.']
+                }})
+                continue
+            already_rated.add(kitten_id)
+            ratings.append(Rating(
+                kitten_id=kitten_id,
+                user_id=user_id,
+                score=data['score'],
+                comment=data.get('comment', ''),
+            ))
+
+        if ratings:
+            try:
+                with transaction.atomic():
+                    Rating.objects.bulk_create(ratings, batch_size=max_size)
+                    stats.apply_score_changes(
+                        (rating.kitten_id, rating.score, 1) for rating in ratings
+                    )
+                    cache.invalidate(cache.RATINGS)
+            except IntegrityError:
+                # Параллельный запрос успел оценить тех же котят.
+                raise ValidationError(
+                    {'detail': 'Some of these kittens have just been rated by you. '
+                               'Please retry the request.'}
+                )
+
+        errors.sort(key=lambda error: error['index'])
+        return Response(
+            {
+                'created': RatingSerializer(ratings, many=True).data,
+                'errors': errors,
+            },
+            status=status.HTTP_201_CREATED if ratings else status.HTTP_400_BAD_REQUEST,
+        )
+
     @action(detail=False, methods=['get'], url_path='kitten-stats/(?P<kitten_id>[^/.]+)')
     def kitten_stats(self, request, kitten_id=None):
         """
         Возвращает статистику оценок для указанного котенка.
         """
 
-        try:
-            kitten = Kitten.objects.get(id=kitten_id)
-        except Kitten.DoesNotExist:
-            return Response({'error': 'Kitten not found'}, status=status.HTTP_404_NOT_FOUND)
+        return self._kitten_stats_response(stats.get_kitten_stats(kitten_id))
 
-        stats = Rating.objects.filter(kitten=kitten).aggregate(
-            total_score=Sum('score'),
-            rating_count=Count('id')
-        )
-        return Response(stats)
+    async def akitten_stats(self, request, kitten_id=None):
+        return self._kitten_stats_response(await stats.aget_kitten_stats(kitten_id))
+
+    def _kitten_stats_response(self, kitten_stats):
+        if kitten_stats is None:
+            return Response({'error': 'Kitten not found'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(KittenStatsSerializer(kitten_stats).data)
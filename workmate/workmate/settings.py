@@ -1,4 +1,5 @@
 from pathlib import Path
+import copy
 import os
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -34,6 +35,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'kittens.metrics.PerformanceMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -41,8 +43,27 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'kittens.db_router.ReplicaRoutingMiddleware',
+    'kittens.slow_queries.SlowQueryMiddleware',
 ]
 
+# Метрики запросов: заголовок Server-Timing и /metrics в формате
+# Prometheus (kittens/metrics.py). Если задан METRICS_TOKEN, /metrics
+# требует заголовок Authorization: Bearer <METRICS_TOKEN>.
+PERF_METRICS_ENABLED = os.getenv('PERF_METRICS_ENABLED', 'true').lower() == 'true'
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
+# Журнал медленных SQL-запросов (kittens/slow_queries.py): порог в мс,
+# интервал, в течение которого одна форма запроса пишется один раз,
+# и план EXPLAIN (ANALYZE, BUFFERS) для SELECT на PostgreSQL.
+# Журнал пишется в SLOW_QUERY_LOG_FILE с ротацией.
+SLOW_QUERY_LOG = os.getenv('SLOW_QUERY_LOG', 'false').lower() == 'true'
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv('SLOW_QUERY_THRESHOLD_MS', 100))
+SLOW_QUERY_DEDUP_SECONDS = int(os.getenv('SLOW_QUERY_DEDUP_SECONDS', 300))
+SLOW_QUERY_EXPLAIN = os.getenv('SLOW_QUERY_EXPLAIN', 'false').lower() == 'true'
+SLOW_QUERY_MAX_SHAPES = int(os.getenv('SLOW_QUERY_MAX_SHAPES', 1000))
+SLOW_QUERY_LOG_FILE = os.getenv('SLOW_QUERY_LOG_FILE', str(BASE_DIR / 'logs' / 'slow_queries.log'))
+
 ROOT_URLCONF = 'workmate.urls'
 
 TEMPLATES = [
@@ -75,9 +96,82 @@ DATABASES = {
         'PASSWORD': os.getenv('POSTGRES_PASSWORD'),
         'HOST': 'db',
         'PORT': '5432',
+        # Проверка соединения перед повторным использованием
+        # (для пула - при выдаче соединения из пула).
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Пул соединений psycopg 3 (DB_POOL=true) или постоянные соединения
+# с временем жизни DB_CONN_MAX_AGE секунд (DB_POOL=false). Пул создается
+# в каждом процессе и общий для его потоков и асинхронных запросов,
+# поэтому DB_POOL_MAX_SIZE должен быть не меньше числа потоков воркера
+# (WSGI_THREADS), а WEB_CONCURRENCY * DB_POOL_MAX_SIZE - не больше
+# max_connections PostgreSQL.
+DB_POOL = os.getenv('DB_POOL', 'true').lower() == 'true'
+
+if DB_POOL:
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': int(os.getenv('DB_POOL_MIN_SIZE', 2)),
+            'max_size': int(os.getenv('DB_POOL_MAX_SIZE', 10)),
+            # Сколько секунд ждать свободное соединение до ошибки
+            'timeout': float(os.getenv('DB_POOL_TIMEOUT', 10)),
+            # Соединения пересоздаются после max_lifetime секунд
+            # и закрываются после max_idle секунд простоя.
+            'max_lifetime': float(os.getenv('DB_POOL_MAX_LIFETIME', 1800)),
+            'max_idle': float(os.getenv('DB_POOL_MAX_IDLE', 600)),
+        },
+    }
+else:
+    DATABASES['default']['CONN_MAX_AGE'] = int(os.getenv('DB_CONN_MAX_AGE', 60))
+
+# Реплики для чтения: DB_REPLICA_HOSTS=host1,host2:5433 добавляет базы
+# replica1, replica2 с теми же параметрами, что и default. В тестах
+# реплики указывают на тестовую базу default (TEST MIRROR).
+DATABASE_REPLICAS = []
+for index, address in enumerate(filter(None, os.getenv('DB_REPLICA_HOSTS', '').split(',')), 1):
+    host, _, port = address.strip().partition(':')
+    alias = f'replica{index}'
+    DATABASES[alias] = copy.deepcopy(DATABASES['default'])
+    DATABASES[alias].update({'HOST': host, 'PORT': port or '5432', 'TEST': {'MIRROR': 'default'}})
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['kittens.db_router.ReplicaRouter']
+# Максимальное отставание реплик в секундах: столько после своей записи
+# клиент читает из default (cookie DATABASE_PRIMARY_COOKIE).
+DATABASE_REPLICA_LAG = int(os.getenv('DB_REPLICA_LAG', 5))
+DATABASE_PRIMARY_COOKIE = 'use_primary'
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# Без REDIS_URL используется локальная память процесса (разработка и тесты).
+
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Кэш ответов наборов представлений (kittens.cache)
+RESPONSE_CACHE_ENABLED = os.getenv('RESPONSE_CACHE_ENABLED', 'true').lower() == 'true'
+RESPONSE_CACHE_ALIAS = 'default'
+RESPONSE_CACHE_TIMEOUT = int(os.getenv('RESPONSE_CACHE_TIMEOUT', 300))
+
+# Режим сервера: dev (runserver), wsgi или asgi (gunicorn, см. gunicorn.conf.py)
+SERVER_MODE = os.getenv('SERVER_MODE', 'dev')
+# Асинхронная обработка GET-запросов к API (kittens.async_views)
+ASYNC_READ_VIEWS = os.getenv('ASYNC_READ_VIEWS', str(SERVER_MODE == 'asgi')).lower() == 'true'
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -122,10 +216,104 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 AUTH_USER_MODEL = 'kittens.CustomUser'
 
+# Проверка пароля при входе выполняется в пуле хэширования.
+AUTHENTICATION_BACKENDS = ['kittens.authentication.PooledModelBackend']
+
+# Пул хэширования паролей (kittens.hashing): 'process', 'thread' или
+# 'inline'. Пул создается в каждом процессе сервера, поэтому при
+# нескольких воркерах gunicorn размер по умолчанию - ядра на воркер
+# (WEB_CONCURRENCY). При PASSWORD_HASHING_MAX_PENDING ожидающих
+# хэшах новые запросы получают 503.
+PASSWORD_HASHING_EXECUTOR = os.getenv('PASSWORD_HASHING_EXECUTOR', 'process')
+PASSWORD_HASHING_WORKERS = int(os.getenv(
+    'PASSWORD_HASHING_WORKERS',
+    max(1, (os.cpu_count() or 1) // int(os.getenv('WEB_CONCURRENCY', 1))),
+))
+PASSWORD_HASHING_MAX_PENDING = int(os.getenv(
+    'PASSWORD_HASHING_MAX_PENDING', PASSWORD_HASHING_WORKERS * 8
+))
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'kittens.authentication.ClaimsJWTAuthentication',
     ),
+    # orjson вместо json из стандартной библиотеки (см. kittens.renderers)
+    'DEFAULT_RENDERER_CLASSES': (
+        'kittens.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PAGINATION_CLASS': 'kittens.pagination.IdCursorPagination',
+    'PAGE_SIZE': int(os.getenv('API_PAGE_SIZE', 20)),
+}
+
+SIMPLE_JWT = {
+    'TOKEN_OBTAIN_SERIALIZER': 'kittens.authentication.RoleTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'kittens.authentication.RoleTokenRefreshSerializer',
+}
+
+# request.user строится из утверждений access-токена без запроса к базе
+# (kittens.authentication.LazyTokenUser). Изменение роли пользователя
+# вступает в силу после истечения выданного access-токена. Деактивация
+# (is_active = False) или удаление пользователя через save()/delete()
+# сразу отзывает его токены через JWT_DENY_LIST_CACHE; после
+# QuerySet.update() или при потере кэша токены действуют до истечения.
+JWT_STATELESS_AUTH = os.getenv('JWT_STATELESS_AUTH', 'true').lower() == 'true'
+# Кэш, в котором хранятся отозванные токены. Список должен быть общим
+# для всех процессов, поэтому в production нужен Redis (REDIS_URL).
+JWT_DENY_LIST_CACHE = 'default'
+
+# Максимальный размер страницы, который клиент может запросить
+# через параметр ?page_size=
+API_MAX_PAGE_SIZE = int(os.getenv('API_MAX_PAGE_SIZE', 100))
+
+# Количество строк в одной части потокового ответа (/api/ratings/stream/)
+API_STREAM_CHUNK_SIZE = int(os.getenv('API_STREAM_CHUNK_SIZE', 2000))
+
+# Максимальное количество оценок в одном запросе /api/ratings/bulk/
+RATING_BULK_MAX_SIZE = int(os.getenv('RATING_BULK_MAX_SIZE', 1000))
+
+# Импорт котят (/api/kittens/import/): максимальное количество записей
+# в одном запросе и размер пакета вставки bulk_create
+KITTEN_IMPORT_MAX_SIZE = int(os.getenv('KITTEN_IMPORT_MAX_SIZE', 10000))
+KITTEN_IMPORT_BATCH_SIZE = int(os.getenv('KITTEN_IMPORT_BATCH_SIZE', 500))
+
+# Параметры байесовской средней для лидерборда: количество условных
+# оценок и их значение. После изменения нужно выполнить
+# python manage.py rebuild_kitten_stats
+LEADERBOARD_PRIOR_VOTES = int(os.getenv('LEADERBOARD_PRIOR_VOTES', 5))
+LEADERBOARD_PRIOR_MEAN = float(os.getenv('LEADERBOARD_PRIOR_MEAN', 3.0))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {},
+    'loggers': {},
+}
+if SLOW_QUERY_LOG:
+    Path(SLOW_QUERY_LOG_FILE).parent.mkdir(parents=True, exist_ok=True)
+    LOGGING['handlers']['slow_queries'] = {
+        'class': 'logging.handlers.RotatingFileHandler',
+        'filename': SLOW_QUERY_LOG_FILE,
+        'maxBytes': 10 * 1024 * 1024,
+        'backupCount': 5,
+        'encoding': 'utf-8',
+    }
+    LOGGING['loggers']['kittens.slow_queries'] = {
+        'handlers': ['slow_queries'],
+        'level': 'WARNING',
+    }
+
+# Ограничение частоты запросов (kittens.throttling): '<число>/<период>'
+# или '<число>/<период>:<емкость корзины>'. Лимит для роли задается
+# ключом '<scope>.<роль>', например 'rating_create.visitor'. Состояние
+# хранится в кэше, поэтому в production нужен общий Redis (REDIS_URL).
+THROTTLE_ENABLED = os.getenv('THROTTLE_ENABLED', 'true').lower() == 'true'
+THROTTLE_CACHE_ALIAS = 'default'
+THROTTLE_RATES = {
+    'rating_create': os.getenv('THROTTLE_RATING_CREATE', '60/min:20'),
+    'rating_create_ip': os.getenv('THROTTLE_RATING_CREATE_IP', '600/min:100'),
+    'token_obtain_ip': os.getenv('THROTTLE_TOKEN_OBTAIN_IP', '30/min:10'),
+    'token_obtain_account': os.getenv('THROTTLE_TOKEN_OBTAIN_ACCOUNT', '10/min:5'),
 }
 
 SWAGGER_SETTINGS = {
@@ -137,3 +325,8 @@ SWAGGER_SETTINGS = {
         }
     }
 }
+
+# Каталог с готовой схемой OpenAPI (kittens.openapi): файл создает
+# команда generate_openapi при запуске контейнера, /swagger/ отдает его
+# из памяти. Без файла схема строится при первом запросе.
+OPENAPI_SCHEMA_DIR = os.getenv('OPENAPI_SCHEMA_DIR', str(BASE_DIR / 'openapi'))
@@ -1,28 +1,30 @@
 from django.contrib import admin
+from django.contrib.staticfiles.urls import staticfiles_urlpatterns
 from django.urls import include, path
-from drf_yasg import openapi
-from drf_yasg.views import get_schema_view
-from kittens.views import BreedViewSet, KittenViewSet, RatingViewSet, RegisterView
-from rest_framework import permissions
+from kittens.metrics import metrics_view
+from kittens.openapi import swagger_ui_view
+from kittens.views import (
+    BreedViewSet,
+    KittenViewSet,
+    RatingViewSet,
+    RegisterView,
+    ThrottledTokenObtainPairView,
+    TokenRevokeView,
+)
 from rest_framework.routers import DefaultRouter
-from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
-
+from rest_framework_simplejwt.views import TokenRefreshView
 
-schema_view = get_schema_view(
-    openapi.Info(
-        title="Kitten Exhibition API",
-        default_version='v1',
-        description="API for managing kitten exhibitions",
-    ),
-    public=True,
-    permission_classes=(permissions.AllowAny,),
-)
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('kittens.urls')),
     path('api/register/', RegisterView.as_view(), name='register'),
-    path('api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
+    path('api/token/', ThrottledTokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
-    path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
-]
\ No newline at end of file
+    path('api/token/revoke/', TokenRevokeView.as_view(), name='token_revoke'),
+    path('metrics', metrics_view, name='metrics'),
+    path('swagger/', swagger_ui_view, name='schema-swagger-ui'),
+]
+
+# Статика админки и Swagger UI при запуске через gunicorn с DEBUG = True
+urlpatterns += staticfiles_urlpatterns()
\ No newline at end of file